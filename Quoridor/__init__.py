@@ -0,0 +1,58 @@
+# Description: The Quoridor package. Importing it loads nothing but this file: each name below is imported from its
+# submodule the first time it is used, so worker processes that only need the engine never load NumPy, the AI or
+# the record format. The demo game runs with: python -m Quoridor
+
+import importlib
+
+_EXPORTS = {
+    "ZobristKeys": "engine",
+    "TranspositionTable": "engine",
+    "Geometry": "engine",
+    "get_geometry": "engine",
+    "Board": "engine",
+    "BitBoard": "engine",
+    "QuoridorGame": "engine",
+    "display_board": "rendering",
+    "RandomPlayer": "ai",
+    "AlphaBetaPlayer": "ai",
+    "MCTSPlayer": "ai",
+    "RecordWriter": "records",
+    "RecordReader": "records",
+    "GameServer": "server",
+    "Tablebase": "tablebase",
+    "generate_tablebase": "tablebase",
+    "load_tablebase": "tablebase",
+    "GameState": "state",
+    "StatePool": "state",
+    "BatchedQuoridorGame": "vectorized",
+    "FeatureEncoder": "features",
+    "ReplayWriter": "features",
+    "ReplayReader": "features",
+    "analyze_game": "analysis",
+    "analyze_archive": "analysis",
+    "fence_candidates": "candidates",
+}
+_SUBMODULES = ("engine", "rendering", "ai", "records", "server", "tablebase", "tournament", "vectorized",
+               "instrumentation", "state", "features", "analysis", "candidates",
+               "fuzz")
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    """
+    Imports the submodule holding name the first time it is asked for and keeps the result in the package so later
+    lookups do not come back here. Raises AttributeError for a name the package does not have
+    """
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module("." + _EXPORTS[name], __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module("." + name, __name__)
+    else:
+        raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS) + list(_SUBMODULES))
@@ -0,0 +1,26 @@
+# Description: The demo game that used to run whenever Quoridor.py was imported.
+# Run from the repository root with: python -m Quoridor
+
+from .engine import QuoridorGame
+
+
+def main():
+    """
+    Plays a short game where player 2 fences player 1 in on three sides, prints what place_fence returned for the
+    last of those fences and prints the board
+    """
+    q = QuoridorGame()
+    q.move_pawn(1, (4,1))
+    q.move_pawn(2, (4,7))
+    q.move_pawn(1, (4,2))
+    q.place_fence(2, 'v', (4,2)) #p2 starts putting fence left fence
+    q.place_fence(1, 'v', (7,1)) #dumb move to pass
+    q.place_fence(2, 'v', (5,2)) #right fence
+    q.place_fence(1,'v', (7,3)) #dumb move to pass
+    print(q.place_fence(2, 'h', (2,4))) #northern fence
+    q.place_fence(1, 'v', (7,2)) #dumb move to pass
+    q.print_board()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,723 @@
+# Description: Computer opponents for QuoridorGame that pick moves with an alpha-beta search or with Monte Carlo tree
+# search.
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .candidates import fence_candidates
+from .engine import TranspositionTable
+from .tablebase import generate_tablebase
+
+WIN_SCORE = 100000
+UNREACHABLE_DISTANCE = 100
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+ROLLOUT_POLICIES = ("random", "greedy")
+FENCE_ATTEMPTS = 3
+MAX_TABLEBASES = 8
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search once the time budget of a move is spent, unwinds the search back to choose_move
+    """
+    pass
+
+
+class RandomPlayer:
+    """
+    Picks a random legal move for the player whose turn it is, useful as a baseline opponent. Moves are drawn from a
+    random number generator seeded with the seed parameter so games can be replayed.
+    """
+    def __init__(self, seed=None, pawn_move_chance=0.5):
+        """
+        Creates private members holding the random number generator and the chance of moving the pawn instead of
+        placing a fence when both are possible, along with the report of the last move chosen
+        """
+        self._random = random.Random(seed)
+        self._pawn_move_chance = pawn_move_chance
+        self._last_report = None
+
+    def get_last_report(self):
+        """
+        Returns a dictionary describing the last call to choose_move: the move and the time taken in seconds
+        """
+        return self._last_report
+
+    def choose_move(self, game):
+        """
+        Returns a random legal move tuple for the player whose turn it is in the game parameter, in the form push
+        takes. Returns None if the game is over or the player has no move.
+        """
+        start = time.perf_counter()
+        player = game.get_player_turn()
+        moves = [('p', position) for position in game.legal_pawn_moves(player)]
+        fences = game.legal_fence_placements(player)
+        if len(fences) != 0 and (len(moves) == 0 or self._random.random() >= self._pawn_move_chance):
+            moves = fences
+        move = None
+        if len(moves) != 0:
+            move = self._random.choice(moves)
+        self._last_report = {"move": move, "time": time.perf_counter() - start}
+        return move
+
+
+class AlphaBetaPlayer:
+    """
+    Picks a move for the player whose turn it is with a negamax alpha-beta search, deepening one ply at a time until
+    the time budget of the move is spent. Positions are scored by the difference between the two players' shortest
+    path lengths and their remaining fences. Moves are tried in the order pawn moves along the player's own shortest
+    path, fences that cut the opponent's shortest path, then everything else, with the best move of the previous
+    depth first. Moves are played and taken back with push and pop, results are kept in a transposition table.
+    With prune_fences only the fences fence_candidates lists are searched, best bound first, and each one is only
+    checked against the fair play rule when push plays it. Positions the endgame tablebase of the game covers are
+    scored exactly without searching them, and with build_tablebases the player generates and keeps tablebases itself
+    once neither player has a fence left.
+    """
+    def __init__(self, time_limit=1.0, max_depth=20, path_weight=10, fence_weight=4, table_size=1 << 18,
+                 build_tablebases=False, prune_fences=False):
+        """
+        Creates private members holding the time budget of a move in seconds, the deepest depth to search, the weights
+        of the evaluation, the transposition table, whether fences are pruned and the tablebases built so far, keyed by
+        board size and fence hash, along with the report of the last move chosen
+        """
+        self._time_limit = time_limit
+        self._max_depth = max_depth
+        self._path_weight = path_weight
+        self._fence_weight = fence_weight
+        self._table = TranspositionTable(table_size, "depth")
+        self._build_tablebases = build_tablebases
+        self._prune_fences = prune_fences
+        self._tablebases = {}
+        self._tablebase = None
+        self._deadline = None
+        self._nodes = 0
+        self._last_report = None
+
+    def get_last_report(self):
+        """
+        Returns a dictionary describing the last call to choose_move: the move, its score, the deepest depth
+        completed, the number of nodes searched, the time the search took in seconds, whether the time budget ran out
+        and the seconds spent finding or generating the tablebase before the search started. The move is None and the
+        depth 0 when there was no move to pick, the report is None when choose_move raised
+        """
+        return self._last_report
+
+    def choose_move(self, game):
+        """
+        Returns the move tuple the search picks for the player whose turn it is in the game parameter, in the form
+        push takes. Searches depth 1, 2, 3 and so on and keeps the best move of the deepest depth completed, so a move
+        is always ready when the time budget runs out. Returns None if the game is over or the player has no move.
+        Negamax scores a position for one player as the negative of the other's, so raises ValueError for a game that
+        does not have two players. A tablebase is found, or generated, before the clock of the move starts, so the
+        search always gets the whole time budget and generating does not leave it without time to search a move
+        """
+        self._last_report = None
+        if game.get_player_count() != 2:
+            raise ValueError("the alpha-beta search only plays two player games")
+        tablebase_start = time.perf_counter()
+        self._tablebase = self.find_tablebase(game)
+        start = time.perf_counter()
+        self._deadline = start + self._time_limit
+        self._nodes = 0
+        moves = self.order_moves(game, None)
+        if game.get_game_winner() is not None or len(moves) == 0:
+            self._last_report = {"move": None, "score": None, "depth": 0, "nodes": 0,
+                                 "time": time.perf_counter() - start, "timed_out": False,
+                                 "tablebase_time": start - tablebase_start}
+            return None
+        best_move, best_score, depth, timed_out = self.helper_choose_move(game, moves, start)
+        self._last_report = {"move": best_move, "score": best_score, "depth": depth, "nodes": self._nodes,
+                             "time": time.perf_counter() - start, "timed_out": timed_out,
+                             "tablebase_time": start - tablebase_start}
+        return best_move
+
+    def helper_choose_move(self, game, moves, start):
+        """
+        Helper function to choose_move, runs the iterative deepening loop over the list of moves parameter. Does not
+        start a new depth once half of the time budget is spent, since it would most likely not finish, nor once the
+        tablebase covers the game, since every move is then scored exactly at depth 1. Returns a tuple of the best
+        move, its score, the depth completed and whether the time budget ran out
+        """
+        best_move, best_score, depth = moves[0], None, 0
+        while depth < self._max_depth:
+            if time.perf_counter() - start > self._time_limit / 2:
+                return best_move, best_score, depth, False
+            try:
+                best_move, best_score = self.search_root(game, depth + 1, moves, best_move)
+            except SearchTimeout:
+                return best_move, best_score, depth, True
+            depth += 1
+            if abs(best_score) >= WIN_SCORE - self._max_depth or \
+                    (self._tablebase is not None and self._tablebase.covers(game)):
+                break
+        return best_move, best_score, depth, False
+
+    def search_root(self, game, depth, moves, first_move):
+        """
+        Searches every move in the list of moves parameter to the integer depth parameter, starting with first_move,
+        skipping the ones push turns down. Returns a tuple of the best move and its score
+        """
+        ordered = [first_move] + [move for move in moves if move != first_move]
+        best_move, alpha = ordered[0], -WIN_SCORE - 1
+        for move in ordered:
+            if game.push(move) is not True:
+                continue
+            try:
+                score = -self.search(game, depth - 1, -WIN_SCORE - 1, -alpha, 1)
+            finally:
+                game.pop()
+            if score > alpha:
+                best_move, alpha = move, score
+        return best_move, alpha
+
+    def search(self, game, depth, alpha, beta, ply):
+        """
+        Negamax alpha-beta search of the game parameter to the integer depth parameter, returns the score of the
+        position for the player whose turn it is. Raises SearchTimeout once the time budget is spent.
+        """
+        self._nodes += 1
+        if time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        if game.get_game_winner() is not None:
+            return ply - WIN_SCORE
+        result = self._tablebase.probe(game) if self._tablebase is not None else None
+        if result is not None:
+            return self.helper_tablebase_score(game, result, ply)
+        if depth == 0:
+            return self.evaluate(game)
+        key = game.zobrist_hash()
+        entry = self._table.lookup(key, depth)
+        if entry is not None:
+            score, bound, table_move = entry
+            if bound == EXACT or (bound == LOWER_BOUND and score >= beta) or (bound == UPPER_BOUND and score <= alpha):
+                return score
+        else:
+            table_move = None
+        return self.helper_search(game, depth, alpha, beta, ply, key, table_move)
+
+    def helper_search(self, game, depth, alpha, beta, ply, key, table_move):
+        """
+        Helper function to search, tries each move of the position in order, skipping the ones push turns down, and
+        stores the result in the transposition table under the integer key parameter. Returns the score of the
+        position, its evaluation if no move could be played
+        """
+        moves = self.order_moves(game, table_move)
+        best_move, best_score, start_alpha = None, -WIN_SCORE - 1, alpha
+        for move in moves:
+            if game.push(move) is not True:
+                continue
+            try:
+                score = -self.search(game, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.pop()
+            if score > best_score:
+                best_move, best_score = move, score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        if best_move is None:
+            return self.evaluate(game)
+        if best_score <= start_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._table.store(key, (best_score, bound, best_move), depth)
+        return best_score
+
+    def find_tablebase(self, game):
+        """
+        Returns the tablebase to probe while searching the game parameter: the one set on the game, otherwise, with
+        build_tablebases and neither player left with a fence, the one kept for its fences, generated the first time.
+        At most MAX_TABLEBASES are kept. Returns None if there is none to use
+        """
+        if game.get_tablebase() is not None or not self._build_tablebases:
+            return game.get_tablebase()
+        if game.get_player_fences(1) != 0 or game.get_player_fences(2) != 0:
+            return None
+        key = (game.get_board().get_size(), game.get_board().get_fence_hash())
+        if key not in self._tablebases:
+            if len(self._tablebases) >= MAX_TABLEBASES:
+                self._tablebases.clear()
+            self._tablebases[key] = generate_tablebase(game)
+        return self._tablebases[key]
+
+    def helper_tablebase_score(self, game, result, ply):
+        """
+        Helper function to search, turns the (winner, plies) result tuple of a tablebase probe into a score for the
+        player whose turn it is, a win or a loss the integer ply parameter plus plies moves from the root, or 0 if
+        neither player can force a win
+        """
+        winner, plies = result
+        if winner is None:
+            return 0
+        if winner == game.get_player_turn():
+            return WIN_SCORE - ply - plies
+        return ply + plies - WIN_SCORE
+
+    def evaluate(self, game):
+        """
+        Scores the game parameter for the player whose turn it is: how many steps shorter their shortest path is
+        than the opponent's, times the path weight, plus how many more fences they have left, times the fence weight
+        """
+        player = game.get_player_turn()
+        opponent = game.get_opponent(player)
+        distance = game.shortest_path_length(player)
+        opponent_distance = game.shortest_path_length(opponent)
+        if distance is None:
+            distance = UNREACHABLE_DISTANCE
+        if opponent_distance is None:
+            opponent_distance = UNREACHABLE_DISTANCE
+        fences = game.get_player_fences(player) - game.get_player_fences(opponent)
+        return (opponent_distance - distance) * self._path_weight + fences * self._fence_weight
+
+    def order_moves(self, game, first_move):
+        """
+        Returns the legal move tuples of the player whose turn it is in the game parameter, with first_move first if
+        it is legal, then pawn moves onto the player's own shortest path, fences that cut the opponent's shortest path,
+        the other pawn moves and the other fences. With prune_fences the fences are the ones fence_candidates lists,
+        in its order, and are not checked against the fair play rule
+        """
+        player = game.get_player_turn()
+        path = game.get_cached_path(player) or []
+        pawn_moves = [('p', position) for position in game.legal_pawn_moves(player)]
+        if self._prune_fences:
+            ordered = [move for move in pawn_moves if move[1] in path] + \
+                [move for move, bound in fence_candidates(game, player)] + \
+                [move for move in pawn_moves if move[1] not in path]
+            return self.helper_first_move(ordered, first_move)
+        opponent_fences = game.get_path_fences(game.get_opponent(player))
+        fences = game.legal_fence_placements(player)
+        ordered = [move for move in pawn_moves if move[1] in path] + \
+            [move for move in fences if move in opponent_fences] + \
+            [move for move in pawn_moves if move[1] not in path] + \
+            [move for move in fences if move not in opponent_fences]
+        return self.helper_first_move(ordered, first_move)
+
+    def helper_first_move(self, ordered, first_move):
+        """
+        Helper function to order_moves, moves first_move to the front of the list of ordered moves if it is in it and
+        returns the list
+        """
+        if first_move in ordered:
+            ordered.remove(first_move)
+            ordered.insert(0, first_move)
+        return ordered
+
+
+class MCTSNode:
+    """
+    A node of the Monte Carlo search tree: the move that led to it, the player who made that move, the Zobrist hash
+    of the game after it, the child nodes keyed by move, the moves not expanded yet (None until the node is first
+    reached) and the number of visits and the total score of the player who made the move over those visits.
+    """
+    def __init__(self, move, player, key, parent=None):
+        """
+        Creates private members holding the move, the player who made it, the hash of the position it leads to, the
+        parent node and the empty statistics
+        """
+        self._move = move
+        self._player = player
+        self._key = key
+        self._parent = parent
+        self._children = {}
+        self._untried = None
+        self._visits = 0
+        self._score = 0.0
+
+    def get_move(self):
+        """
+        Returns the move tuple that led to the node, None for the root
+        """
+        return self._move
+
+    def get_player(self):
+        """
+        Returns the player who made the move that led to the node, None for the root
+        """
+        return self._player
+
+    def get_key(self):
+        """
+        Returns the Zobrist hash of the game position of the node
+        """
+        return self._key
+
+    def get_parent(self):
+        """
+        Returns the parent node, None for the root
+        """
+        return self._parent
+
+    def set_parent(self, parent):
+        """
+        Sets the parent node to the parent parameter, None makes the node a root
+        """
+        self._parent = parent
+
+    def get_children(self):
+        """
+        Returns the dictionary of child nodes keyed by move
+        """
+        return self._children
+
+    def get_untried(self):
+        """
+        Returns the list of moves without a child node yet, None if the node has not been reached
+        """
+        return self._untried
+
+    def set_untried(self, moves):
+        """
+        Sets the list of moves without a child node yet to the moves parameter
+        """
+        self._untried = moves
+
+    def get_visits(self):
+        """
+        Returns the number of iterations that went through the node
+        """
+        return self._visits
+
+    def get_score(self):
+        """
+        Returns the total score of the player who made the move over the visits of the node
+        """
+        return self._score
+
+    def is_expanded(self):
+        """
+        Returns True if every move of the node has a child node, False if some moves have not been tried yet
+        """
+        return self._untried is not None and len(self._untried) == 0
+
+    def add_child(self, move, player, key):
+        """
+        Creates the child node reached by the move parameter, played by the player parameter, and returns it
+        """
+        child = MCTSNode(move, player, key, self)
+        self._children[move] = child
+        return child
+
+    def update(self, scores):
+        """
+        Counts a visit and adds the score the player who made the move got in the scores list, indexed by player
+        """
+        self._visits += 1
+        if self._player is not None:
+            self._score += scores[self._player]
+
+    def get_statistics(self):
+        """
+        Returns a dictionary of (visits, score) tuples keyed by the move of each child node
+        """
+        return {move: (child.get_visits(), child.get_score()) for move, child in self._children.items()}
+
+
+class MCTSPlayer:
+    """
+    Picks a move for the player whose turn it is with Monte Carlo tree search. Each iteration walks down the tree
+    choosing children by UCT, adds one new child, plays a rollout to the end of the game or to max_rollout_plies and
+    scores it for every player, then adds the scores to the nodes it went through. Rollouts play random moves
+    ("random") or step along the player's shortest path with the odd fence across the next player's path ("greedy").
+    Runs for time_limit seconds, or exactly iterations iterations per tree if it is given so results can be
+    reproduced. With workers above 1 the search is root parallel: the pool searches workers - 1 trees of its own while
+    this process searches its tree, and the root statistics of all of them are added up. The tree of this process is
+    kept between moves and the part under the position of the next call is searched on from there.
+    """
+    def __init__(self, time_limit=1.0, iterations=None, exploration=1.4, rollout="random", max_rollout_plies=60,
+                 pawn_move_chance=0.7, workers=1, seed=None, reuse_tree=True, executor=None):
+        """
+        Creates private members holding the search settings, the random number generator, the kept tree and the
+        executor of the other trees (a ProcessPoolExecutor is made the first time one is needed if none is given, and
+        only that one is shut down by close), along with the report of the last move chosen. Raises ValueError for a
+        rollout policy not in ROLLOUT_POLICIES
+        """
+        if rollout not in ROLLOUT_POLICIES:
+            raise ValueError("rollout must be one of " + ", ".join(ROLLOUT_POLICIES))
+        self._time_limit = time_limit
+        self._iterations = iterations
+        self._exploration = exploration
+        self._rollout = rollout
+        self._max_rollout_plies = max_rollout_plies
+        self._pawn_move_chance = pawn_move_chance
+        self._workers = workers
+        self._seed = seed
+        self._random = random.Random(seed)
+        self._reuse_tree = reuse_tree
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._root = None
+        self._root_history = None
+        self._fence_moves = None
+        self._last_report = None
+
+    def get_settings(self):
+        """
+        Returns a dictionary of the keyword arguments that make a player searching like this one in a single process
+        """
+        return {"time_limit": self._time_limit, "iterations": self._iterations, "exploration": self._exploration,
+                "rollout": self._rollout, "max_rollout_plies": self._max_rollout_plies,
+                "pawn_move_chance": self._pawn_move_chance, "reuse_tree": False}
+
+    def get_executor(self):
+        """
+        Returns the executor the other trees are searched in, creating a ProcessPoolExecutor if there is none yet
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers - 1)
+        return self._executor
+
+    def close(self):
+        """
+        Shuts down the ProcessPoolExecutor the player made for its other trees, waiting for its worker processes to
+        exit. An executor passed to the constructor is left to its owner. The player makes a new pool if it is asked
+        for another move afterwards
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        """
+        Returns the player, so it can be used in a with statement that closes it at the end
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the player at the end of a with statement
+        """
+        self.close()
+
+    def get_last_report(self):
+        """
+        Returns a dictionary describing the last call to choose_move: the move, its visits and mean score, the number
+        of iterations run in all trees, the iterations run per second, the visits carried over from the kept tree,
+        the number of trees and the time taken in seconds
+        """
+        return self._last_report
+
+    def choose_move(self, game):
+        """
+        Returns the move tuple the search picks for the player whose turn it is in the game parameter, in the form
+        push takes: the move visited most at the root, summed over every tree. Returns None if the game is over or
+        the player has no move. The game is played on with push and pop and left as it was
+        """
+        start = time.perf_counter()
+        if game.get_game_winner() is not None:
+            self._last_report = {"move": None, "visits": 0, "score": None, "iterations": 0, "iterations_per_sec": 0.0,
+                                 "reused": 0, "trees": 0, "time": time.perf_counter() - start}
+            return None
+        futures = []
+        if self._workers > 1:
+            futures = [self.get_executor().submit(search_tree, game, self.get_settings(),
+                                                  self._random.getrandbits(32)) for num in range(1, self._workers)]
+        root = self.find_root(game)
+        reused = root.get_visits()
+        iterations = self.search(game, root)
+        statistics = [(root.get_statistics(), iterations)] + [future.result() for future in futures]
+        move, visits, score = self.helper_choose_move(statistics)
+        iterations = sum(count for children, count in statistics)
+        seconds = time.perf_counter() - start
+        self._last_report = {"move": move, "visits": visits, "score": score / max(visits, 1),
+                             "iterations": iterations, "iterations_per_sec": iterations / seconds, "reused": reused,
+                             "trees": len(statistics), "time": seconds}
+        return move
+
+    def helper_choose_move(self, statistics):
+        """
+        Helper function to choose_move, adds up the list of (children statistics, iterations) tuples of every tree
+        and returns a tuple of the move visited most, its visits and its total score. Ties go to the higher score,
+        then to the move that sorts first, so the pick does not depend on the order the trees finished in. Returns
+        (None, 0, 0) if no tree has a child
+        """
+        totals = {}
+        for children, count in statistics:
+            for move, (visits, score) in children.items():
+                total = totals.get(move, (0, 0.0))
+                totals[move] = (total[0] + visits, total[1] + score)
+        if len(totals) == 0:
+            return None, 0, 0
+        move = min(totals, key=lambda key: (-totals[key][0], -totals[key][1], key))
+        return move, totals[move][0], totals[move][1]
+
+    def find_root(self, game):
+        """
+        Returns the node to search the game parameter from. If the tree is kept and the moves played on the game since
+        the last search follow on from the moves played before it, the node those moves lead to is used, as long as
+        its hash matches the game. Otherwise a new tree is started
+        """
+        history = game.get_move_history()
+        node = None
+        if self._reuse_tree and self._root is not None and history[:len(self._root_history)] == self._root_history:
+            node = self._root
+            for move in history[len(self._root_history):]:
+                node = node.get_children().get(move)
+                if node is None:
+                    break
+        if node is None or node.get_key() != game.zobrist_hash():
+            node = MCTSNode(None, None, game.zobrist_hash())
+        node.set_parent(None)
+        self._root, self._root_history = node, history
+        return node
+
+    def search(self, game, root):
+        """
+        Runs iterations from the root node parameter on the game parameter until the time limit is spent, or exactly
+        the set number of iterations, returns how many were run
+        """
+        self._fence_moves = sorted(game.get_geometry().get_fence_pieces(game.get_fence_length()))
+        deadline = time.perf_counter() + self._time_limit
+        iterations = 0
+        while (iterations < self._iterations) if self._iterations is not None else (time.perf_counter() < deadline):
+            self.iterate(game, root)
+            iterations += 1
+        return iterations
+
+    def iterate(self, game, root):
+        """
+        Runs one iteration from the root node parameter: selection, expansion, rollout and backpropagation. Every move
+        played on the game parameter is taken back before returning
+        """
+        node, depth = root, 0
+        while node.is_expanded() and len(node.get_children()) != 0:
+            node = self.select_child(node)
+            game.push(node.get_move())
+            depth += 1
+        if game.get_game_winner() is None:
+            if node.get_untried() is None:
+                node.set_untried(self.helper_legal_moves(game))
+            if len(node.get_untried()) != 0:
+                move, player = node.get_untried().pop(), game.get_player_turn()
+                game.push(move)
+                depth += 1
+                node = node.add_child(move, player, game.zobrist_hash())
+        scores = self.rollout(game)
+        for num in range(0, depth):
+            game.pop()
+        while node is not None:
+            node.update(scores)
+            node = node.get_parent()
+
+    def helper_legal_moves(self, game):
+        """
+        Helper function to iterate, returns the legal move tuples of the player whose turn it is in a random order,
+        so the moves tried first are not always the pawn moves
+        """
+        player = game.get_player_turn()
+        moves = [('p', position) for position in game.legal_pawn_moves(player)] + \
+            game.legal_fence_placements(player)
+        self._random.shuffle(moves)
+        return moves
+
+    def select_child(self, node):
+        """
+        Returns the child of the node parameter with the highest UCT value: its mean score plus the exploration
+        constant times the square root of the log of the node's visits over the child's visits
+        """
+        log_visits = math.log(node.get_visits())
+        best_child, best_value = None, None
+        for child in node.get_children().values():
+            value = child.get_score() / child.get_visits() + \
+                self._exploration * math.sqrt(log_visits / child.get_visits())
+            if best_value is None or value > best_value:
+                best_child, best_value = child, value
+        return best_child
+
+    def rollout(self, game):
+        """
+        Plays moves from the rollout policy on the game parameter until the game is won, a player has no move or
+        max_rollout_plies moves are played, takes them all back and returns the scores of the players. A position the
+        tablebase of the game covers is scored from it without a rollout
+        """
+        result = game.probe_tablebase()
+        if result is not None:
+            return self.score_tablebase(game, result)
+        plies = 0
+        play_move = self.helper_random_move if self._rollout == "random" else self.helper_greedy_move
+        while game.get_game_winner() is None and plies < self._max_rollout_plies and play_move(game):
+            plies += 1
+        scores = self.score_rollout(game)
+        for num in range(0, plies):
+            game.pop()
+        return scores
+
+    def helper_random_move(self, game):
+        """
+        Helper function to rollout, plays a random move for the player whose turn it is. A fence is tried with the
+        chance left over from pawn_move_chance, drawing up to FENCE_ATTEMPTS fences from every fence on the board and
+        letting push turn down the ones that do not fit, otherwise a random legal pawn move is played. Returns True if
+        a move was played
+        """
+        player = game.get_player_turn()
+        if game.get_player_fences(player) != 0 and self._random.random() >= self._pawn_move_chance:
+            for num in range(0, FENCE_ATTEMPTS):
+                if game.push(self._random.choice(self._fence_moves)) is True:
+                    return True
+        moves = game.legal_pawn_moves(player)
+        return len(moves) != 0 and game.push(('p', self._random.choice(moves))) is True
+
+    def helper_greedy_move(self, game):
+        """
+        Helper function to rollout, plays the next step of the shortest path of the player whose turn it is. A fence
+        across the next player's shortest path is tried instead with the chance left over from pawn_move_chance, and a
+        random legal pawn move is played if the step is blocked by a pawn. Returns True if a move was played
+        """
+        player = game.get_player_turn()
+        if game.get_player_fences(player) != 0 and self._random.random() >= self._pawn_move_chance:
+            fences = sorted(game.get_path_fences(game.get_opponent(player)))
+            if len(fences) != 0 and game.push(self._random.choice(fences)) is True:
+                return True
+        path = game.get_cached_path(player)
+        if path is not None and len(path) > 1 and game.push(('p', path[1])) is True:
+            return True
+        moves = game.legal_pawn_moves(player)
+        return len(moves) != 0 and game.push(('p', self._random.choice(moves))) is True
+
+    def score_tablebase(self, game, result):
+        """
+        Returns the list of scores indexed by player for the (winner, plies) result tuple of a tablebase probe on the
+        game parameter: 1 for the winner, or 1 shared between the players if neither can force a win
+        """
+        scores = [0.0] * (game.get_player_count() + 1)
+        if result[0] is None:
+            scores[1:] = [1.0 / game.get_player_count()] * game.get_player_count()
+        else:
+            scores[result[0]] = 1.0
+        return scores
+
+    def score_rollout(self, game):
+        """
+        Returns the list of scores indexed by player at the end of a rollout on the game parameter: 1 for the winner,
+        or if there is none, 1 shared between the players with the shortest path to their goal cells
+        """
+        scores = [0.0] * (game.get_player_count() + 1)
+        if game.get_game_winner() is not None:
+            scores[game.get_game_winner()] = 1.0
+            return scores
+        distances = {}
+        for player in range(1, game.get_player_count() + 1):
+            distance = game.shortest_path_length(player)
+            distances[player] = UNREACHABLE_DISTANCE if distance is None else distance
+        leaders = [player for player, distance in distances.items() if distance == min(distances.values())]
+        for player in leaders:
+            scores[player] = 1.0 / len(leaders)
+        return scores
+
+
+def search_tree(game, settings, seed):
+    """
+    Runs in a worker process: searches a tree of its own for the game parameter with an MCTSPlayer made from the
+    settings dictionary and the seed parameter. Returns a tuple of the children statistics of the root and the
+    number of iterations run
+    """
+    player = MCTSPlayer(seed=seed, **settings)
+    root = player.find_root(game)
+    iterations = player.search(game, root)
+    return root.get_statistics(), iterations
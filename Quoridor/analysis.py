@@ -0,0 +1,158 @@
+# Description: Annotates every ply of finished games for review: the shortest path length of each player, the number
+# of legal moves, whether a fence was wasted and the move a search would have played instead. A game is replayed once
+# with push, so the path cache of the game and the transposition table of the search carry over from ply to ply
+# instead of being rebuilt from the first move. Whole record files are analyzed on a pool of worker processes.
+# Run from the repository root with: python -m Quoridor.analysis games.qrec --output review.jsonl --workers 8
+
+import argparse
+import json
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import util
+
+from .engine import BitBoard, QuoridorGame
+from .records import RecordReader
+from .tournament import close_players, make_player
+
+DEFAULT_ANALYST = {"type": "alphabeta", "time_limit": 0.5, "max_depth": 2}
+PENDING_PER_WORKER = 4
+
+_reader = None
+
+
+def analyze_game(moves, game=None, analyst=DEFAULT_ANALYST):
+    """
+    Generator that plays the list of move tuples parameter, in the form push takes, on the game parameter, a new
+    QuoridorGame on a BitBoard if it is None, and yields a dictionary for each ply before its move is played: the ply
+    number counting from 0, the player to move, the move, the shortest path length of each player in a list indexed
+    by player - 1 (None for a player cut off), the number of legal moves of the player, whether the move was a wasted
+    fence (None for a pawn move) and the move the analyst configuration dictionary, as make_player takes it, picks
+    along with its score and whether the move played matches it. A fence is wasted when no opponent's shortest path
+    gets longer, which covers fences that cut no shortest path and fences that leave an equally short way around.
+    Without an analyst the best move is left out. Raises ValueError at a move that is not legal. The worker
+    processes of an MCTS analyst are shut down once the generator finishes or is closed
+    """
+    if game is None:
+        game = QuoridorGame(BitBoard)
+    player_object = make_player(analyst, 0) if analyst is not None else None
+    try:
+        for ply, move in enumerate(moves):
+            player = game.get_player_turn()
+            annotation = {"ply": ply, "player": player, "move": move, "distances": helper_distances(game),
+                          "legal_moves": len(game.legal_pawn_moves(player)) + len(game.legal_fence_placements(player))}
+            if player_object is not None:
+                best_move = player_object.choose_move(game)
+                annotation.update(best_move=best_move, matches_best=best_move == move,
+                                  best_score=(player_object.get_last_report() or {}).get("score"))
+            if game.push(move) is not True:
+                raise ValueError("illegal move at ply " + str(ply) + ": " + repr(move))
+            annotation["wasted_fence"] = helper_wasted_fence(game, move, player, annotation["distances"])
+            yield annotation
+    finally:
+        close_players([player_object])
+
+
+def helper_distances(game):
+    """
+    Helper function to analyze_game, returns the list of the shortest path length of each player of the game
+    parameter, taken from its path cache
+    """
+    return [game.shortest_path_length(player) for player in range(1, game.get_player_count() + 1)]
+
+
+def helper_wasted_fence(game, move, player, distances):
+    """
+    Helper function to analyze_game, returns None if the move tuple parameter is a pawn move, otherwise whether the
+    fence the integer player parameter placed left the shortest path length of every opponent in the game parameter
+    the same as in the list of distances before it
+    """
+    if move[0] == 'p':
+        return None
+    return all(game.shortest_path_length(opponent) == distances[opponent - 1]
+               for opponent in range(1, game.get_player_count() + 1) if opponent != player)
+
+
+def analyze_record(reader, number, analyst=DEFAULT_ANALYST):
+    """
+    Returns a tuple of the integer number parameter and the list of annotations of game number of the open
+    RecordReader reader parameter
+    """
+    moves = reader.get_moves(number)[0]
+    return number, list(analyze_game(moves, None, analyst))
+
+
+def open_worker_reader(record_path):
+    """
+    Initializer of the worker processes of analyze_archive, opens the RecordReader of the record file at record_path
+    that analyze_worker_record reads every game of the job from, and has it closed when the worker process exits
+    """
+    global _reader
+    _reader = RecordReader(record_path, BitBoard)
+    util.Finalize(_reader, _reader.close, exitpriority=0)
+
+
+def analyze_worker_record(number, analyst):
+    """
+    Returns what analyze_record returns for game number of the record file open_worker_reader opened in this worker
+    process
+    """
+    return analyze_record(_reader, number, analyst)
+
+
+def analyze_archive(record_path, workers=1, analyst=DEFAULT_ANALYST, games=None):
+    """
+    Generator that analyzes the games of the record file at record_path, only those whose numbers are in the games
+    list if it is given, and yields a tuple of the game number and its list of annotations for each one. With more
+    than one worker the games are spread over a pool of the integer workers parameter number of processes and yielded
+    as they finish, with at most PENDING_PER_WORKER games per worker waiting so the whole archive is never queued at
+    once. Each worker opens the file once and closes it when the pool shuts down at the end of the job. With one
+    worker the games are analyzed in order in this process, read through one RecordReader closed once the generator
+    finishes or is closed
+    """
+    if workers == 1:
+        with RecordReader(record_path, BitBoard) as reader:
+            for number in range(0, reader.get_game_count()) if games is None else games:
+                yield analyze_record(reader, number, analyst)
+        return
+    if games is None:
+        with RecordReader(record_path) as reader:
+            games = range(0, reader.get_game_count())
+    numbers, pending = iter(games), set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=open_worker_reader, initargs=(record_path,)) as pool:
+        while True:
+            for number in numbers:
+                pending.add(pool.submit(analyze_worker_record, number, analyst))
+                if len(pending) >= workers * PENDING_PER_WORKER:
+                    break
+            if len(pending) == 0:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def main():
+    """
+    Parses the record file, output path, worker count and analyst settings from the command line, analyzes the
+    archive and writes one line of JSON per ply, with the number of its game, to the output file as each game finishes
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("records", help="binary record file of the games to analyze")
+    parser.add_argument("--output", default="analysis.jsonl")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_ANALYST["time_limit"],
+                        help="seconds the analyst may search each ply")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_ANALYST["max_depth"])
+    parser.add_argument("--no-best-move", action="store_true", help="skip the search for the best move")
+    args = parser.parse_args()
+    analyst = dict(DEFAULT_ANALYST, time_limit=args.time_limit, max_depth=args.max_depth)
+    if args.no_best_move:
+        analyst = None
+    with open(args.output, "w") as output:
+        for number, annotations in analyze_archive(args.records, args.workers, analyst):
+            for annotation in annotations:
+                output.write(json.dumps(dict(annotation, game=number)) + "\n")
+            output.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# Description: Picks out the few fences worth searching from the hundred or more that fit on the board, using the
+# distance map of every player: the number of steps from each cell to their goal cells. Fences are not checked
+# against the fair play rule here, which is left to push for the fences a search actually tries.
+#
+# A fence can only make a player's shortest path longer if it cuts every one of their shortest paths. The distance
+# map of the player, together with the number of shortest paths from their pawn to each cell and from each cell to
+# their goal cells, tells how many shortest paths run through each edge. A fence whose edges carry fewer paths than
+# the player has in total leaves at least one shortest path whole, so it cannot lengthen it. Each other fence gets an
+# upper bound on how many steps it can add: a shortest path from the pawn to the farthest cell before a cut edge,
+# then the shortest way around the fence to a cell closer to the goal than any cut edge, then that cell's distance.
+
+from .engine import get_geometry
+
+_slot_pieces = {}
+
+
+def distance_map(board, player):
+    """
+    Returns a tuple of the list of the number of steps from each cell index to the goal cells of the integer player
+    parameter without crossing a fence, None for a cell cut off from them, and the list of the cell indexes at each
+    distance. Pawns are ignored, as they are by shortest_path_length
+    """
+    geometry = board.get_geometry()
+    blocked_edges, cell_edges = board.get_blocked_edges(), geometry.get_cell_edges()
+    distances = [None] * len(cell_edges)
+    frontier = [index for index, goal in enumerate(geometry.get_goal_table(player)) if goal]
+    layers = []
+    while len(frontier) != 0:
+        for index in frontier:
+            distances[index] = len(layers)
+        layers.append(frontier)
+        frontier = list({neighbor for current in frontier for edge, neighbor in cell_edges[current]
+                         if distances[neighbor] is None and not blocked_edges[edge]})
+    return distances, layers
+
+
+def path_maps(board, player, position):
+    """
+    Returns a tuple of the distance map of the integer player parameter, the list of the number of shortest paths from
+    the tuple position parameter to each cell index, the list of the number of shortest paths from each cell index
+    to the goal cells, the cell index of position and the set of (direction, position) slots on the edges of the
+    shortest paths from position. A shortest path only ever steps to a cell one closer to the goal cells
+    """
+    geometry = board.get_geometry()
+    blocked_edges, cell_edges, edge_slots = board.get_blocked_edges(), geometry.get_cell_edges(), \
+        geometry.get_edge_slots()
+    distances, layers = distance_map(board, player)
+    to_goal, from_start, slots = [0] * len(distances), [0] * len(distances), set()
+    for step, layer in enumerate(layers):
+        for index in layer:
+            to_goal[index] = 1 if step == 0 else sum(to_goal[neighbor] for edge, neighbor in cell_edges[index]
+                                                     if not blocked_edges[edge] and distances[neighbor] == step - 1)
+    start = geometry.get_cell_indexes()[position]
+    from_start[start] = 1
+    for layer in reversed(layers[1:distances[start] + 1] if distances[start] is not None else []):
+        for index in layer:
+            for edge, neighbor in cell_edges[index]:
+                if from_start[index] and not blocked_edges[edge] and distances[neighbor] == distances[index] - 1:
+                    from_start[neighbor] += from_start[index]
+                    slots.add(edge_slots[edge])
+    return distances, from_start, to_goal, start, slots
+
+
+def fence_effect(board, edges, maps):
+    """
+    Returns an upper bound on the number of steps a fence cutting the tuple of edges parameter adds to the shortest
+    path of the player whose path_maps tuple is maps, 0 if the fence leaves one of their shortest paths whole
+    """
+    distances, from_start, to_goal, start, slots = maps
+    adjacency = board.get_geometry().get_adjacency()
+    through, uppers, cut_uppers = 0, [], []
+    for edge in edges:
+        upper, lower = edge // 4, adjacency[edge]
+        if distances[upper] is not None and distances[lower] == distances[upper] - 1:
+            uppers.append(distances[upper])
+            if from_start[upper] and to_goal[lower]:
+                through += from_start[upper] * to_goal[lower]
+                cut_uppers.append(upper)
+    if len(cut_uppers) == 0 or through < to_goal[start]:
+        return 0
+    farthest = max(cut_uppers, key=distances.__getitem__)
+    return helper_detour(board, edges, farthest, min(uppers), distances) - distances[farthest]
+
+
+def helper_detour(board, edges, start, below, distances):
+    """
+    Helper function to fence_effect, searches outward from the cell index start without crossing a fence or any of
+    the tuple of edges parameter until it reaches cells nearer the goal cells than the integer below parameter, whose
+    shortest paths cannot cross the edges. Returns the fewest steps to the goal cells through one of them, or the
+    number of cells on the board if there is none, which no path can be longer than
+    """
+    blocked_edges, cell_edges = board.get_blocked_edges(), board.get_geometry().get_cell_edges()
+    cut, seen, frontier, steps = set(edges), {start}, [start], 0
+    while len(frontier) != 0:
+        nearer = [distances[index] for index in frontier if distances[index] is not None and distances[index] < below]
+        if len(nearer) != 0:
+            return steps + min(nearer)
+        frontier = [neighbor for current in frontier for edge, neighbor in cell_edges[current]
+                    if not blocked_edges[edge] and edge not in cut and neighbor not in seen and not seen.add(neighbor)]
+        steps += 1
+    return len(cell_edges)
+
+
+def fence_candidates(game, player):
+    """
+    Returns a list of (move, bound) tuples of the fences worth trying for the integer player parameter in the game
+    parameter, highest bound first. Every fence that may lengthen an opponent's shortest path is listed, with bound
+    the most steps it can add to the opponents' paths together. With fences of length 2 the fences that keep an
+    opponent from placing a fence that may lengthen the player's own path are listed too, with bound the most steps
+    that fence could have added, as long as they cannot lengthen the player's path themselves. Fences with the same
+    bound are listed in move order. Fences that overlap or cross another are left out, the fair play rule is not
+    checked. Returns an empty list if the game has been won, if it is not the player's turn or if they have no fence
+    """
+    if game.get_game_winner() is not None or game.get_player_turn() != player or game.get_player_fences(player) == 0:
+        return []
+    board = game.get_board()
+    maps = {number: path_maps(board, number, game.get_player_position(number))
+            for number in range(1, game.get_player_count() + 1)}
+    bounds = helper_fence_effects(game, maps, game.get_opponents(player))
+    if game.get_fence_length() == 2:
+        helper_protecting_fences(game, bounds, helper_fence_effects(game, maps, [player]))
+    return sorted(bounds.items(), key=lambda item: (-item[1], item[0]))
+
+
+def helper_fence_effects(game, maps, players):
+    """
+    Helper function to fence_candidates, returns a dictionary of the open fences that may lengthen the shortest path
+    of one of the list of players parameter, keyed by move, holding the most steps they can add to their paths
+    together. Only the fences covering a slot on one of their shortest paths, listed in the path_maps dictionary
+    maps, are looked at
+    """
+    board, geometry = game.get_board(), game.get_geometry()
+    pieces = helper_slot_pieces(geometry, game.get_fence_length())
+    moves = {move for number in players for slot in maps[number][4] for move in pieces[slot]}
+    bounds = {}
+    for move in moves:
+        if not game.is_open_fence(*move):
+            continue
+        edges = tuple(edge for slot in game.get_fence_slots(*move) for edge in geometry.get_cut_edges(*slot))
+        bound = sum(fence_effect(board, edges, maps[number]) for number in players)
+        if bound != 0:
+            bounds[move] = bound
+    return bounds
+
+
+def helper_slot_pieces(geometry, length):
+    """
+    Helper function to helper_fence_effects, returns a dictionary of the list of fence pieces of the integer length
+    parameter covering each slot of the board of the Geometry parameter, built the first time it is asked for
+    """
+    key = (geometry.get_size(), length)
+    if key not in _slot_pieces:
+        _slot_pieces[key] = {}
+        for move, (slots, crossing) in sorted(geometry.get_fence_pieces(length).items()):
+            for slot in slots:
+                _slot_pieces[key].setdefault(slot, []).append(move)
+    return _slot_pieces[key]
+
+
+def helper_protecting_fences(game, bounds, threats):
+    """
+    Helper function to fence_candidates, adds to the bounds dictionary every open fence that is not in the threats
+    dictionary but shares a slot or a grid point with a fence in it, keeping the larger of its bound and the largest
+    threat it blocks
+    """
+    pieces = get_geometry(game.get_board().get_size()).get_fence_pieces(2)
+    blocked = {}
+    for move, loss in threats.items():
+        slots, crossing = pieces[move]
+        for key in slots + (crossing,):
+            blocked[key] = max(blocked.get(key, 0), loss)
+    for move in game.open_fence_placements():
+        slots, crossing = pieces[move]
+        protection = max([blocked.get(key, 0) for key in slots + (crossing,)])
+        if protection != 0 and move not in threats:
+            bounds[move] = max(bounds.get(move, 0), protection)
@@ -0,0 +1,1799 @@
+# Author: Richard Silva
+# Date: 8/12/2021
+# Description: This program is a representation of the board game Quoridor complete with all its rules.
+
+import random
+from collections import OrderedDict
+
+PAWN_NAMES = {1: "P1", 2: "P2", 3: "P3", 4: "P4"}
+PLAYER_COUNTS = (2, 4)
+MAX_FENCES = 20
+LEFT, RIGHT, TOP, BOTTOM = 0, 1, 2, 3
+PERPENDICULAR = {LEFT: (TOP, BOTTOM), RIGHT: (TOP, BOTTOM), TOP: (LEFT, RIGHT), BOTTOM: (LEFT, RIGHT)}
+FENCE_LENGTHS = (1, 2)
+
+
+class ZobristKeys:
+    """
+    Holds the random 64 bit numbers used for Zobrist hashing, one for each pawn on each cell, each fence position,
+    each count of remaining fences and each player's turn. A position is hashed by combining the numbers of its parts
+    with exclusive or, so adding or removing a part only costs one more exclusive or. The numbers come from a fixed
+    seed so every process hashes the same position to the same number.
+    """
+    def __init__(self, seed=8122021, size=9):
+        """
+        Creates the private dictionaries of numbers for pawns, fences, fence counts up to MAX_FENCES and turns on a
+        board of the integer size parameter, drawing them in a fixed order from a random number generator seeded with
+        the seed parameter, which is kept for the numbers of larger fence counts
+        """
+        rng = random.Random(seed)
+        self._seed = seed
+        self._pawn_keys = {}
+        self._fence_keys = {}
+        self._fence_count_keys = {}
+        self._turn_keys = {}
+        for x_value in range(0, size):
+            for y_value in range(0, size):
+                for pawn in PAWN_NAMES.values():
+                    self._pawn_keys[(pawn, (x_value, y_value))] = rng.getrandbits(64)
+                if y_value != 0:
+                    self._fence_keys[('h', (x_value, y_value))] = rng.getrandbits(64)
+                if x_value != 0:
+                    self._fence_keys[('v', (x_value, y_value))] = rng.getrandbits(64)
+        for player in PAWN_NAMES:
+            self._turn_keys[player] = rng.getrandbits(64)
+            for count in range(0, MAX_FENCES + 1):
+                self._fence_count_keys[(player, count)] = rng.getrandbits(64)
+        self._fair_play_key = rng.getrandbits(64)
+
+    def get_pawn_keys(self):
+        """
+        Returns the dictionary of numbers for pawns, keyed by a tuple of the pawn ("P1" to "P4") and its position
+        """
+        return self._pawn_keys
+
+    def get_pawn_key(self, pawn, position):
+        """
+        Returns the number for the pawn parameter ("P1" to "P4") on the tuple position parameter, 0 if there is none
+        """
+        return self._pawn_keys.get((pawn, position), 0)
+
+    def get_fence_key(self, direction, position):
+        """
+        Returns the number for a fence at the direction and position parameters, 0 if there is none
+        """
+        return self._fence_keys.get((direction, position), 0)
+
+    def get_fence_count_key(self, player, count):
+        """
+        Returns the number for the player parameter having count fences left, 0 if there is no such player or count.
+        Counts above MAX_FENCES, from games given more fences, get a number drawn the first time it is asked for from
+        a generator seeded with the seed, player and count, so every process still draws the same one
+        """
+        key = self._fence_count_keys.get((player, count))
+        if key is None:
+            if player not in PAWN_NAMES or not isinstance(count, int) or count < 0:
+                return 0
+            key = random.Random("{}:{}:{}".format(self._seed, player, count)).getrandbits(64)
+            self._fence_count_keys[(player, count)] = key
+        return key
+
+    def get_turn_key(self, player):
+        """
+        Returns the number for it being the turn of the player parameter, 0 if there is none
+        """
+        return self._turn_keys.get(player, 0)
+
+    def get_fair_play_key(self):
+        """
+        Returns the number mixed into the keys of fair play results so they never share a key with a game position
+        """
+        return self._fair_play_key
+
+
+class TranspositionTable:
+    """
+    A bounded table of results keyed by Zobrist hash, shared by searches that reach the same position by different
+    move orders. With the "depth" replacement policy the table is a fixed list of slots picked by the hash, and a slot
+    only gives way to a result for the same position or one searched at least as deep. With the "lru" policy the table
+    keeps the most recently used results and drops the least recently used one once it is full.
+    """
+    def __init__(self, size=65536, replacement="depth"):
+        """
+        Creates the private members holding the table size, the replacement policy, the stored results and the
+        number of hits and misses. Raises ValueError if the replacement parameter is not "depth" or "lru"
+        """
+        if replacement not in ("depth", "lru"):
+            raise ValueError("replacement must be 'depth' or 'lru'")
+        self._size = size
+        self._replacement = replacement
+        if replacement == "depth":
+            self._entries = [None] * size
+        else:
+            self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get_hits(self):
+        """
+        Returns the number of lookups that found a result
+        """
+        return self._hits
+
+    def get_misses(self):
+        """
+        Returns the number of lookups that did not find a result
+        """
+        return self._misses
+
+    def store(self, key, value, depth=0):
+        """
+        Stores the value parameter, which must not be None, as the result for the integer key parameter searched to
+        the integer depth parameter. Follows the replacement policy of the table when the table is full
+        """
+        if self._replacement == "lru":
+            self._entries[key] = (depth, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+            return
+        index = key % self._size
+        entry = self._entries[index]
+        if entry is None or entry[0] == key or depth >= entry[1]:
+            self._entries[index] = (key, depth, value)
+
+    def lookup(self, key, depth=0):
+        """
+        Returns the value stored for the integer key parameter if it was searched at least to the integer depth
+        parameter, returns None if not
+        """
+        if self._replacement == "lru":
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= depth:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+        else:
+            entry = self._entries[key % self._size]
+            if entry is not None and entry[0] == key and entry[1] >= depth:
+                self._hits += 1
+                return entry[2]
+        self._misses += 1
+        return None
+
+    def clear(self):
+        """
+        Removes every stored result and resets the hit and miss counts
+        """
+        self.__init__(self._size, self._replacement)
+
+
+class Geometry:
+    """
+    The tables of one board size, built once and shared by every board and game of that size: the cells and fence
+    positions in the order boards list them, the start cell and goal cells of each player, the bits BitBoard gives
+    them and the adjacency and fence edge tables move checks and path searches read instead of building neighbor
+    tuples. Player 1 starts in the middle of the top row and goes for the bottom row, player 2 the other way around,
+    player 3 starts in the middle of the left column and goes for the right column and player 4 the other way around.
+    Cell (x, y) has index x + size * y in the tables and bit 1 << (x + size * y) in the bitmasks. The edge leaving cell
+    index in direction LEFT, RIGHT, TOP or BOTTOM has number 4 * index + direction. A fence piece of each length in
+    FENCE_LENGTHS is listed by the (direction, position) it is placed with, a horizontal piece of length 2 at (x, y)
+    covering the slots (x, y) and (x + 1, y) and crossing the grid point (x + 1, y) between them, a vertical one
+    covering (x, y) and (x, y + 1) and crossing the grid point (x, y + 1).
+    """
+    def __init__(self, size):
+        """
+        Builds the tables of a board with the integer size parameter number of cells on each side, along with the
+        ZobristKeys of that size
+        """
+        middle = size // 2
+        self._size = size
+        self._cells = [(x_value, y_value) for x_value in range(0, size) for y_value in range(0, size)]
+        self._horizontal_slots = [position for position in self._cells if position[1] != 0]
+        self._vertical_slots = [position for position in self._cells if position[0] != 0]
+        self._start_positions = {1: (middle, 0), 2: (middle, size - 1), 3: (0, middle), 4: (size - 1, middle)}
+        self._goal_cells = {1: frozenset(position for position in self._cells if position[1] == size - 1),
+                            2: frozenset(position for position in self._cells if position[1] == 0),
+                            3: frozenset(position for position in self._cells if position[0] == size - 1),
+                            4: frozenset(position for position in self._cells if position[0] == 0)}
+        self._index_cells = sorted(self._cells, key=lambda position: position[0] + size * position[1])
+        self._cell_indexes = {position: index for index, position in enumerate(self._index_cells)}
+        self.helper_edge_tables()
+        self._fence_pieces = {length: self.helper_fence_pieces(length) for length in FENCE_LENGTHS}
+        self._cell_bits = {position: 1 << (position[0] + size * position[1]) for position in self._cells}
+        self._bit_cells = {bit: position for position, bit in self._cell_bits.items()}
+        self._horizontal_mask = sum(self._cell_bits[position] for position in self._horizontal_slots)
+        self._vertical_mask = sum(self._cell_bits[position] for position in self._vertical_slots)
+        self._goal_tables = {}
+        self._goal_masks = {}
+        for player, goal in self._goal_cells.items():
+            self._goal_tables[player] = [(index % size, index // size) in goal for index in range(0, size * size)]
+            self._goal_masks[player] = sum(self._cell_bits[position] for position in goal)
+        self._zobrist_keys = ZobristKeys(size=size)
+
+    def __reduce__(self):
+        """
+        Copies and pickles of a Geometry come back as the one get_geometry keeps for its size, so they are not
+        duplicated
+        """
+        return get_geometry, (self._size,)
+
+    def helper_edge_tables(self):
+        """
+        Helper function to the constructor, builds the adjacency list holding the index of the cell at the end of each
+        edge, -1 for an edge leading off the board, the edge slots list holding the (direction, position) fence slot
+        on each edge, the cell edges list holding the (edge, neighbor index) tuples of the edges of each cell that stay
+        on the board and the cut edges dictionary holding the tuple of edges each fence slot cuts
+        """
+        self._adjacency = []
+        self._edge_slots = []
+        self._cut_edges = {}
+        for x_value, y_value in self._index_cells:
+            for neighbor, slot in (((x_value - 1, y_value), ('v', (x_value, y_value))),
+                                   ((x_value + 1, y_value), ('v', (x_value + 1, y_value))),
+                                   ((x_value, y_value - 1), ('h', (x_value, y_value))),
+                                   ((x_value, y_value + 1), ('h', (x_value, y_value + 1)))):
+                on_board = neighbor in self._cell_indexes
+                self._adjacency.append(self._cell_indexes[neighbor] if on_board else -1)
+                self._edge_slots.append(slot if on_board else None)
+                if on_board:
+                    self._cut_edges.setdefault(slot, []).append(len(self._adjacency) - 1)
+        self._cut_edges = {slot: tuple(edges) for slot, edges in self._cut_edges.items()}
+        self._cell_edges = [tuple((edge, self._adjacency[edge]) for edge in range(4 * index, 4 * index + 4)
+                                  if self._adjacency[edge] != -1) for index in range(0, len(self._index_cells))]
+
+    def helper_fence_pieces(self, length):
+        """
+        Helper function to the constructor, returns a dictionary keyed by the (direction, position) of every fence
+        piece of the integer length parameter that fits on the board. Each value is a tuple of the tuple of
+        (direction, position) slots the piece covers and the grid point it crosses, None for a piece of length 1
+        """
+        slots = {'h': set(self._horizontal_slots), 'v': set(self._vertical_slots)}
+        steps = {'h': (1, 0), 'v': (0, 1)}
+        pieces = {}
+        for direction in ('h', 'v'):
+            step_x, step_y = steps[direction]
+            for x_value, y_value in (self._horizontal_slots if direction == 'h' else self._vertical_slots):
+                covered = tuple((direction, (x_value + num * step_x, y_value + num * step_y)) for num in range(length))
+                if all(slot[1] in slots[direction] for slot in covered):
+                    crossing = (x_value + step_x, y_value + step_y) if length == 2 else None
+                    pieces[(direction, (x_value, y_value))] = (covered, crossing)
+        return pieces
+
+    def get_size(self):
+        """
+        Returns the number of cells on each side of the board
+        """
+        return self._size
+
+    def get_fence_pieces(self, length):
+        """
+        Returns the dictionary of fence pieces of the integer length parameter built by helper_fence_pieces, None for
+        a length not in FENCE_LENGTHS
+        """
+        return self._fence_pieces.get(length)
+
+    def get_index_cells(self):
+        """
+        Returns the list of the position of each cell, indexed by cell index
+        """
+        return self._index_cells
+
+    def get_cell_indexes(self):
+        """
+        Returns the dictionary of the index of each cell, keyed by position
+        """
+        return self._cell_indexes
+
+    def get_adjacency(self):
+        """
+        Returns the list of the index of the cell at the end of each edge, -1 for an edge leading off the board
+        """
+        return self._adjacency
+
+    def get_edge_slots(self):
+        """
+        Returns the list of the (direction, position) fence slot on each edge, None for an edge leading off the board
+        """
+        return self._edge_slots
+
+    def get_cell_edges(self):
+        """
+        Returns the list of the tuple of (edge, neighbor index) tuples of the edges of each cell that stay on the board
+        """
+        return self._cell_edges
+
+    def get_cut_edges(self, direction, position):
+        """
+        Returns the tuple of edges a fence in the direction parameter at the tuple position parameter cuts, both ways
+        across each, empty if there is no such fence slot
+        """
+        return self._cut_edges.get((direction, position), ())
+
+    def get_cells(self):
+        """
+        Returns the list of every cell position
+        """
+        return self._cells
+
+    def get_horizontal_slots(self):
+        """
+        Returns the list of every position a horizontal fence can be placed at
+        """
+        return self._horizontal_slots
+
+    def get_vertical_slots(self):
+        """
+        Returns the list of every position a vertical fence can be placed at
+        """
+        return self._vertical_slots
+
+    def get_start_position(self, player):
+        """
+        Returns the cell the pawn of the integer player parameter starts on
+        """
+        return self._start_positions.get(player)
+
+    def get_goal_cells(self, player):
+        """
+        Returns the frozenset of cells the integer player parameter wins by reaching
+        """
+        return self._goal_cells.get(player)
+
+    def is_goal(self, player, position):
+        """
+        Returns True if the tuple position parameter is one of the goal cells of the integer player parameter
+        """
+        return position in self._goal_cells.get(player, ())
+
+    def get_goal_table(self, player):
+        """
+        Returns the list telling for each cell index whether it is a goal cell of the integer player parameter
+        """
+        return self._goal_tables.get(player)
+
+    def get_goal_mask(self, player):
+        """
+        Returns the bitmask of the goal cells of the integer player parameter
+        """
+        return self._goal_masks.get(player, 0)
+
+    def get_cell_bits(self):
+        """
+        Returns the dictionary of the bit of each cell, keyed by position
+        """
+        return self._cell_bits
+
+    def get_bit_cells(self):
+        """
+        Returns the dictionary of the position of each cell, keyed by bit
+        """
+        return self._bit_cells
+
+    def get_horizontal_mask(self):
+        """
+        Returns the bitmask of every position a horizontal fence can be placed at
+        """
+        return self._horizontal_mask
+
+    def get_vertical_mask(self):
+        """
+        Returns the bitmask of every position a vertical fence can be placed at
+        """
+        return self._vertical_mask
+
+    def get_zobrist_keys(self):
+        """
+        Returns the ZobristKeys shared by every board of this size
+        """
+        return self._zobrist_keys
+
+
+GEOMETRIES = {}
+
+
+def get_geometry(size):
+    """
+    Returns the Geometry of boards with the integer size parameter number of cells on each side, building it the
+    first time that size is asked for. Raises ValueError for a size smaller than 3
+    """
+    if size not in GEOMETRIES:
+        if size < 3:
+            raise ValueError("the board needs at least 3 cells on each side")
+        GEOMETRIES[size] = Geometry(size)
+    return GEOMETRIES[size]
+
+
+class Board:
+    """
+    A representation of a board with respective fences and cells, contains the horizontal fences, vertical fences
+    and cells in their respective dictionary. The positions on the board are the keys and the values are a string
+    that signifies if a pawn or a fence is present. Keeps the Zobrist hash of the pawns and of the fences up to date
+    as they are set and removed. The size of the board and where pawns start and finish come from its Geometry.
+    Alongside the dictionaries, the pawns are kept in a list indexed by cell index and the number of fences cutting
+    each edge of the Geometry in a bytearray, which is what move checks and path searches read.
+    """
+    _shared_tables = ("_zobrist_keys", "_pawn_keys", "_cell_indexes", "_index_cells", "_adjacency", "_cell_edges")
+
+    def __init__(self, size=9, players=2):
+        """
+        Creates private members (dictionaries) for horizontal rows, vertical rows and cells, with a key for every
+        position of fences and cells listed by the Geometry of the integer size parameter. Populates the start cell
+        of each of the integer players parameter number of players with their pawn. Also creates the occupants list
+        and blocked edges bytearray and the visited and parents lists reused by every path search, one entry per cell.
+        """
+        geometry = get_geometry(size)
+        self._geometry = geometry
+        self._size = size
+        self.set_shared_tables()
+        self._occupants = [None] * (size * size)
+        self._blocked_edges = bytearray(4 * size * size)
+        self._visited = [0] * (size * size)
+        self._parents = [None] * (size * size)
+        self._search_number = 0
+        self._vertical_row = dict.fromkeys(geometry.get_vertical_slots())
+        self._horizontal_row = dict.fromkeys(geometry.get_horizontal_slots())
+        self._cells = dict.fromkeys(geometry.get_cells())
+        self._pawn_hash = 0
+        self._fence_hash = 0
+        for player in range(1, players + 1):
+            self.set_cell(player, geometry.get_start_position(player))
+
+    def __getstate__(self):
+        """
+        Returns the dictionary of private members copy and pickle save, leaving out the tables named in
+        _shared_tables so copies share them instead of duplicating them
+        """
+        return {name: value for name, value in self.__dict__.items() if name not in self._shared_tables}
+
+    def __setstate__(self, state):
+        """
+        Restores the private members of the state dictionary parameter made by __getstate__ along with the tables
+        shared with the Geometry
+        """
+        self.__dict__.update(state)
+        self.set_shared_tables()
+
+    def set_shared_tables(self):
+        """
+        Sets the private members holding the tables of the Geometry of the board, shared by every board of that size
+        """
+        self._zobrist_keys = self._geometry.get_zobrist_keys()
+        self._pawn_keys = self._zobrist_keys.get_pawn_keys()
+        self._cell_indexes = self._geometry.get_cell_indexes()
+        self._index_cells = self._geometry.get_index_cells()
+        self._adjacency = self._geometry.get_adjacency()
+        self._cell_edges = self._geometry.get_cell_edges()
+
+    def get_size(self):
+        """
+        Returns the number of cells on each side of the board
+        """
+        return self._size
+
+    def get_geometry(self):
+        """
+        Returns the Geometry of the board
+        """
+        return self._geometry
+
+    def get_fence_masks(self):
+        """
+        Returns a tuple of the bitmasks of the horizontal and vertical fences, one bit per slot as BitBoard keeps them
+        """
+        cell_bits = self._geometry.get_cell_bits()
+        return (sum(cell_bits[position] for position, fence in self._horizontal_row.items() if fence is not None),
+                sum(cell_bits[position] for position, fence in self._vertical_row.items() if fence is not None))
+
+    def get_vertical_rows(self):
+        """
+        Returns a dictionary of the vertical rows portion of the board dictionary
+        """
+        return self._vertical_row
+
+    def get_horizontal_rows(self):
+        """
+        Returns a dictionary of the horizontal rows portion of the board dictionary
+        """
+        return self._horizontal_row
+
+    def get_cells(self):
+        """
+        Returns a dictionary of the cells portion of the board dictionary
+        """
+        return self._cells
+
+    def get_occupants(self):
+        """
+        Returns the list of the name of the pawn in each cell, None for an empty cell, indexed by cell index
+        """
+        return self._occupants
+
+    def get_blocked_edges(self):
+        """
+        Returns the bytearray of the number of fences cutting each edge of the Geometry, 0 for an open edge
+        """
+        return self._blocked_edges
+
+    def helper_cut_edges(self, direction, position, change):
+        """
+        Adds the integer change parameter to the count of fences cutting each edge cut by a fence in the direction
+        parameter at the tuple position parameter, called as fences are set and removed
+        """
+        blocked_edges = self._blocked_edges
+        for edge in self._geometry.get_cut_edges(direction, position):
+            blocked_edges[edge] += change
+
+    def get_zobrist_keys(self):
+        """
+        Returns the ZobristKeys object shared by every board of the same size
+        """
+        return self._zobrist_keys
+
+    def get_hash(self):
+        """
+        Returns the Zobrist hash of the pawns and fences on the board
+        """
+        return self._pawn_hash ^ self._fence_hash
+
+    def get_fence_hash(self):
+        """
+        Returns the Zobrist hash of the fences on the board only
+        """
+        return self._fence_hash
+
+    def get_vertical_row(self, position):
+        """
+        Returns the value in a key (tuple position parameter) in the vertical rows dictionary
+        """
+        return self._vertical_row.get(position)
+
+    def get_horizontal_row(self, position):
+        """
+        Returns the value in a key (tuple position parameter) in the horizontal rows dictionary
+        """
+        return self._horizontal_row.get(position)
+
+    def get_cell(self, position):
+        """
+        Returns the value in a key (tuple position parameter) in the cells dictionary
+        """
+        return self._cells.get(position)
+
+    def is_cell(self, position):
+        """
+        Returns True if the tuple position parameter is a cell on the board, False if not
+        """
+        return position in self._cells
+
+    def is_horizontal_slot(self, position):
+        """
+        Returns True if a horizontal fence can exist at the tuple position parameter, False if not
+        """
+        return position in self._horizontal_row
+
+    def is_vertical_slot(self, position):
+        """
+        Returns True if a vertical fence can exist at the tuple position parameter, False if not
+        """
+        return position in self._vertical_row
+
+    def set_vertical_fence(self, position):
+        """
+        Sets a vertical fence at the desired position taking a tuple representing a position as a parameter
+        """
+        vertical_rows = self.get_vertical_rows()
+        if vertical_rows.get(position) is None:
+            self._fence_hash ^= self._zobrist_keys.get_fence_key('v', position)
+            self.helper_cut_edges('v', position, 1)
+        vertical_rows.update({position: "W"})
+
+    def set_horizontal_fence(self, position):
+        """
+        Sets a horizontal fence at the desired position taking a tuple representing a position as a parameter
+        """
+        horizontal_rows = self.get_horizontal_rows()
+        if horizontal_rows.get(position) is None:
+            self._fence_hash ^= self._zobrist_keys.get_fence_key('h', position)
+            self.helper_cut_edges('h', position, 1)
+        horizontal_rows.update({position: "W"})
+
+    def set_cell(self, player, position):
+        """
+        Sets new pawn position in desired cell, player parameter must be passed along with a tuple representing
+        a position
+        """
+        cells = self.get_cells()
+        if cells.get(position) is not None:
+            self._pawn_hash ^= self._pawn_keys.get((cells.get(position), position), 0)
+        if player in PAWN_NAMES:
+            cells.update({position: PAWN_NAMES[player]})
+        self._pawn_hash ^= self._pawn_keys.get((cells.get(position), position), 0)
+        if position in self._cell_indexes:
+            self._occupants[self._cell_indexes[position]] = cells.get(position)
+
+    def remove_pawn_position(self, position):
+        """
+        Takes the tuple position as a parameter and changes the value of the dictionary value to None.
+        """
+        cells = self.get_cells()
+        self._pawn_hash ^= self._pawn_keys.get((cells.get(position), position), 0)
+        cells.update({position: None})
+        if position in self._cell_indexes:
+            self._occupants[self._cell_indexes[position]] = None
+
+    def remove_fence_position(self, direction, position):
+        """
+        Takes the tuple position as a parameter and changes the value of a fence position to None
+        """
+        if direction == 'h':
+            horizontal_walls = self.get_horizontal_rows()
+            if horizontal_walls.get(position) is not None:
+                self._fence_hash ^= self._zobrist_keys.get_fence_key('h', position)
+                self.helper_cut_edges('h', position, -1)
+            horizontal_walls.update({position: None})
+        elif direction == 'v':
+            vertical_walls = self.get_vertical_rows()
+            if vertical_walls.get(position) is not None:
+                self._fence_hash ^= self._zobrist_keys.get_fence_key('v', position)
+                self.helper_cut_edges('v', position, -1)
+            vertical_walls.update({position: None})
+
+    def get_open_fence_positions(self, direction):
+        """
+        Returns a list of the positions without a fence in the horizontal rows dictionary if the direction parameter
+        is "h" or in the vertical rows dictionary if it is "v"
+        """
+        if direction == 'h':
+            fences = self.get_horizontal_rows()
+        elif direction == 'v':
+            fences = self.get_vertical_rows()
+        else:
+            return []
+        return [position for position, fence in fences.items() if fence is None]
+
+    def get_fence_between(self, position, other_position):
+        """
+        Takes two neighboring cells as tuple parameters and returns the direction and position of the fence slot on
+        the edge between them as a tuple, looked up in the edge slots table, returns None if the cells are not
+        neighbors
+        """
+        index, other_index = self._cell_indexes.get(position), self._cell_indexes.get(other_position)
+        if index is None or other_index is None:
+            return None
+        for edge, neighbor in self._cell_edges[index]:
+            if neighbor == other_index:
+                return self._geometry.get_edge_slots()[edge]
+        return None
+
+    def get_open_neighbors(self, position):
+        """
+        Returns a list of the cells next to the tuple position parameter that are not cut off from it by a fence,
+        pawns are not taken into account
+        """
+        index = self._cell_indexes.get(position)
+        if index is None:
+            return []
+        blocked_edges, index_cells = self._blocked_edges, self._index_cells
+        return [index_cells[neighbor] for edge, neighbor in self._cell_edges[index] if not blocked_edges[edge]]
+
+    def search_goal(self, position, player):
+        """
+        Iterative breadth first search from the tuple position parameter toward the goal cells of the integer player
+        parameter, walking cell indexes through the cell edges table and looking the goal cells up in the goal table
+        of the Geometry. Fences block the search and pawns do not. Visited cells are marked with a new search number in
+        the preallocated visited list so it never has to be cleared, the cell each one was reached from goes in the
+        parents list. Returns a tuple of the index of the first goal cell reached and its distance from position,
+        (None, None) if no goal cell can be reached.
+        """
+        goal = self._geometry.get_goal_table(player)
+        start = self._cell_indexes[position]
+        self._search_number += 1
+        self._visited[start] = self._search_number
+        self._parents[start] = None
+        frontier = [start]
+        distance = 0
+        while frontier:
+            for current in frontier:
+                if goal[current]:
+                    return current, distance
+            frontier = self.helper_search_goal(frontier)
+            distance += 1
+        return None, None
+
+    def helper_search_goal(self, frontier):
+        """
+        Helper function to search_goal, marks and returns the list of unvisited cell indexes one open edge away from
+        the cell indexes in the frontier list parameter
+        """
+        visited, parents = self._visited, self._parents
+        blocked_edges, cell_edges = self._blocked_edges, self._cell_edges
+        number = self._search_number
+        next_frontier = []
+        for current in frontier:
+            for edge, neighbor in cell_edges[current]:
+                if visited[neighbor] != number and not blocked_edges[edge]:
+                    visited[neighbor] = number
+                    parents[neighbor] = current
+                    next_frontier.append(neighbor)
+        return next_frontier
+
+    def get_distance_to_goal(self, position, player):
+        """
+        Returns the number of steps on the shortest path from the tuple position parameter to the goal cells of the
+        integer player parameter without crossing a fence, returns None if they cannot be reached
+        """
+        return self.search_goal(position, player)[1]
+
+    def can_reach_goal(self, position, player):
+        """
+        Returns True if the goal cells of the integer player parameter can be reached from the tuple position
+        parameter without crossing a fence, False if not
+        """
+        return self.get_distance_to_goal(position, player) is not None
+
+    def find_path(self, position, player):
+        """
+        Returns a list of the cells on a shortest path from the tuple position parameter to the goal cells of the
+        integer player parameter found by search_goal, position included, or None if they cannot be reached.
+        """
+        goal, distance = self.search_goal(position, player)
+        if goal is None:
+            return None
+        return self.helper_find_path(goal)
+
+    def helper_find_path(self, index):
+        """
+        Helper function to find_path, follows the parents list of the last search back from the cell index parameter
+        and returns the positions of the cells walked through in order from the start of the search
+        """
+        path = []
+        while index is not None:
+            path.append(self._index_cells[index])
+            index = self._parents[index]
+        path.reverse()
+        return path
+
+    def display_board(self):
+        """
+        Prints a board display of the current state of the board, displaying "P1" for player 1, "P2" for player 2,
+        "==" for a horizontal fence and "|" for a vertical fence. "+" are board corners. The drawing itself lives in
+        the rendering module, which is only imported the first time a board is displayed
+        """
+        from .rendering import display_board
+        display_board(self)
+
+
+class BitBoard(Board):
+    """
+    A representation of the board that keeps the fences as integer bitmasks instead of dictionaries, can be passed to
+    QuoridorGame in place of Board. Bit x + size * y stands for the cell (x, y), for the horizontal fence on the top
+    edge of that cell and for the vertical fence on its left edge. Pawn occupancy is not bit-based: the pawns are only
+    kept in the occupants list indexed by cell, the same list Board keeps, and pawn moves are checked through it on
+    both boards. BitBoard differs from Board in how it stores fences and in the shortest path searches, which spread
+    bitmasks of cells with shifts. The blocked edges bytearray is kept alongside the bitmasks. The dictionaries
+    returned by the getters are copies built from them, changing them does not change the board.
+    """
+    _shared_tables = Board._shared_tables + ("_cell_bits", "_bit_cells", "_horizontal_mask", "_vertical_mask")
+
+    def __init__(self, size=9, players=2):
+        """
+        Creates private members holding the tables of the Geometry of the integer size parameter, the occupants list,
+        the blocked edges bytearray, the bitmasks of the horizontal and vertical fences and the Zobrist hashes.
+        Populates the start cell of each of the integer players parameter number of players with their pawn.
+        """
+        geometry = get_geometry(size)
+        self._geometry = geometry
+        self._size = size
+        self.set_shared_tables()
+        self._occupants = [None] * (size * size)
+        self._blocked_edges = bytearray(4 * size * size)
+        self._vertical_fences = 0
+        self._horizontal_fences = 0
+        self._pawn_hash = 0
+        self._fence_hash = 0
+        for player in range(1, players + 1):
+            self.set_cell(player, geometry.get_start_position(player))
+
+    def set_shared_tables(self):
+        """
+        Sets the private members holding the tables of the Geometry of the board, shared by every board of that size,
+        along with the bit tables and masks
+        """
+        super().set_shared_tables()
+        self._cell_bits = self._geometry.get_cell_bits()
+        self._bit_cells = self._geometry.get_bit_cells()
+        self._horizontal_mask = self._geometry.get_horizontal_mask()
+        self._vertical_mask = self._geometry.get_vertical_mask()
+
+    def get_fence_masks(self):
+        """
+        Returns a tuple of the bitmasks of the horizontal and vertical fences
+        """
+        return self._horizontal_fences, self._vertical_fences
+
+    def get_bit(self, position):
+        """
+        Returns the bit standing for the tuple position parameter, returns 0 if the position is not on the board
+        """
+        return self._cell_bits.get(position, 0)
+
+    def get_vertical_rows(self):
+        """
+        Returns a dictionary of every vertical fence position built from the vertical fence bitmask
+        """
+        fences = self._vertical_fences
+        return {position: "W" if bit & fences else None for position, bit in self._cell_bits.items()
+                if bit & self._vertical_mask}
+
+    def get_horizontal_rows(self):
+        """
+        Returns a dictionary of every horizontal fence position built from the horizontal fence bitmask
+        """
+        fences = self._horizontal_fences
+        return {position: "W" if bit & fences else None for position, bit in self._cell_bits.items()
+                if bit & self._horizontal_mask}
+
+    def get_cells(self):
+        """
+        Returns a dictionary of every cell built from the occupants list
+        """
+        occupants, cell_indexes = self._occupants, self._cell_indexes
+        return {position: occupants[cell_indexes[position]] for position in self._cell_bits}
+
+    def get_vertical_row(self, position):
+        """
+        Returns "W" if there is a vertical fence at the tuple position parameter, None if not
+        """
+        if self._cell_bits.get(position, 0) & self._vertical_fences:
+            return "W"
+        return None
+
+    def get_horizontal_row(self, position):
+        """
+        Returns "W" if there is a horizontal fence at the tuple position parameter, None if not
+        """
+        if self._cell_bits.get(position, 0) & self._horizontal_fences:
+            return "W"
+        return None
+
+    def get_cell(self, position):
+        """
+        Returns the name of the pawn in the cell at the tuple position parameter, None if the cell is empty
+        """
+        index = self._cell_indexes.get(position)
+        if index is None:
+            return None
+        return self._occupants[index]
+
+    def is_cell(self, position):
+        """
+        Returns True if the tuple position parameter is a cell on the board, False if not
+        """
+        return position in self._cell_bits
+
+    def is_horizontal_slot(self, position):
+        """
+        Returns True if a horizontal fence can exist at the tuple position parameter, False if not
+        """
+        return self.get_bit(position) & self._horizontal_mask != 0
+
+    def is_vertical_slot(self, position):
+        """
+        Returns True if a vertical fence can exist at the tuple position parameter, False if not
+        """
+        return self.get_bit(position) & self._vertical_mask != 0
+
+    def set_vertical_fence(self, position):
+        """
+        Sets a vertical fence at the desired position taking a tuple representing a position as a parameter
+        """
+        bit = self.get_bit(position) & self._vertical_mask
+        if bit & ~self._vertical_fences:
+            self._fence_hash ^= self._zobrist_keys.get_fence_key('v', position)
+            self.helper_cut_edges('v', position, 1)
+        self._vertical_fences |= bit
+
+    def set_horizontal_fence(self, position):
+        """
+        Sets a horizontal fence at the desired position taking a tuple representing a position as a parameter
+        """
+        bit = self.get_bit(position) & self._horizontal_mask
+        if bit & ~self._horizontal_fences:
+            self._fence_hash ^= self._zobrist_keys.get_fence_key('h', position)
+            self.helper_cut_edges('h', position, 1)
+        self._horizontal_fences |= bit
+
+    def set_cell(self, player, position):
+        """
+        Sets new pawn position in desired cell, player parameter must be passed along with a tuple representing
+        a position
+        """
+        index = self._cell_indexes.get(position)
+        if index is None:
+            return
+        if self._occupants[index] is not None:
+            self.remove_pawn_position(position)
+        if player in PAWN_NAMES:
+            self._occupants[index] = PAWN_NAMES[player]
+            self._pawn_hash ^= self._pawn_keys.get((PAWN_NAMES[player], position), 0)
+
+    def remove_pawn_position(self, position):
+        """
+        Takes the tuple position as a parameter and takes the pawn off that cell if there is one
+        """
+        index = self._cell_indexes.get(position)
+        if index is not None:
+            self._pawn_hash ^= self._pawn_keys.get((self._occupants[index], position), 0)
+            self._occupants[index] = None
+
+    def remove_fence_position(self, direction, position):
+        """
+        Takes the tuple position as a parameter and clears the bit of that fence position in the fence bitmask of
+        the direction parameter
+        """
+        if direction == 'h':
+            if self.get_horizontal_row(position) is not None:
+                self._fence_hash ^= self._zobrist_keys.get_fence_key('h', position)
+                self.helper_cut_edges('h', position, -1)
+            self._horizontal_fences &= ~self.get_bit(position)
+        elif direction == 'v':
+            if self.get_vertical_row(position) is not None:
+                self._fence_hash ^= self._zobrist_keys.get_fence_key('v', position)
+                self.helper_cut_edges('v', position, -1)
+            self._vertical_fences &= ~self.get_bit(position)
+
+    def get_open_fence_positions(self, direction):
+        """
+        Returns a list of the positions without a fence in the horizontal fence bitmask if the direction parameter
+        is "h" or in the vertical fence bitmask if it is "v"
+        """
+        if direction == 'h':
+            open_bits = self._horizontal_mask & ~self._horizontal_fences
+        elif direction == 'v':
+            open_bits = self._vertical_mask & ~self._vertical_fences
+        else:
+            return []
+        return [position for position, bit in self._cell_bits.items() if bit & open_bits]
+
+    def get_distance_to_goal(self, position, player):
+        """
+        Spreads the frontier of reached cells one step at a time from the tuple position parameter until it touches
+        the goal cells of the integer player parameter. Returns the number of steps taken, which is the length of the
+        shortest path, or None if the frontier runs out first.
+        """
+        goal = self._geometry.get_goal_mask(player)
+        reached = self.get_bit(position)
+        frontier = reached
+        distance = 0
+        while frontier & goal == 0:
+            frontier = self.spread_cells(frontier) & ~reached
+            if frontier == 0:
+                return None
+            reached |= frontier
+            distance += 1
+        return distance
+
+    def spread_cells(self, cells):
+        """
+        Returns a bitmask of the cells one step away from the cells bitmask parameter that are not cut off by a fence
+        """
+        horizontal_open = self._horizontal_mask & ~self._horizontal_fences
+        vertical_open = self._vertical_mask & ~self._vertical_fences
+        size = self._size
+        return ((cells & horizontal_open) >> size) | ((cells << size) & horizontal_open) | \
+            ((cells & vertical_open) >> 1) | ((cells << 1) & vertical_open)
+
+    def find_path(self, position, player):
+        """
+        Spreads the reached cells one layer at a time from the tuple position parameter, keeping each new layer, until
+        a layer touches the goal cells of the integer player parameter. Returns a list of the cells on a shortest path
+        from position to a goal cell, position included, or None if no goal cell can be reached.
+        """
+        goal = self._geometry.get_goal_mask(player)
+        reached = self.get_bit(position)
+        layers = [reached]
+        while layers[-1] & goal == 0:
+            frontier = self.spread_cells(layers[-1]) & ~reached
+            if frontier == 0:
+                return None
+            reached |= frontier
+            layers.append(frontier)
+        return self.trace_path(layers, layers[-1] & goal)
+
+    def trace_path(self, layers, cells):
+        """
+        Helper function to find_path, walks back through the layers list from one of the bits of the cells bitmask
+        by picking a neighboring bit in each earlier layer. Returns the cells walked through in order from the start
+        """
+        bit = cells & -cells
+        path = [self._bit_cells[bit]]
+        for layer in reversed(layers[:-1]):
+            neighbors = self.spread_cells(bit) & layer
+            bit = neighbors & -neighbors
+            path.append(self._bit_cells[bit])
+        path.reverse()
+        return path
+
+
+class QuoridorGame:
+    """
+    Represents a game of Quoridor between two or four players, initializes the board and allows you to move a pawn,
+    place a fence, verify if a certain player has won and has a fair_play function that verifies if a fencing move is
+    considered "fair play". Players take turns in order, player 1 first, and win by reaching one of their goal cells.
+    """
+    def __init__(self, board_class=Board, transposition_table=None, size=9, players=2, fences=None, fence_length=1):
+        """
+        Initializes a board object with the integer size parameter number of cells on each side and the integer
+        players parameter number of pawns by calling the board_class parameter, Board by default or BitBoard for the
+        bitmask board, and keeps the optional TranspositionTable parameter used to remember fair play results. Also
+        initializes a private dictionary that holds how many remaining fences each player has, the fences parameter
+        or MAX_FENCES shared out between the players if it is None. Fences span the integer fence_length parameter
+        number of slots, 1 as the README has it or 2 for full rules fences that may not overlap or cross.
+        Initializes a game winner member initialized to None, will be initialized to a player if said player has won
+        the game. Contains a private dictionary holding the positions
+        of each player so the class can properly remove a player's old position once their new position is determined
+        valid. Initializes a private member that states which player's turn it is. Initialized to 1. Finally,
+        initializes the path cache holding each player's last known shortest path to their goal cells and the undo
+        stack used by push and pop, the set of grid points crossed by a fence and the endgame tablebase, None until
+        set_tablebase is called. Raises ValueError if players is not one of PLAYER_COUNTS or fence_length is not one
+        of FENCE_LENGTHS.
+        """
+        if players not in PLAYER_COUNTS:
+            raise ValueError("players must be one of " + ", ".join(str(count) for count in PLAYER_COUNTS))
+        if fence_length not in FENCE_LENGTHS:
+            raise ValueError("fence_length must be one of " + ", ".join(str(length) for length in FENCE_LENGTHS))
+        self._board = board_class(size, players)
+        geometry = self._board.get_geometry()
+        if fences is None:
+            fences = MAX_FENCES // players
+        self._fences = {player: fences for player in range(1, players + 1)}
+        self._game_winner = None
+        self._current_player_turn = 1
+        self._positions = {player: geometry.get_start_position(player) for player in range(1, players + 1)}
+        self._path_cache = dict.fromkeys(self._positions)
+        self._undo_stack = []
+        self._transposition_table = transposition_table
+        self._fence_length = fence_length
+        self._fence_crossings = set()
+        self._tablebase = None
+
+    def get_board(self):
+        """
+        Returns the board object
+        """
+        return self._board
+
+    def get_geometry(self):
+        """
+        Returns the Geometry of the board, which knows the start and goal cells of every player
+        """
+        return self._board.get_geometry()
+
+    def get_player_count(self):
+        """
+        Returns the number of players in the game
+        """
+        return len(self._positions)
+
+    def get_fence_length(self):
+        """
+        Returns the number of slots each fence of the game covers
+        """
+        return self._fence_length
+
+    def get_fence_slots(self, direction, position):
+        """
+        Returns the tuple of (direction, position) slots covered by a fence of the game placed in the direction
+        parameter at the tuple position parameter, empty if no such fence fits on the board
+        """
+        piece = self.get_geometry().get_fence_pieces(self._fence_length).get((direction, position))
+        if piece is None:
+            return ()
+        return piece[0]
+
+    def get_transposition_table(self):
+        """
+        Returns the TranspositionTable used to remember fair play results, None if there is none
+        """
+        return self._transposition_table
+
+    def set_transposition_table(self, transposition_table):
+        """
+        Sets the TranspositionTable used to remember fair play results, None stops remembering them
+        """
+        self._transposition_table = transposition_table
+
+    def to_state(self, state=None):
+        """
+        Returns the position of the game packed into a GameState: the pawns, fences, fence counts, turn and winner,
+        without the undo stack. Fills in the state parameter instead of a new one if it is given, such as one taken
+        from a StatePool
+        """
+        from .state import GameState
+        if state is None:
+            state = GameState()
+        state.load_game(self)
+        return state
+
+    def load_state(self, state):
+        """
+        Sets the game to the position packed in the GameState state parameter on a new board of the same class. The
+        undo stack and path cache start empty, the transposition table and tablebase are kept. Raises ValueError for a
+        state of another board size, player count or fence length
+        """
+        board = self.get_board()
+        if (state.get_size(), state.get_player_count(), state.get_fence_length()) != \
+                (board.get_size(), self.get_player_count(), self._fence_length):
+            raise ValueError("the state is for another board size, player count or fence length")
+        self._board = type(board)(board.get_size(), self.get_player_count())
+        self._fence_crossings = set()
+        for direction, position in state.get_fence_pieces():
+            self.set_fence_piece(direction, position)
+        for player in self._positions:
+            self._board.remove_pawn_position(self._board.get_geometry().get_start_position(player))
+        for player in self._positions:
+            self._positions[player] = state.get_player_position(player)
+            self._board.set_cell(player, self._positions[player])
+            self._fences[player] = state.get_player_fences(player)
+        self._current_player_turn = state.get_player_turn()
+        self._game_winner = state.get_game_winner()
+        self._path_cache = dict.fromkeys(self._positions)
+        self._undo_stack = []
+
+    def get_tablebase(self):
+        """
+        Returns the endgame Tablebase used by probe_tablebase, None if there is none
+        """
+        return self._tablebase
+
+    def set_tablebase(self, tablebase):
+        """
+        Sets the endgame Tablebase used by probe_tablebase, None to stop using one
+        """
+        self._tablebase = tablebase
+
+    def probe_tablebase(self):
+        """
+        Looks the position up in the endgame tablebase of the game. Returns a tuple of the player who wins with best
+        play (None if neither can force a win) and the number of plies until the game ends, or None if there is no
+        tablebase or it does not cover the position, which happens while a player still has fences or once a fence
+        has been placed that the tablebase was not made for
+        """
+        if self._tablebase is None:
+            return None
+        return self._tablebase.probe(self)
+
+    def zobrist_hash(self):
+        """
+        Returns a 64 bit Zobrist hash of the game position: the pawns and fences hashed by the board as they change,
+        combined with the remaining fence count of each player and whose turn it is
+        """
+        keys = self.get_board().get_zobrist_keys()
+        fence_counts = 0
+        for player, fences in self._fences.items():
+            fence_counts ^= keys.get_fence_count_key(player, fences)
+        return self.get_board().get_hash() ^ keys.get_turn_key(self.get_player_turn()) ^ fence_counts
+
+    def get_player_fences(self, player):
+        """
+        Takes parameter player as an integer and returns number of fences remaining for that player
+        """
+        return self._fences.get(player)
+
+    def get_game_winner(self):
+        """
+        Returns winner of game as an integer (1 for player 1, 2 for player 2 and so on), None if nobody has won
+        """
+        return self._game_winner
+
+    def get_player_turn(self):
+        """
+        Returns which player's turn it is currently in the game
+        """
+        return self._current_player_turn
+
+    def get_player_position(self, player):
+        """
+        Retrieves player's current position for removal purposes
+        """
+        return self._positions.get(player)
+
+    def get_opponent(self, player):
+        """
+        Takes parameter player as an integer and returns the integer of the player who plays after them, which is
+        the other player in a two player game
+        """
+        if player in self._positions:
+            return player % len(self._positions) + 1
+
+    def get_opponents(self, player):
+        """
+        Takes parameter player as an integer and returns the list of every other player in turn order
+        """
+        return [other for other in self._positions if other != player]
+
+    def set_player_turn(self, player):
+        """
+        Sets player's turn to the desired player in which the player parameter is passed as an integer
+        """
+        self._current_player_turn = player
+
+    def set_game_winner(self, player):
+        """
+        Sets game winner to the desired player in which the player parameter is passed as an integer
+        """
+        if player in self._positions:
+            self._game_winner = player
+
+    def set_player_position(self, player, position):
+        """
+        Sets the player's new position in the class's private member, takes a player parameter as an integer
+        and a position parameter as a tuple
+        """
+        if player in self._positions:
+            self._positions[player] = position
+            self.update_path_cache_pawn(player, position)
+
+    def switch_player_turn(self):
+        """
+        Passes the turn to the next player, from 1 to 2 and from 2 back to 1 in a two player game
+        """
+        self.set_player_turn(self.get_opponent(self.get_player_turn()))
+
+    def move_pawn(self, player, position):
+        """
+        Determines if move is legal such as checking if a fence is blocking the path and if a pawn is jumping over
+        the opposing player's piece or going diagonally, the method checks if the required conditions exist for
+        the aforementioned moves to be legal. If move is not legal, returns False. Calls helper functions to verify
+        whether a move is legal to determine if move is valid, the helper_verify ones working on cell indexes instead
+        of positions. Returns False if the game is already won. Takes an integer player parameter and a tuple as a
+        position parameter. If player has managed to move their pawn to one of their goal cells, updates game status
+        private member to the player that won. Switches player's turn if move is successful.
+        """
+        if self.get_game_winner() is not None:
+            return False
+        if not self.get_board().is_cell(position):
+            return False
+        if self.get_player_turn() != player:
+            return False
+        current_position = self.get_player_position(player)
+        cell_indexes = self.get_geometry().get_cell_indexes()
+        target, current = cell_indexes[position], cell_indexes[current_position]
+        move_valid = self.helper_verify_orthogonal_moves(target, current)
+        if move_valid is False:
+            move_valid = self.helper_verify_two_space_moves(target, current)
+        if move_valid is False:
+            move_valid = self.helper_verify_diagonal_moves(target, current)
+        if move_valid is True:
+            self.get_board().set_cell(player, position)
+            self.get_board().remove_pawn_position(current_position)
+            self.switch_player_turn()
+            self.set_player_position(player, position)
+            if self.get_geometry().is_goal(player, position):
+                self.set_game_winner(player)
+            return True
+        else:
+            return False
+
+    def place_fence(self, player, direction, position):
+        """
+        Determines if game has been won by calling is_winner, returns False if game has already been won. Determines
+        if game is legal by using direction to look up values in the vertical or horizontal dictionary
+        then uses position as a key to determine if fence is already placed in the corresponding value.
+        Calls is_fair_play to determine if move follows the fair play rule. If move follows fair play rule, method
+        determines if the move is legal by checking if the player has the appropriate number of fences or if the
+        position does not exist/already occupied. Returns False if move is not legal, returns True if move is legal
+        then places fence in position. Takes player as an integer, direction as a string of either "h" or "v" (standing
+        for horizontal and vertical respectively) and a tuple as a position.
+        """
+        if self.get_game_winner() is not None:
+            return False
+        if self.get_player_turn() != player:
+            return False
+        if direction in ('h', 'v') and len(self.get_fence_slots(direction, position)) == 0:
+            return False
+        if self.get_player_fences(player) == 0:
+            return False
+        path_cache = dict(self._path_cache)
+        space_found = self.helper_place_fence(position, direction)
+        if space_found is True:
+            if self.is_fair_play() is False:
+                self.helper_remove_fence(direction, position, path_cache)
+                return "breaks the fair play rule"
+            self.switch_player_turn()
+            self.decrement_player_fence(player)
+            return True
+        else:
+            return False
+
+    def helper_place_fence(self, position, direction):
+        """
+        Sets a player's fence if every slot it covers is empty and no other fence crosses its grid point, called by the
+        place_fence function. The path cache is updated for each slot covered
+        """
+        if direction in ('h', 'v'):
+            if not self.is_open_fence(direction, position):
+                return False
+            self.set_fence_piece(direction, position)
+        for slot in self.get_fence_slots(direction, position) or ((direction, position),):
+            self.update_path_cache_fence(*slot)
+        return True
+
+    def helper_remove_fence(self, direction, position, path_cache):
+        """
+        Removes the fence at the direction and position parameters from the board and puts back the path_cache
+        dictionary parameter, which has to be a copy of the path cache taken before the fence was placed
+        """
+        self.remove_fence_piece(direction, position)
+        self._path_cache = path_cache
+
+    def is_open_fence(self, direction, position):
+        """
+        Returns True if a fence of the game fits in the direction parameter at the tuple position parameter, which
+        means every slot it covers is on the board and empty and no other fence crosses its grid point, False if not.
+        The slots are looked up on the board and the grid point in the set of crossings, each in constant time
+        """
+        piece = self.get_geometry().get_fence_pieces(self._fence_length).get((direction, position))
+        if piece is None or piece[1] in self._fence_crossings:
+            return False
+        board = self.get_board()
+        for slot_direction, slot in piece[0]:
+            fence = board.get_horizontal_row(slot) if slot_direction == 'h' else board.get_vertical_row(slot)
+            if fence is not None:
+                return False
+        return True
+
+    def set_fence_piece(self, direction, position):
+        """
+        Sets a fence on every slot covered by a fence of the game in the direction parameter at the tuple position
+        parameter and marks its grid point as crossed, the path cache is left alone
+        """
+        board = self.get_board()
+        for slot_direction, slot in self.get_fence_slots(direction, position):
+            if slot_direction == 'h':
+                board.set_horizontal_fence(slot)
+            else:
+                board.set_vertical_fence(slot)
+        if self._fence_length == 2:
+            self._fence_crossings.add(self.get_geometry().get_fence_pieces(2)[(direction, position)][1])
+
+    def remove_fence_piece(self, direction, position):
+        """
+        Removes the fence from every slot covered by a fence of the game in the direction parameter at the tuple
+        position parameter and frees its grid point, the path cache is left alone
+        """
+        for slot_direction, slot in self.get_fence_slots(direction, position):
+            self.get_board().remove_fence_position(slot_direction, slot)
+        if self._fence_length == 2:
+            self._fence_crossings.discard(self.get_geometry().get_fence_pieces(2)[(direction, position)][1])
+
+    def open_fence_placements(self):
+        """
+        Yields the (direction, position) of every fence the game allows on the board as it stands, horizontal ones
+        first, leaving out fences that would overlap or cross another but not checking the fair play rule. Fences of
+        length 1 come straight from the open fence positions of the board
+        """
+        if self._fence_length == 1:
+            for direction in ('h', 'v'):
+                for position in self.get_board().get_open_fence_positions(direction):
+                    yield direction, position
+            return
+        for direction, position in self.get_geometry().get_fence_pieces(self._fence_length):
+            if self.is_open_fence(direction, position):
+                yield direction, position
+
+    def get_cached_path(self, player):
+        """
+        Takes an integer as the parameter player and returns the list of cells on that player's shortest path to
+        their goal cells, or None if there is none. The path is only searched for when the path cache has no entry for
+        the player, the entry holds the path and the set of (direction, position) fences that would cut it.
+        """
+        entry = self._path_cache[player]
+        if entry is None:
+            path = self.get_board().find_path(self.get_player_position(player), player)
+            entry = (path, self.helper_path_fences(path))
+            self._path_cache[player] = entry
+        return entry[0]
+
+    def get_path_fences(self, player):
+        """
+        Takes an integer as the parameter player and returns the set of (direction, position) fences that would cut
+        that player's cached shortest path, an empty set if there is no path
+        """
+        self.get_cached_path(player)
+        return self._path_cache[player][1]
+
+    def helper_path_fences(self, path):
+        """
+        Helper function to the path cache, returns the set of (direction, position) fences that would cut the list
+        of cells in the path parameter. Returns an empty set if path is None
+        """
+        if path is None:
+            return set()
+        board = self.get_board()
+        return {board.get_fence_between(path[num], path[num + 1]) for num in range(0, len(path) - 1)}
+
+    def update_path_cache_fence(self, direction, position):
+        """
+        Drops the cached path of every player whose path is cut by a fence at the direction and position parameters.
+        A fence can only make paths longer, so a cached path that is not cut is still a shortest path.
+        """
+        for player, entry in self._path_cache.items():
+            if entry is not None and (direction, position) in entry[1]:
+                self._path_cache[player] = None
+
+    def update_path_cache_pawn(self, player, position):
+        """
+        Keeps the rest of the player's cached path if the tuple position parameter they moved to is on it, since the
+        rest of a shortest path is a shortest path from that cell. Drops the cached path otherwise
+        """
+        entry = self._path_cache[player]
+        if entry is None or entry[0] is None:
+            return
+        if position not in entry[0]:
+            self._path_cache[player] = None
+            return
+        path = entry[0][entry[0].index(position):]
+        self._path_cache[player] = (path, self.helper_path_fences(path))
+
+    def push(self, move):
+        """
+        Plays the move tuple parameter for the player whose turn it is, ("p", position) moves the pawn and
+        ("h", position) or ("v", position) places a fence, the same tuples legal_fence_placements returns. If the move
+        is played, the old pawn position, turn, winner and path cache are put on the undo stack so pop can take it
+        back without copying the game. Returns what move_pawn or place_fence returned.
+        """
+        player = self.get_player_turn()
+        undo = (move, player, self.get_player_position(player), self.get_game_winner(), dict(self._path_cache))
+        if move[0] == 'p':
+            result = self.move_pawn(player, move[1])
+        else:
+            result = self.place_fence(player, move[0], move[1])
+        if result is True:
+            self._undo_stack.append(undo)
+        return result
+
+    def pop(self):
+        """
+        Takes back the last move played with push and returns its move tuple, returns None if the undo stack is empty.
+        Moves played by calling move_pawn or place_fence directly are not on the undo stack and cannot be taken back.
+        """
+        if len(self._undo_stack) == 0:
+            return None
+        move, player, position, winner, path_cache = self._undo_stack.pop()
+        if move[0] == 'p':
+            self.get_board().remove_pawn_position(move[1])
+            self.get_board().set_cell(player, position)
+            self.set_player_position(player, position)
+        else:
+            self.remove_fence_piece(move[0], move[1])
+            self.increment_player_fence(player)
+        self.set_player_turn(player)
+        self._game_winner = winner
+        self._path_cache = path_cache
+        return move
+
+    def get_move_history(self):
+        """
+        Returns the list of move tuples played with push that are still on the undo stack, oldest first
+        """
+        return [undo[0] for undo in self._undo_stack]
+
+    def is_winner(self, player):
+        """
+        Takes an integer as the parameter player and calls get_game_winner. If result is equivalent to player,
+        returns True. Else, returns False.
+        """
+        if self.get_game_winner() == player:
+            return True
+        else:
+            return False
+
+    def is_fair_play(self):
+        """
+        Determines if every opponent of the player whose turn it is can still reach their goal cells after a fence is
+        placed. A path still in the path cache answers right away, otherwise the board searches for the goal cells
+        without building a path. If the other players can all win, returns True. Else, returns False.
+        """
+        for player in self.get_opponents(self.get_player_turn()):
+            entry = self._path_cache[player]
+            if entry is not None and entry[0] is None:
+                return False
+            if entry is None and not self.helper_is_fair_play(player):
+                return False
+        return True
+
+    def helper_is_fair_play(self, player):
+        """
+        Helper function to is_fair_play, asks the board if the player parameter can reach their goal cells. If the game
+        has a transposition table, the answer is looked up there first by the hash of the fences and of the player's
+        pawn, and stored there after a search.
+        """
+        board = self.get_board()
+        position = self.get_player_position(player)
+        table = self.get_transposition_table()
+        if table is None:
+            return board.can_reach_goal(position, player)
+        keys = board.get_zobrist_keys()
+        key = board.get_fence_hash() ^ keys.get_pawn_key(PAWN_NAMES[player], position) ^ keys.get_fair_play_key()
+        fair_play = table.lookup(key)
+        if fair_play is None:
+            fair_play = board.can_reach_goal(position, player)
+            table.store(key, fair_play)
+        return fair_play
+
+    def shortest_path_length(self, player):
+        """
+        Takes an integer as the parameter player and returns the number of steps that player's pawn needs to reach
+        their goal cells if the other pawns are ignored, returns None if fences cut them off from it
+        """
+        path = self.get_cached_path(player)
+        if path is None:
+            return None
+        return len(path) - 1
+
+    def legal_pawn_moves(self, player):
+        """
+        Returns a list of every position the player parameter can move their pawn to with move_pawn, found in one
+        pass over the cells around the pawn following the same rules as helper_verify_orthogonal_moves,
+        helper_verify_two_space_moves and helper_verify_diagonal_moves. Returns an empty list if the game has been won
+        or if it is not the player's turn.
+        """
+        if self.get_game_winner() is not None or self.get_player_turn() != player:
+            return []
+        board = self.get_board()
+        geometry = board.get_geometry()
+        current = geometry.get_cell_indexes()[self.get_player_position(player)]
+        occupants, blocked_edges = board.get_occupants(), board.get_blocked_edges()
+        index_cells = geometry.get_index_cells()
+        moves = [index_cells[neighbor] for edge, neighbor in geometry.get_cell_edges()[current]
+                 if blocked_edges[edge] == 0 and occupants[neighbor] is None]
+        for direction in (LEFT, RIGHT, TOP, BOTTOM):
+            moves += [move for move in self.helper_legal_pawn_moves(current, direction) if move not in moves]
+        return moves
+
+    def helper_legal_pawn_moves(self, current, direction):
+        """
+        Helper function to legal_pawn_moves, returns the jump or the diagonal moves available when another pawn is
+        right next to the cell index current in direction, one of LEFT, RIGHT, TOP or BOTTOM, with no fence in
+        between. The diagonal moves go to either side of that pawn, perpendicular to direction.
+        """
+        board = self.get_board()
+        geometry = board.get_geometry()
+        adjacency, occupants, blocked_edges = geometry.get_adjacency(), board.get_occupants(), board.get_blocked_edges()
+        middle = adjacency[4 * current + direction]
+        if middle == -1 or occupants[middle] is None or blocked_edges[4 * current + direction] != 0:
+            return []
+        if blocked_edges[4 * middle + direction] == 0:
+            targets = [adjacency[4 * middle + direction]]
+        else:
+            targets = [adjacency[4 * middle + side] for side in PERPENDICULAR[direction]]
+        return [geometry.get_index_cells()[target] for target in targets if target != -1 and occupants[target] is None]
+
+    def legal_fence_placements(self, player):
+        """
+        Returns a list of (direction, position) tuples for every fence the player parameter can place with
+        place_fence. The opponents' paths to their goal cells come from the path cache, a fence that does not cut any
+        of those paths cannot break the fair play rule so only the fences covering a slot on the paths are checked
+        again. The fences tried come from open_fence_placements, so none of them overlaps or crosses another. Returns
+        an empty list if the game has been won, if it is not the player's turn or if the player has no fence left.
+        """
+        if self.get_game_winner() is not None or self.get_player_turn() != player:
+            return []
+        if self.get_player_fences(player) == 0:
+            return []
+        opponents = self.get_opponents(player)
+        if any(self.get_cached_path(opponent) is None for opponent in opponents):
+            return []
+        path_fences = {opponent: self.get_path_fences(opponent) for opponent in opponents}
+        cut_fences = set().union(*path_fences.values())
+        placements = []
+        for move in self.open_fence_placements():
+            if self._fence_length == 1:
+                if move not in cut_fences or self.helper_legal_fence_placements(move, (move,), path_fences):
+                    placements.append(move)
+            elif cut_fences.isdisjoint(self.get_fence_slots(*move)) or \
+                    self.helper_legal_fence_placements(move, self.get_fence_slots(*move), path_fences):
+                placements.append(move)
+        return placements
+
+    def helper_legal_fence_placements(self, move, slots, path_fences):
+        """
+        Helper function to legal_fence_placements, sets the fence of the (direction, position) move parameter, which
+        covers the tuple of slots parameter, asks the board if each opponent whose cached path it cuts, looked up in
+        the path_fences dictionary of sets keyed by opponent, can still reach their goal cells and removes the fence
+        again. The path cache is left alone. Returns True if they all can
+        """
+        self.set_fence_piece(*move)
+        fair_play = all(self.helper_is_fair_play(opponent) for opponent, fences in path_fences.items()
+                        if not fences.isdisjoint(slots))
+        self.remove_fence_piece(*move)
+        return fair_play
+
+    def verify_left_move(self, position, current_position):
+        """
+        Verifies if a player moving left on the board is valid, returns True if valid, returns False if not
+        """
+        return position == (current_position[0] - 1, current_position[1]) and \
+            self.verify_orthogonal_moves(position, current_position)
+
+    def verify_right_move(self, position):
+        """
+        Verifies if a player moving right on the board to the tuple position parameter is valid, returns True if
+        valid, returns False if not
+        """
+        return self.verify_orthogonal_moves(position, (position[0] - 1, position[1]))
+
+    def verify_top_move(self, position, current_position):
+        """
+        Verifies if a player moving up on the board is valid, returns True if valid, returns False if not
+        """
+        return position == (current_position[0], current_position[1] - 1) and \
+            self.verify_orthogonal_moves(position, current_position)
+
+    def verify_bottom_move(self, position):
+        """
+        Verifies if a player moving down on the board to the tuple position parameter is valid, returns True if
+        valid, returns False if not
+        """
+        return self.verify_orthogonal_moves(position, (position[0], position[1] - 1))
+
+    def verify_orthogonal_moves(self, position, current_position):
+        """
+        Verifies left, right, top and down moves from the tuple current_position parameter to the tuple position
+        parameter. Returns True if move is valid, False if not, or if either position is off the board
+        """
+        return self.helper_verify_positions(self.helper_verify_orthogonal_moves, position, current_position)
+
+    def verify_diagonal_moves(self, player, position, current_position):
+        """
+        Using a tuple as the position parameter and the current_position of the pawn, we verify whether a diagonal
+        move is valid. Any pawn in the way allows the move, so the player parameter is not needed and only kept for
+        existing callers. Returns False is move is not valid, returns True if valid.
+        """
+        return self.helper_verify_positions(self.helper_verify_diagonal_moves, position, current_position)
+
+    def verify_northwest_move(self, player, position, current_position):
+        """
+        Verifies if moves to the northwest are valid, takes player, position and current_position as a parameter,
+        returns True is move is valid, False if not
+        """
+        return position == (current_position[0] - 1, current_position[1] - 1) and \
+            self.verify_diagonal_moves(player, position, current_position)
+
+    def verify_northeast_move(self, player, position, current_position):
+        """
+        Verifies if a move is valid to the northeast, takes player, position and current_position as parameters,
+        returns True if move is valid, False if not
+        """
+        return position == (current_position[0] + 1, current_position[1] - 1) and \
+            self.verify_diagonal_moves(player, position, current_position)
+
+    def verify_southwest_move(self, player, position, current_position):
+        """
+        Verifies if a move is valid to the southwest, takes player, position and current_position as parameters,
+        returns True if move is valid, False if not
+        """
+        return position == (current_position[0] - 1, current_position[1] + 1) and \
+            self.verify_diagonal_moves(player, position, current_position)
+
+    def verify_southeast_move(self, player, position, current_position):
+        """
+        Verifies if a diagonal move to the southeast is valid. Takes player, position and current_position as a
+        parameter. Returns True if move is valid, False if not
+        """
+        return position == (current_position[0] + 1, current_position[1] + 1) and \
+            self.verify_diagonal_moves(player, position, current_position)
+
+    def verify_two_space_moves(self, player, position, current_position):
+        """
+        Verify if moves that hop over another pawn are valid, takes player, position and current position as
+        parameters, returns True if move is valid, False if not. Any pawn in the way can be hopped over, so the player
+        parameter is not needed and only kept for existing callers
+        """
+        return self.helper_verify_positions(self.helper_verify_two_space_moves, position, current_position)
+
+    def verify_two_up_move(self, player, position, current_position):
+        """
+        Verifies if a move two spaces up from where the current pawn is at is valid. Takes player, position and
+        current position as parameters, returns True if move is valid, False if not
+        """
+        return position == (current_position[0], current_position[1] - 2) and \
+            self.verify_two_space_moves(player, position, current_position)
+
+    def verify_two_down_move(self, player, position, current_position):
+        """
+        Verifies if a move two spaces down from where the current pawn is at is valid. Takes player, position and
+        current position as parameters. Returns True if move is valid, False if not
+        """
+        return position == (current_position[0], current_position[1] + 2) and \
+            self.verify_two_space_moves(player, position, current_position)
+
+    def helper_verify_positions(self, verify, position, current_position):
+        """
+        Helper function to the verifiers taking positions, looks the cell indexes of the tuple position and
+        current_position parameters up and returns what the verify function, one of the verifiers taking cell
+        indexes, returns for them. Returns False if either position is off the board
+        """
+        cell_indexes = self.get_geometry().get_cell_indexes()
+        if position not in cell_indexes or current_position not in cell_indexes:
+            return False
+        return verify(cell_indexes[position], cell_indexes[current_position])
+
+    def helper_verify_orthogonal_moves(self, target, current):
+        """
+        Verifies left, right, top and down moves from the cell index current to the cell index target, looking the
+        cell next to current in each direction up in the adjacency table. The move is valid if target is empty and no
+        fence cuts the edge between them. Returns True if move is valid, False if not
+        """
+        board = self.get_board()
+        adjacency = board.get_geometry().get_adjacency()
+        for edge in range(4 * current, 4 * current + 4):
+            if adjacency[edge] == target:
+                return board.get_occupants()[target] is None and board.get_blocked_edges()[edge] == 0
+        return False
+
+    def helper_verify_two_space_moves(self, target, current):
+        """
+        Verify if moves that hop left, right, up or down over another pawn from the cell index current to the cell
+        index target are valid. The jump is valid if target is empty, a pawn is in the cell between them and no fence
+        cuts either edge on the way. Returns True if move is valid, False if not
+        """
+        board = self.get_board()
+        adjacency = board.get_geometry().get_adjacency()
+        blocked_edges = board.get_blocked_edges()
+        for direction in (LEFT, RIGHT, TOP, BOTTOM):
+            middle = adjacency[4 * current + direction]
+            if middle != -1 and adjacency[4 * middle + direction] == target:
+                return self.helper_verify_jump(target, middle) and blocked_edges[4 * current + direction] == 0 and \
+                    blocked_edges[4 * middle + direction] == 0
+        return False
+
+    def helper_verify_diagonal_moves(self, target, current):
+        """
+        Verifies a diagonal move from the cell index current to the cell index target, one step to the side of a cell
+        next to current, perpendicular to the direction of that cell. The move is valid if target is empty, a pawn is
+        in that cell, no fence cuts the edge between it and current and a fence cuts the edge on its far side. The
+        board edge does not count as a fence. Two cells next to current can lead to the same target, so each is
+        tried. Returns False is move is not valid, returns True if valid.
+        """
+        board = self.get_board()
+        adjacency = board.get_geometry().get_adjacency()
+        blocked_edges = board.get_blocked_edges()
+        for direction in (LEFT, RIGHT, TOP, BOTTOM):
+            middle = adjacency[4 * current + direction]
+            if middle != -1 and target in [adjacency[4 * middle + side] for side in PERPENDICULAR[direction]] and \
+                    self.helper_verify_jump(target, middle) and blocked_edges[4 * current + direction] == 0 and \
+                    blocked_edges[4 * middle + direction] != 0:
+                return True
+        return False
+
+    def helper_verify_jump(self, target, middle):
+        """
+        Helper function to helper_verify_two_space_moves and helper_verify_diagonal_moves, returns True if the cell
+        index target is empty and a pawn is in the cell index middle it goes past, False if not
+        """
+        occupants = self.get_board().get_occupants()
+        return occupants[target] is None and occupants[middle] is not None
+
+    def decrement_player_fence(self, player):
+        """
+        Decreases a player's fence by one, takes a player parameter as an integer
+        """
+        if player in self._fences:
+            self._fences[player] -= 1
+
+    def increment_player_fence(self, player):
+        """
+        Gives a fence back to a player, takes a player parameter as an integer
+        """
+        if player in self._fences:
+            self._fences[player] += 1
+
+    def print_board(self):
+        """
+        Prints current state of the board
+        """
+        board = self.get_board()
+        board.display_board()
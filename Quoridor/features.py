@@ -0,0 +1,400 @@
+# Description: Turns positions of two player games into fixed NumPy tensors for training value and policy networks,
+# and stores them in a chunked replay file that is read back through a memory map.
+# Export the games of a record file from the repository root with: python -m Quoridor.features games.qrec replay.qrp
+#
+# A position is PLANES planes of size x size, indexed [plane, y, x]: a plane for each pawn, the slots covered by
+# horizontal fences (on the top edge of each cell) and by vertical fences (on the left edge of each cell), the fences
+# each player has left over the whole plane, a plane of ones when it is player 1's move, and for each player the
+# number of steps from every cell to their goal cells, -1 where fences cut a cell off. A move is the policy index
+# x + size * y plus 0 for a pawn move, size * size for a horizontal fence and 2 * size * size for a vertical fence.
+#
+# A replay file starts with MAGIC and a HEADER holding the board size, the fence length, the number of planes and the
+# NumPy dtype of the planes. Chunks follow, each a CHUNK header holding its number of positions, the planes, the
+# int16 policy indexes and the int8 values (1 if the player to move went on to win, -1 if they lost, 0 for a game
+# without a winner), padded to ALIGNMENT bytes so every array of every chunk can be viewed in place.
+
+import argparse
+import struct
+
+import numpy as np
+
+from .engine import get_geometry
+
+PLANES = ("pawn_1", "pawn_2", "horizontal_fences", "vertical_fences", "fences_1", "fences_2", "turn", "distance_1",
+          "distance_2")
+MAGIC = b"QRPL\x01"
+HEADER = struct.Struct("<BBB8s")
+CHUNK = struct.Struct("<I12x")
+ALIGNMENT = 16
+MOVE_KINDS = ('p', 'h', 'v')
+
+
+class FeatureEncoder:
+    """
+    Encodes positions of two player games on boards of one size into the planes named in PLANES. The encoder only
+    ever writes into arrays it is handed or made when it was created, so a batch costs no allocation per position:
+    load_game writes the planes that are read straight off the game, and fill_distances floods the whole batch at
+    once for the distance planes, reusing scratch arrays kept between calls.
+    """
+    def __init__(self, size=9, fence_length=1, dtype=np.float32):
+        """
+        Creates private members holding the board size, fence length and dtype of the planes, the goal cells of each
+        player as boolean planes and the scratch arrays of fill_distances, grown the first time a batch needs more
+        """
+        self._size = size
+        self._fence_length = fence_length
+        self._dtype = np.dtype(dtype)
+        geometry = get_geometry(size)
+        self._goals = [np.array(geometry.get_goal_table(player), dtype=bool).reshape(size, size) for player in (1, 2)]
+        self._scratch = None
+
+    def get_size(self):
+        """
+        Returns the number of cells on each side of the boards the encoder is for
+        """
+        return self._size
+
+    def get_fence_length(self):
+        """
+        Returns the number of slots each fence covers on the boards the encoder is for
+        """
+        return self._fence_length
+
+    def get_dtype(self):
+        """
+        Returns the NumPy dtype of the planes
+        """
+        return self._dtype
+
+    def get_shape(self, count):
+        """
+        Returns the shape of the planes of the integer count parameter number of positions
+        """
+        return count, len(PLANES), self._size, self._size
+
+    def make_planes(self, count):
+        """
+        Returns a new array for the planes of the integer count parameter number of positions
+        """
+        return np.zeros(self.get_shape(count), dtype=self._dtype)
+
+    def encode(self, games, out=None):
+        """
+        Writes the planes of each QuoridorGame in the list of games parameter into the matching row of the out array,
+        a new one if it is None, and returns it
+        """
+        if out is None:
+            out = self.make_planes(len(games))
+        for row, game in enumerate(games):
+            self.load_game(out, row, game)
+        self.fill_distances(out[:len(games)])
+        return out
+
+    def load_game(self, out, row, game):
+        """
+        Writes every plane but the distance planes of the QuoridorGame game parameter into the integer row parameter
+        of the out array. Raises ValueError for a game the encoder is not for
+        """
+        board = game.get_board()
+        if game.get_player_count() != 2 or board.get_size() != self._size or \
+                game.get_fence_length() != self._fence_length:
+            raise ValueError("the encoder is for two player games on a " + str(self._size) + "x" + str(self._size) +
+                             " board with fences of length " + str(self._fence_length))
+        planes = out[row]
+        planes[:7] = 0
+        cells = planes.reshape(len(PLANES), self._size * self._size)
+        for player in (1, 2):
+            x, y = game.get_player_position(player)
+            planes[player - 1, y, x] = 1
+            planes[3 + player] = game.get_player_fences(player)
+        for plane, mask in zip((2, 3), board.get_fence_masks()):
+            while mask:
+                low = mask & -mask
+                cells[plane, low.bit_length() - 1] = 1
+                mask ^= low
+        if game.get_player_turn() == 1:
+            planes[6] = 1
+
+    def fill_distances(self, out):
+        """
+        Writes the distance planes of every row of the out array from its fence planes, flooding every position out
+        from the goal cells of each player one step at a time without crossing a fence
+        """
+        count = len(out)
+        scratch = self.helper_scratch(count)
+        reached, frontier, spread, down, across, down_open, across_open = (array[:count] for array in scratch)
+        np.equal(out[:, 2, 1:, :], 0, out=down_open)
+        np.equal(out[:, 3, :, 1:], 0, out=across_open)
+        for player in (1, 2):
+            distances = out[:, 6 + player]
+            distances[:] = -1
+            frontier[:] = self._goals[player - 1]
+            reached[:] = frontier
+            step = 0
+            while frontier.any():
+                np.copyto(distances, step, where=frontier)
+                self.helper_spread(frontier, spread, down, across, down_open, across_open)
+                np.greater(spread, reached, out=frontier)
+                reached |= frontier
+                step += 1
+
+    def helper_scratch(self, count):
+        """
+        Helper function to fill_distances, returns the scratch arrays for the integer count parameter number of
+        positions: the reached, frontier and spread cells, two arrays for the steps across horizontal and vertical
+        edges and the open horizontal and vertical edges. Makes them again only when count is larger than before
+        """
+        if self._scratch is None or len(self._scratch[0]) < count:
+            size = self._size
+            shapes = [(size, size)] * 3 + [(size - 1, size), (size, size - 1)] * 2
+            self._scratch = [np.zeros((count,) + shape, dtype=bool) for shape in shapes]
+        return self._scratch
+
+    def helper_spread(self, frontier, spread, down, across, down_open, across_open):
+        """
+        Helper function to fill_distances, writes the cells one step up, down, left or right of the frontier array
+        through an open edge into the spread array, using down and across as scratch
+        """
+        spread[:] = False
+        np.logical_and(frontier[:, :-1, :], down_open, out=down)
+        spread[:, 1:, :] |= down
+        np.logical_and(frontier[:, 1:, :], down_open, out=down)
+        spread[:, :-1, :] |= down
+        np.logical_and(frontier[:, :, :-1], across_open, out=across)
+        spread[:, :, 1:] |= across
+        np.logical_and(frontier[:, :, 1:], across_open, out=across)
+        spread[:, :, :-1] |= across
+
+    def encode_move(self, move):
+        """
+        Returns the policy index of the move tuple parameter, in the form push takes
+        """
+        direction, (x, y) = move
+        return MOVE_KINDS.index(direction) * self._size * self._size + x + self._size * y
+
+    def decode_move(self, index):
+        """
+        Returns the move tuple of the integer policy index parameter
+        """
+        kind, cell = divmod(int(index), self._size * self._size)
+        return MOVE_KINDS[kind], (cell % self._size, cell // self._size)
+
+    def mirror_planes(self, planes, out=None):
+        """
+        Writes the planes array mirrored across the vertical axis of the board, x becoming size - 1 - x, into the out
+        array, a new one if it is None, and returns it. The out array must not be the planes array. Vertical fences
+        sit on the left edge of their cell, so their plane moves over by one column as well
+        """
+        if out is None:
+            out = np.empty_like(planes)
+        out[:] = planes[..., ::-1]
+        out[:, 3, :, 1:] = planes[:, 3, :, :0:-1]
+        out[:, 3, :, 0] = 0
+        return out
+
+    def mirror_moves(self, indexes):
+        """
+        Returns an array of the policy indexes of the indexes array mirrored across the vertical axis like
+        mirror_planes. A horizontal fence is named by its leftmost slot, so its x moves by the fence length
+        """
+        indexes = np.asarray(indexes)
+        cells = self._size * self._size
+        kinds, x = indexes // cells, indexes % self._size
+        offsets = np.array([self._size - 1, self._size - self._fence_length, self._size])[kinds]
+        return indexes - x + (offsets - x)
+
+
+class ReplayWriter:
+    """
+    Appends positions to a replay file a chunk at a time, creating the file if it does not exist. Positions are
+    gathered in chunk arrays made once, and a chunk is written when it is full or the writer is closed.
+    """
+    def __init__(self, path, encoder, chunk_size=4096, mirror=False):
+        """
+        Opens the replay file at the path parameter for appending, writing the header to a new file, and makes the
+        chunk arrays for the integer chunk_size parameter number of positions. With mirror, every chunk is written
+        a second time mirrored by the encoder. Raises ValueError if an existing file holds other planes
+        """
+        self._encoder = encoder
+        self._mirror = mirror
+        self._file = open(path, "ab")
+        header = MAGIC + HEADER.pack(encoder.get_size(), encoder.get_fence_length(), len(PLANES),
+                                     encoder.get_dtype().str.encode())
+        header += bytes(-len(header) % ALIGNMENT)
+        if self._file.tell() == 0:
+            self._file.write(header)
+        else:
+            with open(path, "rb") as source:
+                if source.read(len(header)) != header:
+                    self._file.close()
+                    raise ValueError(path + " holds positions of another encoding")
+        self._planes = encoder.make_planes(chunk_size)
+        self._policies = np.zeros(chunk_size, dtype=np.int16)
+        self._values = np.zeros(chunk_size, dtype=np.int8)
+        self._count = 0
+
+    def add_game(self, game):
+        """
+        Adds every position of the QuoridorGame game parameter played with push, each with the move played from it and
+        the result for the player to move, undoing the moves and playing them again to reach each position. Returns
+        the number of positions added
+        """
+        moves = game.get_move_history()
+        winner = game.get_game_winner()
+        for move in reversed(moves):
+            game.pop()
+            self.add_position(game, move, 0 if winner is None else 1 if game.get_player_turn() == winner else -1)
+        for move in moves:
+            game.push(move)
+        return len(moves)
+
+    def add_position(self, game, move, value):
+        """
+        Adds the position of the QuoridorGame game parameter with the move tuple played from it and the integer value
+        parameter, writing the chunk if it is full
+        """
+        self._encoder.load_game(self._planes, self._count, game)
+        self._policies[self._count] = self._encoder.encode_move(move)
+        self._values[self._count] = value
+        self._count += 1
+        if self._count == len(self._values):
+            self.flush()
+
+    def flush(self):
+        """
+        Fills in the distance planes of the positions gathered so far and writes them as a chunk, then as a mirrored
+        chunk if the writer mirrors. Does nothing if there are none
+        """
+        count = self._count
+        if count == 0:
+            return
+        self._encoder.fill_distances(self._planes[:count])
+        self.helper_write_chunk(self._planes[:count], self._policies[:count])
+        if self._mirror:
+            mirrored = self._encoder.mirror_planes(self._planes[:count])
+            self.helper_write_chunk(mirrored, self._encoder.mirror_moves(self._policies[:count]))
+        self._file.flush()
+        self._count = 0
+
+    def helper_write_chunk(self, planes, policies):
+        """
+        Helper function to flush, writes one chunk of the planes and policies arrays with the gathered values
+        """
+        self._file.write(CHUNK.pack(len(planes)))
+        length = CHUNK.size
+        for array in (planes, policies.astype(np.int16, copy=False), self._values[:len(planes)]):
+            array.tofile(self._file)
+            length += array.nbytes
+        self._file.write(bytes(-length % ALIGNMENT))
+
+    def close(self):
+        """
+        Writes the last chunk and closes the replay file
+        """
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayReader:
+    """
+    Reads a replay file written by ReplayWriter through a memory map. get_chunk returns arrays that view the file in
+    place, so positions are only read from disk when used. Chunks appended after the reader was opened are not seen.
+    """
+    def __init__(self, path):
+        """
+        Memory-maps the replay file at the path parameter, checks its header and finds where every chunk starts.
+        Raises ValueError if the header is wrong
+        """
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self._map[:len(MAGIC)]) != MAGIC:
+            raise ValueError(path + " is not a replay file")
+        self._size, self._fence_length, planes, dtype = HEADER.unpack_from(self._map, len(MAGIC))
+        self._dtype = np.dtype(dtype.rstrip(b"\x00").decode())
+        self._shape = (planes, self._size, self._size)
+        self._chunks = []
+        offset = len(MAGIC) + HEADER.size
+        offset += -offset % ALIGNMENT
+        while offset + CHUNK.size <= len(self._map):
+            count = CHUNK.unpack_from(self._map, offset)[0]
+            self._chunks.append((offset + CHUNK.size, count))
+            length = CHUNK.size + count * (self._dtype.itemsize * planes * self._size * self._size + 3)
+            offset += length + -length % ALIGNMENT
+
+    def get_encoder(self):
+        """
+        Returns a FeatureEncoder for the board size, fence length and dtype of the file
+        """
+        return FeatureEncoder(self._size, self._fence_length, self._dtype)
+
+    def get_chunk_count(self):
+        """
+        Returns the number of chunks in the file
+        """
+        return len(self._chunks)
+
+    def get_position_count(self):
+        """
+        Returns the number of positions in the file
+        """
+        return sum(count for start, count in self._chunks)
+
+    def get_chunk(self, number):
+        """
+        Returns a tuple of the planes, policy index and value arrays of chunk number parameter, counting from 0, as
+        views of the memory map. Raises IndexError if there is no such chunk
+        """
+        start, count = self._chunks[number]
+        arrays = []
+        for dtype, shape in ((self._dtype, self._shape), (np.dtype(np.int16), ()), (np.dtype(np.int8), ())):
+            end = start + count * dtype.itemsize * int(np.prod(shape, dtype=int))
+            arrays.append(self._map[start:end].view(dtype).reshape((count,) + shape))
+            start = end
+        return tuple(arrays)
+
+    def read_chunks(self):
+        """
+        Generator that yields the tuple of arrays of each chunk in order
+        """
+        for number in range(0, len(self._chunks)):
+            yield self.get_chunk(number)
+
+
+def export_records(record_path, replay_path, chunk_size=4096, mirror=False, dtype=np.float32):
+    """
+    Adds every position of every game of the record file at record_path to the replay file at replay_path, with planes
+    of the NumPy dtype parameter, and returns the number of positions added, not counting mirrored copies
+    """
+    from .records import RecordReader
+    reader = RecordReader(record_path)
+    count = 0
+    with ReplayWriter(replay_path, FeatureEncoder(dtype=dtype), chunk_size, mirror) as writer:
+        for game in reader.read_games():
+            count += writer.add_game(game)
+    reader.close()
+    return count
+
+
+def main():
+    """
+    Parses the record and replay paths from the command line, exports the games and prints how many positions were
+    added
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("records")
+    parser.add_argument("replay")
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--mirror", action="store_true", help="also write every position mirrored")
+    parser.add_argument("--dtype", choices=("float32", "float16", "int8"), default="float32",
+                        help="type of the planes, every plane fits in int8 on boards of up to 11x11")
+    args = parser.parse_args()
+    print("added", export_records(args.records, args.replay, args.chunk_size, args.mirror, args.dtype), "positions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+# Description: A seeded fuzzer that plays the same random move_pawn and place_fence calls on QuoridorGame with a Board,
+# the reference engine, and on alternate engines, comparing every return value and the positions, fences left, turn
+# and winner after each call. A divergence is cut down to a short sequence of calls that still shows it, printed as
+# code that reproduces it. The same seed always plays the same games.
+# Run from the repository root with: python -m Quoridor.fuzz --engines bitboard compact vectorized --games 1000
+#
+# An engine is any object with the move_pawn, place_fence, get_player_position, get_player_fences, get_player_turn and
+# get_game_winner methods of QuoridorGame, made by a factory function taking the board size. Engines outside the
+# package are named as module:function on the command line.
+
+import argparse
+import importlib
+import random
+import sys
+import time
+
+from .engine import Board, BitBoard, QuoridorGame
+
+FAIR_PLAY_RESULT = "breaks the fair play rule"
+OFF_BOARD_CHANCE = 0.05
+WRONG_PLAYER_CHANCE = 0.1
+PAWN_MOVE_CHANCE = 0.6
+ILLEGAL_PAWN_MOVE_CHANCE = 0.15
+GOAL_CHANCE = 0.5
+CELL_FENCE_CHANCE = 0.3
+
+
+def make_reference(size):
+    """
+    Returns the reference engine, a QuoridorGame on a Board with the integer size parameter number of cells on each
+    side
+    """
+    return QuoridorGame(Board, size=size)
+
+
+def make_bitboard(size):
+    """
+    Returns a QuoridorGame on a BitBoard with the integer size parameter number of cells on each side
+    """
+    return QuoridorGame(BitBoard, size=size)
+
+
+def make_compact(size):
+    """
+    Returns a CompactEngine with the integer size parameter number of cells on each side
+    """
+    return CompactEngine(size)
+
+
+def make_vectorized(size):
+    """
+    Returns a BatchedEngine, which only plays on a 9x9 board. Raises ValueError for any other integer size parameter
+    """
+    if size != 9:
+        raise ValueError("the vectorized engine only plays on a 9x9 board")
+    return BatchedEngine()
+
+
+ENGINES = {"board": make_reference, "bitboard": make_bitboard, "compact": make_compact, "vectorized": make_vectorized}
+
+
+class CompactEngine:
+    """
+    Keeps the game only as a GameState between calls: each call unpacks it into a QuoridorGame, makes the call and
+    packs the game back, so every call goes through the compact state. The same QuoridorGame is loaded every time
+    rather than a new one made for each call.
+    """
+    def __init__(self, size=9):
+        """
+        Creates the private members holding the QuoridorGame the state is unpacked into and the GameState of a new
+        game with the integer size parameter number of cells on each side
+        """
+        self._game = QuoridorGame(Board, size=size)
+        self._state = self._game.to_state()
+
+    def helper_call(self, name, *args):
+        """
+        Unpacks the state, calls the method called name with the args parameters, packs the game back into the state
+        and returns what the method returned
+        """
+        self._game.load_state(self._state)
+        result = getattr(self._game, name)(*args)
+        self._game.to_state(self._state)
+        return result
+
+    def move_pawn(self, player, position):
+        """
+        Returns what QuoridorGame.move_pawn returns, played through the compact state
+        """
+        return self.helper_call("move_pawn", player, position)
+
+    def place_fence(self, player, direction, position):
+        """
+        Returns what QuoridorGame.place_fence returns, played through the compact state
+        """
+        return self.helper_call("place_fence", player, direction, position)
+
+    def get_player_position(self, player):
+        """
+        Returns the position tuple of the integer player parameter held in the state
+        """
+        return self._state.get_player_position(player)
+
+    def get_player_fences(self, player):
+        """
+        Returns the number of fences the integer player parameter has left, held in the state
+        """
+        return self._state.get_player_fences(player)
+
+    def get_player_turn(self):
+        """
+        Returns the player whose turn it is, held in the state
+        """
+        return self._state.get_player_turn()
+
+    def get_game_winner(self):
+        """
+        Returns the winner held in the state, None if there is none yet
+        """
+        return self._state.get_game_winner()
+
+
+class BatchedEngine:
+    """
+    Plays one game on a BatchedQuoridorGame of one game, turning the arrays it works with into the arguments and
+    return values of QuoridorGame. NumPy is only imported when the first BatchedEngine is made.
+    """
+    def __init__(self):
+        """
+        Creates the private members holding the batch of one game and the vectorized module
+        """
+        from . import vectorized
+        self._vectorized = vectorized
+        self._batch = vectorized.BatchedQuoridorGame(1)
+
+    def move_pawn(self, player, position):
+        """
+        Moves the pawn of the integer player parameter in the batch and returns whether it moved
+        """
+        return bool(self._batch.move_pawns([player], [position])[0])
+
+    def place_fence(self, player, direction, position):
+        """
+        Places the fence in the batch and returns True if it was placed, False if it was rejected and
+        FAIR_PLAY_RESULT if it would have cut a player off
+        """
+        result = self._batch.place_fences([player], [direction], [position])[0]
+        return {self._vectorized.PLACED: True, self._vectorized.REJECTED: False}.get(result, FAIR_PLAY_RESULT)
+
+    def get_player_position(self, player):
+        """
+        Returns the position tuple of the integer player parameter's pawn in the batch
+        """
+        cell = int(self._batch.get_pawns()[0, player - 1])
+        return cell % 9, cell // 9
+
+    def get_player_fences(self, player):
+        """
+        Returns the number of fences the integer player parameter has left in the batch
+        """
+        return int(self._batch.get_fences_left()[0, player - 1])
+
+    def get_player_turn(self):
+        """
+        Returns the player whose turn it is in the batch
+        """
+        return int(self._batch.get_turns()[0])
+
+    def get_game_winner(self):
+        """
+        Returns the winner of the game in the batch, None if there is none yet
+        """
+        return int(self._batch.get_winners()[0]) or None
+
+
+def load_engine(name):
+    """
+    Returns the factory of the engine called name, one of ENGINES or a module:function path to a factory elsewhere
+    """
+    if name in ENGINES:
+        return ENGINES[name]
+    module, separator, function = name.partition(":")
+    if separator == "":
+        raise ValueError("unknown engine " + repr(name) + ", expected one of " + ", ".join(ENGINES) +
+                         " or module:function")
+    return getattr(importlib.import_module(module), function)
+
+
+def random_action(rng, game):
+    """
+    Returns a random call for the reference game parameter as a tuple of the method name and its arguments, drawn with
+    the rng random number generator. Most calls are for the player whose turn it is. Pawn moves are mostly legal ones,
+    usually the one that gets closest to the player's goal cells, so pawns meet, jump and go round each other and
+    games are won. The rest land within two cells of the pawn or off the board. Fences go near either pawn, some of
+    them on an edge of the pawn's own cell, so pawns get boxed in and fair play failures come up
+    """
+    player = game.get_player_turn()
+    if rng.random() < WRONG_PLAYER_CHANCE:
+        player = game.get_opponent(player)
+    if rng.random() < PAWN_MOVE_CHANCE:
+        moves = game.legal_pawn_moves(player)
+        if len(moves) != 0 and rng.random() >= ILLEGAL_PAWN_MOVE_CHANCE:
+            return "move_pawn", player, helper_pawn_move(rng, game, player, moves)
+        return "move_pawn", player, helper_near_position(rng, game, player)
+    target = player if rng.random() < 0.5 else game.get_opponent(player)
+    if rng.random() < CELL_FENCE_CHANCE:
+        x, y = game.get_player_position(target)
+        direction, position = rng.choice([('h', (x, y)), ('h', (x, y + 1)), ('v', (x, y)), ('v', (x + 1, y))])
+        return "place_fence", player, direction, position
+    return "place_fence", player, rng.choice("hv"), helper_near_position(rng, game, target)
+
+
+def helper_pawn_move(rng, game, player, moves):
+    """
+    Helper function to random_action, returns one of the list of legal positions moves parameter of the integer player
+    parameter: with GOAL_CHANCE one of those closest to their goal cells, otherwise any of them
+    """
+    if rng.random() >= GOAL_CHANCE:
+        return rng.choice(moves)
+    board = game.get_board()
+    unreachable = board.get_size() * board.get_size()
+    distances = [board.get_distance_to_goal(position, player) for position in moves]
+    distances = [unreachable if distance is None else distance for distance in distances]
+    return rng.choice([position for position, distance in zip(moves, distances) if distance == min(distances)])
+
+
+def helper_near_position(rng, game, player):
+    """
+    Helper function to random_action, returns a position within two cells of the pawn of the integer player
+    parameter, or with OFF_BOARD_CHANCE any position up to one cell off the board
+    """
+    size = game.get_board().get_size()
+    if rng.random() < OFF_BOARD_CHANCE:
+        return rng.randint(-1, size), rng.randint(-1, size)
+    x, y = game.get_player_position(player)
+    return x + rng.randint(-2, 2), y + rng.randint(-2, 2)
+
+
+def play(game, action):
+    """
+    Makes the call of the action tuple parameter, a method name and its arguments, on the game parameter and returns
+    what it returned
+    """
+    return getattr(game, action[0])(*action[1:])
+
+
+def observe(game):
+    """
+    Returns a tuple of (field, value) tuples of the turn, winner, pawn positions and fences left of the game parameter
+    """
+    return (("turn", game.get_player_turn()), ("winner", game.get_game_winner())) + \
+        tuple(("position of player " + str(player), game.get_player_position(player)) for player in (1, 2)) + \
+        tuple(("fences of player " + str(player), game.get_player_fences(player)) for player in (1, 2))
+
+
+def compare(expected, view, engine, action):
+    """
+    Makes the call of the action tuple parameter on the engine parameter and returns None if it returns expected and
+    leaves the engine as the view tuple from observe describes the reference game, otherwise a tuple of what differs,
+    the reference's value and the engine's. An exception raised by the engine is a difference in the result
+    """
+    try:
+        actual = play(engine, action)
+    except Exception as error:
+        return "result", expected, "raised " + repr(error)
+    if expected != actual:
+        return "result", expected, actual
+    for (field, value), (other_field, other_value) in zip(view, observe(engine)):
+        if value != other_value:
+            return field, value, other_value
+    return None
+
+
+def find_divergence(factory, actions, size):
+    """
+    Replays the list of action tuples parameter on a new reference game and a new engine from factory, both with the
+    integer size parameter number of cells on each side. Returns a tuple of the index of the first action they
+    disagree on and what compare returned, None if they never disagree
+    """
+    reference, engine = make_reference(size), factory(size)
+    for step, action in enumerate(actions):
+        expected = play(reference, action)
+        difference = compare(expected, observe(reference), engine, action)
+        if difference is not None:
+            return step, difference
+    return None
+
+
+def minimize(factory, actions, size):
+    """
+    Returns a shortest list of the list of action tuples parameter, which diverges on the engine from factory, that
+    still diverges: first removing ever smaller chunks of actions as long as the rest still diverges, then single
+    actions until no one of them can go. Everything after the first divergence is dropped first
+    """
+    actions = actions[:find_divergence(factory, actions, size)[0] + 1]
+    chunk = len(actions) // 2
+    while chunk >= 1:
+        start = 0
+        while start < len(actions):
+            candidate = actions[:start] + actions[start + chunk:]
+            if len(candidate) != 0 and find_divergence(factory, candidate, size) is not None:
+                actions = candidate
+            else:
+                start += chunk
+        chunk //= 2
+    return actions[:find_divergence(factory, actions, size)[0] + 1]
+
+
+def format_repro(divergence):
+    """
+    Returns the divergence dictionary parameter from fuzz as lines of code that play its actions on a QuoridorGame,
+    with the action that diverges marked by a comment naming what differs
+    """
+    lines = ["game = QuoridorGame(size=" + str(divergence["size"]) + ")  # engine: " + divergence["engine"]]
+    for step, action in enumerate(divergence["actions"]):
+        line = "game." + action[0] + "(" + ", ".join(repr(argument) for argument in action[1:]) + ")"
+        if step == len(divergence["actions"]) - 1:
+            line += "  # {}: reference {!r}, engine {!r}".format(*divergence["difference"])
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def fuzz(engines, games=1000, seed=0, steps=200, size=9):
+    """
+    Plays the integer games parameter number of games of at most steps random actions on the reference game and on an
+    engine from each factory in the engines dictionary, keyed by name. Game number n is drawn from the seed "seed:n",
+    so any game can be played again on its own. An engine that diverges in a game is left out for the rest of that
+    game. Returns a tuple of the number of actions played, the number of games won, where the engines still running
+    were compared on the win and the end of the game, and the list of divergence dictionaries from helper_divergence
+    """
+    played, won, divergences = 0, 0, []
+    for number in range(0, games):
+        rng = random.Random("{}:{}".format(seed, number))
+        reference = make_reference(size)
+        running = {name: factory(size) for name, factory in engines.items()}
+        actions = []
+        while len(actions) < steps and reference.get_game_winner() is None and len(running) != 0:
+            actions.append(random_action(rng, reference))
+            expected = play(reference, actions[-1])
+            view = observe(reference)
+            for name in list(running):
+                if compare(expected, view, running[name], actions[-1]) is not None:
+                    del running[name]
+                    divergences.append(helper_divergence(engines[name], name, number, size, actions))
+        played += len(actions)
+        won += reference.get_game_winner() is not None
+    return played, won, divergences
+
+
+def helper_divergence(factory, name, number, size, actions):
+    """
+    Helper function to fuzz, returns the dictionary describing the divergence of the engine called name, made by
+    factory, in game number parameter: the engine name, game number, board size, minimized list of actions, number
+    of actions played up to the divergence and the (field, reference value, engine value) difference
+    """
+    minimized = minimize(factory, actions, size)
+    return {"engine": name, "game": number, "size": size, "actions": minimized, "length": len(actions),
+            "difference": find_divergence(factory, minimized, size)[1]}
+
+
+def main():
+    """
+    Parses the engines, number of games, seed, actions per game and board size from the command line, fuzzes the
+    engines and prints the games won, the actions played per second and the reproduction of every divergence. Exits
+    with status 1 if there are any
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engines", nargs="+", default=["bitboard", "compact"],
+                        help="engines to compare with the reference, " + ", ".join(ENGINES) + " or module:function")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--steps", type=int, default=200, help="most actions per game")
+    parser.add_argument("--size", type=int, default=9)
+    args = parser.parse_args()
+    engines = {name: load_engine(name) for name in args.engines}
+    start = time.perf_counter()
+    played, won, divergences = fuzz(engines, args.games, args.seed, args.steps, args.size)
+    seconds = time.perf_counter() - start
+    print("{} games, {} won, {} actions, {:,.0f} games/sec, {:,.0f} actions/sec, {} divergences".format(
+        args.games, won, played, args.games / seconds, played / seconds, len(divergences)))
+    for divergence in divergences:
+        print("\ngame {} diverged after {} actions, minimized to {}:".format(
+            divergence["game"], divergence["length"], len(divergence["actions"])))
+        print(format_repro(divergence))
+    if len(divergences) != 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
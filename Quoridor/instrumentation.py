@@ -0,0 +1,195 @@
+# Description: Opt-in counters and timers for the hot paths of the engine. enable swaps timing wrappers in for the
+# methods listed in TIMED and disable puts the originals back, so the engine runs its own code untouched until
+# instrumentation is turned on. Statistics are kept per process: each tournament worker or server process enables,
+# reads and resets its own.
+#
+# Each timed function gets its number of calls, total seconds and slowest call. Fair play searches also count the
+# cells they expand: Board.helper_search_goal adds the cells of each frontier it spreads from and BitBoard.spread_cells
+# the cells of each frontier mask, so Board.can_reach_goal can report the cells expanded by each search on either
+# board. snapshot returns the statistics as a dictionary and to_prometheus as Prometheus text.
+
+import functools
+import time
+
+from . import rendering
+from .engine import Board, BitBoard, QuoridorGame
+
+TIMED = [(QuoridorGame, "move_pawn"), (QuoridorGame, "place_fence"), (QuoridorGame, "is_fair_play"),
+         (QuoridorGame, "helper_verify_orthogonal_moves"), (QuoridorGame, "helper_verify_two_space_moves"),
+         (QuoridorGame, "helper_verify_diagonal_moves"), (QuoridorGame, "legal_pawn_moves"),
+         (QuoridorGame, "legal_fence_placements"), (rendering, "display_board")]
+PROMETHEUS_PREFIX = "quoridor_"
+
+_originals = {}
+_calls = {}
+_searches = {"searches": 0, "nodes": 0, "max_nodes": 0}
+_expanded = [0]
+
+
+def get_name(owner, name):
+    """
+    Returns the name statistics are kept under for the function called name on the owner class or module
+    """
+    return getattr(owner, "__name__", str(owner)).split(".")[-1] + "." + name
+
+
+def is_enabled():
+    """
+    Returns True if the instrumentation wrappers are in place, False if not
+    """
+    return len(_originals) != 0
+
+
+def enable():
+    """
+    Swaps a timing wrapper in for each function in TIMED and node counting wrappers in for the fair play search, does
+    nothing if they are already in place. The statistics collected so far are kept, reset clears them
+    """
+    if is_enabled():
+        return
+    for owner, name in TIMED:
+        helper_wrap(owner, name, helper_timed(get_name(owner, name), getattr(owner, name)))
+    helper_wrap(Board, "can_reach_goal", helper_counted_search(Board.can_reach_goal))
+    helper_wrap(Board, "helper_search_goal", helper_counted_cells(Board.helper_search_goal, len))
+    helper_wrap(BitBoard, "spread_cells", helper_counted_cells(BitBoard.spread_cells,
+                                                               lambda cells: bin(cells).count("1")))
+
+
+def disable():
+    """
+    Puts back every function enable replaced, the statistics are kept until reset
+    """
+    for (owner, name), function in _originals.items():
+        setattr(owner, name, function)
+    _originals.clear()
+
+
+def helper_wrap(owner, name, wrapper):
+    """
+    Helper function to enable, remembers the function called name on the owner class or module and replaces it with
+    the wrapper parameter
+    """
+    _originals[(owner, name)] = owner.__dict__[name]
+    setattr(owner, name, wrapper)
+
+
+def helper_timed(stats_name, function):
+    """
+    Helper function to enable, returns a wrapper around the function parameter counting its calls, total seconds and
+    slowest call under stats_name
+    """
+    stats = _calls.setdefault(stats_name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            if seconds > stats["max_seconds"]:
+                stats["max_seconds"] = seconds
+    return timed
+
+
+def helper_counted_search(function):
+    """
+    Helper function to enable, returns a wrapper around the can_reach_goal function parameter, timed under its own
+    name, that counts the searches and the cells expanded by each one
+    """
+    timed = helper_timed("Board.can_reach_goal", function)
+
+    @functools.wraps(function)
+    def counted(*args, **kwargs):
+        start = _expanded[0]
+        try:
+            return timed(*args, **kwargs)
+        finally:
+            nodes = _expanded[0] - start
+            _searches["searches"] += 1
+            _searches["nodes"] += nodes
+            if nodes > _searches["max_nodes"]:
+                _searches["max_nodes"] = nodes
+    return counted
+
+
+def helper_counted_cells(function, count_cells):
+    """
+    Helper function to enable, returns a wrapper around the search step function parameter adding the number of cells
+    in its frontier argument, found by the count_cells function, to the cells expanded so far
+    """
+    @functools.wraps(function)
+    def counted(self, frontier):
+        _expanded[0] += count_cells(frontier)
+        return function(self, frontier)
+    return counted
+
+
+def reset():
+    """
+    Sets every statistic back to zero
+    """
+    for stats in _calls.values():
+        stats.update(calls=0, seconds=0.0, max_seconds=0.0)
+    _searches.update(searches=0, nodes=0, max_nodes=0)
+
+
+def snapshot():
+    """
+    Returns a dictionary of the statistics so far: whether instrumentation is enabled, a dictionary of the calls,
+    total seconds and slowest call of each timed function keyed by name, and the fair play searches run, the cells
+    they expanded and the most cells expanded by one search
+    """
+    return {"enabled": is_enabled(), "functions": {name: dict(stats) for name, stats in sorted(_calls.items())},
+            "fair_play": dict(_searches)}
+
+
+def merge_snapshots(snapshots):
+    """
+    Returns one snapshot adding up the list of snapshots parameter, such as one from each worker process, keeping the
+    largest slowest call and most cells expanded
+    """
+    merged = {"enabled": any(item["enabled"] for item in snapshots), "functions": {},
+              "fair_play": {"searches": 0, "nodes": 0, "max_nodes": 0}}
+    for item in snapshots:
+        for name, stats in item["functions"].items():
+            total = merged["functions"].setdefault(name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+            total["calls"] += stats["calls"]
+            total["seconds"] += stats["seconds"]
+            total["max_seconds"] = max(total["max_seconds"], stats["max_seconds"])
+        for key in ("searches", "nodes"):
+            merged["fair_play"][key] += item["fair_play"][key]
+        merged["fair_play"]["max_nodes"] = max(merged["fair_play"]["max_nodes"], item["fair_play"]["max_nodes"])
+    merged["functions"] = dict(sorted(merged["functions"].items()))
+    return merged
+
+
+def to_prometheus(statistics=None):
+    """
+    Returns the statistics dictionary parameter, the current snapshot if it is None, in the Prometheus text
+    exposition format
+    """
+    if statistics is None:
+        statistics = snapshot()
+    lines = []
+    for metric, key, kind, text in (("calls_total", "calls", "counter", "Calls to each instrumented function."),
+                                    ("call_seconds_total", "seconds", "counter", "Seconds spent in each function."),
+                                    ("call_seconds_max", "max_seconds", "gauge", "Slowest call of each function.")):
+        lines += helper_prometheus_header(metric, kind, text)
+        lines += [PROMETHEUS_PREFIX + metric + '{function="' + name + '"} ' + repr(stats[key])
+                  for name, stats in statistics["functions"].items()]
+    for metric, key, kind, text in (("fair_play_searches_total", "searches", "counter", "Fair play searches run."),
+                                    ("fair_play_nodes_total", "nodes", "counter", "Cells expanded by the searches."),
+                                    ("fair_play_nodes_max", "max_nodes", "gauge", "Most cells expanded by a search.")):
+        lines += helper_prometheus_header(metric, kind, text)
+        lines.append(PROMETHEUS_PREFIX + metric + " " + repr(statistics["fair_play"][key]))
+    return "\n".join(lines) + "\n"
+
+
+def helper_prometheus_header(metric, kind, text):
+    """
+    Helper function to to_prometheus, returns the HELP and TYPE lines of the metric parameter
+    """
+    return ["# HELP " + PROMETHEUS_PREFIX + metric + " " + text, "# TYPE " + PROMETHEUS_PREFIX + metric + " " + kind]
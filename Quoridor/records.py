@@ -0,0 +1,242 @@
+# Description: A compact binary format for archiving finished games of Quoridor, with a writer that appends games as
+# they finish and a reader that replays them one at a time or jumps straight to game N.
+#
+# A record file starts with the 5 byte header MAGIC. Each game follows as a 2 byte little-endian move count, 1 byte
+# holding the winner (0 for none) and one byte per move: 0 to 80 is a pawn move to cell x + 9 * y, 81 to 152 a
+# horizontal fence at x + 9 * (y - 1) + 81 and 153 to 224 a vertical fence at (x - 1) + 8 * y + 153. The writer
+# also appends the 8 byte offset of every game to a sidecar index file, path + ".idx", used for random access.
+
+import mmap
+import os
+import struct
+
+from .engine import Board, QuoridorGame
+
+MAGIC = b"QREC\x01"
+GAME_HEADER = struct.Struct("<HB")
+OFFSET = struct.Struct("<Q")
+HORIZONTAL_BASE = 81
+VERTICAL_BASE = 153
+
+
+def encode_move(move):
+    """
+    Returns the byte value of the move tuple parameter, in the form push takes. Raises ValueError for a move that is
+    not a pawn move to a cell or a fence at a valid fence position
+    """
+    direction, (x, y) = move
+    if direction == 'p' and 0 <= x <= 8 and 0 <= y <= 8:
+        return x + 9 * y
+    if direction == 'h' and 0 <= x <= 8 and 1 <= y <= 8:
+        return HORIZONTAL_BASE + x + 9 * (y - 1)
+    if direction == 'v' and 1 <= x <= 8 and 0 <= y <= 8:
+        return VERTICAL_BASE + x - 1 + 8 * y
+    raise ValueError("move cannot be recorded: " + repr(move))
+
+
+def decode_move(code):
+    """
+    Returns the move tuple of the integer byte value parameter, raises ValueError for a value no move encodes to
+    """
+    if code < HORIZONTAL_BASE:
+        return 'p', (code % 9, code // 9)
+    if code < VERTICAL_BASE:
+        code -= HORIZONTAL_BASE
+        return 'h', (code % 9, code // 9 + 1)
+    if code < VERTICAL_BASE + 72:
+        code -= VERTICAL_BASE
+        return 'v', (code % 8 + 1, code // 8)
+    raise ValueError("invalid move byte " + str(code))
+
+
+def replay(moves, board_class=Board):
+    """
+    Plays the list of move tuples parameter with push on a new QuoridorGame using board_class and returns the game.
+    Raises ValueError if a move is not legal, which means the record is corrupt
+    """
+    game = QuoridorGame(board_class)
+    for move in moves:
+        if game.push(move) is not True:
+            raise ValueError("illegal move in record: " + repr(move))
+    return game
+
+
+class RecordWriter:
+    """
+    Appends games to a record file and its offset index as they finish, creating both if they do not exist. Games
+    are written straight through, so a reader sees every game written before it opened the file.
+    """
+    def __init__(self, path):
+        """
+        Opens the record file at the path parameter and its index for appending, writing the header to a new file
+        """
+        self._file = open(path, "ab")
+        self._index = open(path + ".idx", "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def write_game(self, moves, winner=None):
+        """
+        Appends the list of move tuples parameter as one game whose winner is the integer winner parameter, None for
+        a game without a winner, and records its offset in the index. Returns the offset
+        """
+        data = bytes(encode_move(move) for move in moves)
+        offset = self._file.tell()
+        self._file.write(GAME_HEADER.pack(len(data), winner or 0) + data)
+        self._file.flush()
+        self._index.write(OFFSET.pack(offset))
+        self._index.flush()
+        return offset
+
+    def write_game_of(self, game):
+        """
+        Appends the moves played with push on the QuoridorGame game parameter along with its winner, returns the offset.
+        Raises ValueError for a game that is not a two player game on a 9x9 board with one slot fences, the only kind a
+        record can hold
+        """
+        if game.get_board().get_size() != 9 or game.get_player_count() != 2 or game.get_fence_length() != 1:
+            raise ValueError("records can only hold two player games on a 9x9 board with one slot fences")
+        return self.write_game(game.get_move_history(), game.get_game_winner())
+
+    def close(self):
+        """
+        Closes the record file and its index
+        """
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RecordReader:
+    """
+    Reads a record file written by RecordWriter. read_games streams through the file and replays one game at a time,
+    get_game memory-maps the file and uses the offset index to go straight to game N. Games appended to the file
+    after the index was loaded are not seen by get_game.
+    """
+    def __init__(self, path, board_class=Board):
+        """
+        Checks the header of the record file at the path parameter. The memory map and offset index are created the
+        first time get_game needs them. Replayed games use board_class. Raises ValueError if the header is wrong
+        """
+        self._path = path
+        self._board_class = board_class
+        self._file = open(path, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(path + " is not a game record file")
+        self._map = None
+        self._offsets = None
+
+    def read_moves(self):
+        """
+        Generator that reads the games from the start of the file one at a time without loading the whole file,
+        yields a tuple of the list of move tuples of each game and its winner, None for a game without one. Raises
+        ValueError if the file ends partway through a game
+        """
+        with open(self._path, "rb") as records:
+            records.seek(len(MAGIC))
+            while True:
+                header = records.read(GAME_HEADER.size)
+                if len(header) == 0:
+                    return
+                if len(header) < GAME_HEADER.size:
+                    raise ValueError(self._path + " is cut off in the header of a game")
+                count, winner = GAME_HEADER.unpack(header)
+                codes = records.read(count)
+                if len(codes) < count:
+                    raise ValueError(self._path + " is cut off after " + str(len(codes)) + " of " + str(count) +
+                                     " moves of a game")
+                yield [decode_move(code) for code in codes], winner or None
+
+    def read_games(self):
+        """
+        Generator that replays the games of the file in order, yields a QuoridorGame for each one only when asked for
+        """
+        for moves, winner in self.read_moves():
+            yield replay(moves, self._board_class)
+
+    def load_index(self):
+        """
+        Memory-maps the record file and loads the offset of every game from the index file, then scans past the last
+        indexed game for any games the index is missing, such as when the index file was lost. Returns the offsets.
+        Raises ValueError if the index file does not belong to the record file
+        """
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        offsets = self.helper_load_index()
+        offset = len(MAGIC)
+        if len(offsets) != 0:
+            offset = offsets[-1] + GAME_HEADER.size + GAME_HEADER.unpack_from(self._map, offsets[-1])[0]
+        while offset + GAME_HEADER.size <= len(self._map):
+            offsets.append(offset)
+            offset += GAME_HEADER.size + GAME_HEADER.unpack_from(self._map, offset)[0]
+        self._offsets = offsets
+        return offsets
+
+    def helper_load_index(self):
+        """
+        Helper function to load_index, returns the offsets in the index file that leave room for a game header in the
+        record file, so offsets past the end of a record file cut off after its index was written are left out, as is
+        an offset cut off partway at the end of the index. Returns an empty list if there is no index file. Raises
+        ValueError if the offsets do not go up from the end of MAGIC
+        """
+        if not os.path.exists(self._path + ".idx"):
+            return []
+        with open(self._path + ".idx", "rb") as index:
+            data = index.read()
+        data = data[:len(data) - len(data) % OFFSET.size]
+        last = len(self._map) - GAME_HEADER.size
+        offsets = [value[0] for value in OFFSET.iter_unpack(data) if value[0] <= last]
+        if any(offset <= previous for previous, offset in zip([len(MAGIC) - 1] + offsets, offsets)):
+            raise ValueError(self._path + ".idx is not the index of " + self._path)
+        return offsets
+
+    def get_game_count(self):
+        """
+        Returns the number of games get_game can reach
+        """
+        if self._offsets is None:
+            self.load_index()
+        return len(self._offsets)
+
+    def get_moves(self, number):
+        """
+        Returns a tuple of the list of move tuples and the winner of game number parameter, counting from 0, read
+        through the memory map. Raises IndexError if there is no such game, negative numbers included, and ValueError
+        if the file ends partway through the game
+        """
+        if self._offsets is None:
+            self.load_index()
+        if not 0 <= number < len(self._offsets):
+            raise IndexError("no game " + str(number) + " in " + self._path + ", it holds " +
+                             str(len(self._offsets)))
+        offset = self._offsets[number]
+        count, winner = GAME_HEADER.unpack_from(self._map, offset)
+        start = offset + GAME_HEADER.size
+        if start + count > len(self._map):
+            raise ValueError(self._path + " is cut off partway through game " + str(number))
+        return [decode_move(code) for code in self._map[start:start + count]], winner or None
+
+    def get_game(self, number):
+        """
+        Returns a QuoridorGame with game number parameter, counting from 0, replayed on it
+        """
+        return replay(self.get_moves(number)[0], self._board_class)
+
+    def close(self):
+        """
+        Closes the memory map and the record file
+        """
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
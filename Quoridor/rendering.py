@@ -0,0 +1,165 @@
+# Description: Draws a Quoridor board as text, used by Board.display_board and QuoridorGame.print_board. Frames are
+# built row by row into one list and joined once, in plain ASCII or with ANSI colors, and a BoardRenderer keeps the
+# rows of its last frame so only the rows a move changed need to be drawn again. render_compact gives a one line
+# summary of a whole game.
+
+STYLES = ("ascii", "ansi")
+ANSI_TOKENS = {"P1": "\x1b[1;31mP1\x1b[0m", "P2": "\x1b[1;34mP2\x1b[0m", "P3": "\x1b[1;32mP3\x1b[0m",
+               "P4": "\x1b[1;35mP4\x1b[0m", "==": "\x1b[33m==\x1b[0m", "|": "\x1b[33m|\x1b[0m"}
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+class BoardRenderer:
+    """
+    Draws frames of a board in the ascii or ansi style. A board with size cells on each side takes 2 * size + 1 lines:
+    the top border, then for each cell row y the line of horizontal fences above it (from row 1 on) and the line of
+    its cells and vertical fences, then the bottom border. Whole frames read the board through its get_cells,
+    get_horizontal_rows and get_vertical_rows dictionaries, taken once per frame. The lines of the last frame are
+    kept, so render can redraw only the cell rows it is given, reading just those through get_cell,
+    get_horizontal_row and get_vertical_row.
+    """
+    def __init__(self, style="ascii"):
+        """
+        Creates private members holding the style, the lines of the last frame and the size of board they were drawn
+        for along with the positions read on each line. Raises ValueError for a style that is not in STYLES
+        """
+        if style not in STYLES:
+            raise ValueError("style must be one of " + ", ".join(STYLES))
+        self._style = style
+        self._tokens = ANSI_TOKENS if style == "ansi" else {}
+        self._lines = None
+        self._size = None
+        self._border = None
+        self._fence_line_positions = None
+        self._cell_line_positions = None
+
+    def get_style(self):
+        """
+        Returns the style of the renderer
+        """
+        return self._style
+
+    def render(self, board, rows=None):
+        """
+        Returns the frame of the board parameter as one string. If rows is an iterable of cell rows, only those rows
+        and the fence lines above them are drawn again and the rest come from the last frame, so rows must hold every
+        row that changed since then. The whole frame is drawn on the first call, when rows is None or when the board
+        is not the size of the last one
+        """
+        if board.get_size() != self._size:
+            self.set_size(board.get_size())
+        if self._lines is None or rows is None:
+            self._lines = [self._border] * (2 * self._size + 1)
+            rows = range(0, self._size)
+            cell, horizontal_row = board.get_cells().get, board.get_horizontal_rows().get
+            vertical_row = board.get_vertical_rows().get
+        else:
+            cell, horizontal_row, vertical_row = board.get_cell, board.get_horizontal_row, board.get_vertical_row
+        for row in rows:
+            if row != 0:
+                self._lines[2 * row] = self.render_fence_line(horizontal_row, row)
+            self._lines[2 * row + 1] = self.render_cell_line(cell, vertical_row, row)
+        return "\n".join(self._lines)
+
+    def set_size(self, size):
+        """
+        Builds the border and the positions read on each line for boards with the integer size parameter number of
+        cells on each side, and forgets the last frame
+        """
+        self._size = size
+        self._border = "+" + "==+" * size
+        self._fence_line_positions = [[(x, row) for x in range(0, size)] for row in range(0, size)]
+        self._cell_line_positions = [[(x, row) for x in range(1, size)] for row in range(0, size)]
+        self._lines = None
+
+    def render_fence_line(self, horizontal_row, row):
+        """
+        Returns the line of horizontal fences along the top of the integer row parameter, from 1 on, looking fences
+        up with the horizontal_row function
+        """
+        fence = self._tokens.get("==", "==")
+        return "+" + "".join([(fence if horizontal_row(position) is not None else "  ") + "+"
+                              for position in self._fence_line_positions[row]])
+
+    def render_cell_line(self, cell, vertical_row, row):
+        """
+        Returns the line of cells and the vertical fences between them of the integer row parameter, looking them up
+        with the cell and vertical_row functions
+        """
+        fence = self._tokens.get("|", "|")
+        parts = [self.render_cell(cell((0, row)))]
+        for position in self._cell_line_positions[row]:
+            parts.append(fence if vertical_row(position) is not None else " ")
+            parts.append(self.render_cell(cell(position)))
+        return "|" + "".join(parts) + "|"
+
+    def render_cell(self, cell):
+        """
+        Returns the two characters drawn for the cell parameter, the value of a board cell
+        """
+        if cell is None:
+            return "  "
+        return self._tokens.get(cell, cell)
+
+
+def changed_rows(move, old_position, fence_length=1):
+    """
+    Returns the set of cell rows a BoardRenderer has to redraw after the move tuple parameter, in the form push takes,
+    was played by a pawn that stood on the old_position parameter before the move. A fence covers the integer
+    fence_length parameter number of slots, the fence length of the game: a horizontal one stays on the row of its
+    position while a vertical one runs down over that many rows
+    """
+    if move[0] == 'p':
+        return {old_position[1], move[1][1]}
+    direction, (x, y) = move
+    if direction == 'v':
+        return set(range(y, y + fence_length))
+    return {y}
+
+
+def render_ascii(board):
+    """
+    Returns the whole frame of the board parameter in plain ASCII as one string
+    """
+    return BoardRenderer("ascii").render(board)
+
+
+def render_ansi(board):
+    """
+    Returns the whole frame of the board parameter with ANSI colors as one string
+    """
+    return BoardRenderer("ansi").render(board)
+
+
+def render_compact(game):
+    """
+    Returns a one line summary of the QuoridorGame game parameter made of slash separated fields: the position of
+    each player, "h" followed by the horizontal fences, "v" followed by the vertical fences, the fences left to each
+    player and whose turn it is. A position is written as its x and y digits, in base 36 so boards up to 36 cells
+    wide fit, so a new two player game on a 9x9 board is 40/48/h/v/10/10/1
+    """
+    board = game.get_board()
+    size = board.get_size()
+    players = range(1, game.get_player_count() + 1)
+    fields = [helper_compact_position(game.get_player_position(player)) for player in players]
+    fields.append("h" + ",".join(helper_compact_position((x, y)) for y in range(1, size) for x in range(0, size)
+                                 if board.get_horizontal_row((x, y)) is not None))
+    fields.append("v" + ",".join(helper_compact_position((x, y)) for y in range(0, size) for x in range(1, size)
+                                 if board.get_vertical_row((x, y)) is not None))
+    fields += [str(game.get_player_fences(player)) for player in players] + [str(game.get_player_turn())]
+    return "/".join(fields)
+
+
+def helper_compact_position(position):
+    """
+    Helper function to render_compact, returns the tuple position parameter written as its x and y base 36 digits
+    """
+    return DIGITS[position[0]] + DIGITS[position[1]]
+
+
+def display_board(board):
+    """
+    Prints a board display of the current state of the board parameter, displaying "P1" for player 1, "P2" for
+    player 2 and so on, "==" for a horizontal fence and "|" for a vertical fence. "+" are board corners
+    """
+    print(render_ascii(board))
@@ -0,0 +1,219 @@
+# Description: An asyncio server hosting many QuoridorGame sessions in one event loop. Clients send one JSON request
+# per line over TCP or a Unix socket and get one JSON response per line back. AI moves are searched in a process pool
+# so the loop keeps answering other sessions while a search runs.
+# Run from the repository root with: python -m Quoridor.server --port 8765
+#
+# Every request is a JSON object with an "op" key, an optional "id" echoed back in the response and, for ops on a
+# session, the "game" number returned by "new". Responses are {"id": ..., "ok": true, "result": ...} or
+# {"id": ..., "ok": false, "error": "..."}. The ops are:
+#   new          {"board": "board" or "bitboard", "size", "players": 2 or 4, "fence_length": 1 or 2} starts a
+#                session, 9x9 with two players and one slot fences by default, the result is its game number
+#   move_pawn    {"game", "player", "position": [x, y]} the result is what move_pawn returned
+#   place_fence  {"game", "player", "direction", "position": [x, y]} the result is what place_fence returned
+#   is_winner    {"game", "player"} the result is what is_winner returned
+#   print_board  {"game", "style": "ascii", "ansi" or "compact"} the result is the drawing of the board
+#   ai_move      {"game", "time_limit"} plays the move the AI picks for the player whose turn it is, the result is
+#                {"move": [kind, [x, y]], "result": ...} or {"move": null} if the game is over or there is no move,
+#                two player games only
+#   close        {"game"} ends a session
+
+import argparse
+import asyncio
+import json
+import math
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+from .ai import AlphaBetaPlayer
+from .engine import Board, BitBoard, QuoridorGame
+from .rendering import render_ansi, render_ascii, render_compact
+
+BOARD_CLASSES = {"board": Board, "bitboard": BitBoard}
+RENDERERS = {"ascii": lambda game: render_ascii(game.get_board()),
+             "ansi": lambda game: render_ansi(game.get_board()), "compact": render_compact}
+AI_PLAYERS = {}
+MAX_BOARD_SIZE = 19
+
+
+def choose_ai_move(game, time_limit):
+    """
+    Runs in a worker process: returns the move the AlphaBetaPlayer picks for the player whose turn it is in the game
+    parameter within the time_limit parameter in seconds. Each worker keeps one player per time limit, so its
+    transposition table carries over from one request to the next
+    """
+    if time_limit not in AI_PLAYERS:
+        AI_PLAYERS[time_limit] = AlphaBetaPlayer(time_limit=time_limit)
+    return AI_PLAYERS[time_limit].choose_move(game)
+
+
+class GameServer:
+    """
+    Holds the sessions of the server, numbered from 1, and answers requests for them. A session is a QuoridorGame and
+    a lock that keeps other requests for the same game waiting while an AI move is being searched for it.
+    """
+    def __init__(self, executor=None, max_time_limit=5.0):
+        """
+        Creates private members holding the sessions, the number of the next session, the executor AI moves are
+        searched in (a ProcessPoolExecutor is made the first time one is needed if none is given) and the longest
+        time limit a client may ask the AI for
+        """
+        self._sessions = {}
+        self._next_game = 1
+        self._executor = executor
+        self._max_time_limit = max_time_limit
+
+    def get_session_count(self):
+        """
+        Returns the number of open sessions
+        """
+        return len(self._sessions)
+
+    def get_executor(self):
+        """
+        Returns the executor AI moves are searched in, creating a ProcessPoolExecutor if there is none yet
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor()
+        return self._executor
+
+    def get_game(self, request):
+        """
+        Returns a tuple of the QuoridorGame and lock of the session named by the "game" key of the request dictionary
+        parameter. Raises ValueError if there is no such session
+        """
+        session = self._sessions.get(request.get("game"))
+        if session is None:
+            raise ValueError("no game " + repr(request.get("game")))
+        return session
+
+    async def handle_request(self, request):
+        """
+        Runs the op of the request dictionary parameter and returns its result. Raises ValueError for an unknown op or
+        bad parameters
+        """
+        op = request.get("op")
+        if op == "new":
+            return self.new_game(request.get("board", "bitboard"), request.get("size", 9), request.get("players", 2),
+                                 request.get("fence_length", 1))
+        if op == "ai_move":
+            return await self.ai_move(request)
+        game, lock = self.get_game(request)
+        async with lock:
+            if op == "move_pawn":
+                return game.move_pawn(request["player"], tuple(request["position"]))
+            if op == "place_fence":
+                return game.place_fence(request["player"], request["direction"], tuple(request["position"]))
+            if op == "is_winner":
+                return game.is_winner(request["player"])
+            if op == "print_board":
+                return RENDERERS[request.get("style", "ascii")](game)
+            if op == "close":
+                del self._sessions[request["game"]]
+                return True
+        raise ValueError("unknown op " + repr(op))
+
+    def new_game(self, board, size=9, players=2, fence_length=1):
+        """
+        Starts a session whose game uses the board class named by the board parameter, with the integer size parameter
+        number of cells on each side, the integer players parameter number of players and fences covering the
+        fence_length parameter number of slots, returns its number. Raises ValueError for an unknown board, a size
+        outside 3 to MAX_BOARD_SIZE or a player count or fence length QuoridorGame refuses
+        """
+        if board not in BOARD_CLASSES:
+            raise ValueError("unknown board " + repr(board))
+        if not isinstance(size, int) or not 3 <= size <= MAX_BOARD_SIZE:
+            raise ValueError("size must be from 3 to " + str(MAX_BOARD_SIZE))
+        game = QuoridorGame(BOARD_CLASSES[board], size=size, players=players, fence_length=fence_length)
+        number = self._next_game
+        self._next_game += 1
+        self._sessions[number] = (game, asyncio.Lock())
+        return number
+
+    async def ai_move(self, request):
+        """
+        Searches the move of the player whose turn it is in the requested session in the executor and plays it.
+        The session stays locked meanwhile. Returns the move and what push returned. Raises ValueError for a time
+        limit that is not a positive finite number, which would keep a worker searching without a deadline
+        """
+        game, lock = self.get_game(request)
+        time_limit = float(request.get("time_limit", 1.0))
+        if not (math.isfinite(time_limit) and time_limit > 0):
+            raise ValueError("time_limit must be a positive number of seconds")
+        time_limit = min(time_limit, self._max_time_limit)
+        async with lock:
+            loop = asyncio.get_running_loop()
+            move = await loop.run_in_executor(self.get_executor(), choose_ai_move, game, time_limit)
+            if move is None:
+                return {"move": None}
+            return {"move": move, "result": game.push(move)}
+
+    async def handle_connection(self, reader, writer):
+        """
+        Answers the requests of one client, one line of JSON in and one line of JSON out, until it disconnects or
+        sends a line longer than the stream limit
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write((json.dumps(await self.respond(line)) + "\n").encode())
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, line):
+        """
+        Returns the response dictionary to the request in the bytes line parameter, turning a bad request into an
+        error response instead of dropping the connection
+        """
+        request = {}
+        try:
+            parsed = json.loads(line)
+            if not isinstance(parsed, dict):
+                raise ValueError("request must be a JSON object")
+            request = parsed
+            return {"id": request.get("id"), "ok": True, "result": await self.handle_request(request)}
+        except (ValueError, KeyError, TypeError) as error:
+            return {"id": request.get("id"), "ok": False, "error": str(error)}
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None, ready=None):
+        """
+        Listens on the Unix socket at unix_path, or on host and port if it is None, and serves until cancelled. Calls
+        the optional ready function with the address once listening, port 0 picks a free port
+        """
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self.handle_connection, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready is not None:
+            ready(unix_path or "{}:{}".format(*server.sockets[0].getsockname()[:2]))
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """
+    Parses the address and worker count from the command line and runs the server, printing the address it listens
+    on as the first line of output. SIGTERM stops the server like Ctrl-C, so the AI worker processes are shut down too
+    """
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Unix socket path to listen on instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="AI worker processes, one per core by default")
+    args = parser.parse_args()
+    server = GameServer(ProcessPoolExecutor(max_workers=args.workers))
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix, lambda address: print(address, flush=True)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.get_executor().shutdown()
+
+
+if __name__ == "__main__":
+    main()
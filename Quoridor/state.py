@@ -0,0 +1,203 @@
+# Description: A compact snapshot of a game position for keeping many of them alive at once, in search trees and
+# replay buffers. A GameState is four integers in __slots__ instead of a QuoridorGame with a board of dictionaries,
+# and a StatePool hands out released states again instead of allocating new ones.
+#
+# The integers are the fence bitmasks, one bit per slot at x + size * y as BitBoard keeps them, the cell index of
+# each pawn in PAWN_BITS bits per player, and the meta integer holding the board size, player count, turn, winner and
+# fence length in the low FENCE_COUNT_SHIFT bits and the fences left of each player in FENCE_COUNT_BITS bits each.
+
+from .engine import Board, QuoridorGame, get_geometry
+
+PAWN_BITS = 9
+FENCE_COUNT_BITS = 8
+FENCE_COUNT_SHIFT = 16
+MAX_SIZE = 22
+META_FIELDS = (("size", 0, 5), ("players", 5, 3), ("turn", 8, 3), ("winner", 11, 3), ("fence_length", 14, 2))
+
+
+class GameState:
+    """
+    The position of a game packed into the integers _meta, _pawns, _horizontal and _vertical. Cloning copies four
+    references, and hashing and equality compare the four integers. A state can be refilled with load_game, which is
+    what lets a StatePool reuse it, so a state should not be changed while it is a key in a dictionary or set.
+    """
+    __slots__ = ("_meta", "_pawns", "_horizontal", "_vertical")
+
+    def __init__(self, meta=0, pawns=0, horizontal=0, vertical=0):
+        """
+        Creates the slots holding the packed integers, all 0 for an empty state to be filled in with load_game
+        """
+        self._meta = meta
+        self._pawns = pawns
+        self._horizontal = horizontal
+        self._vertical = vertical
+
+    def __eq__(self, other):
+        return isinstance(other, GameState) and self.get_key() == other.get_key()
+
+    def __hash__(self):
+        return hash(self.get_key())
+
+    def __getstate__(self):
+        return self.get_key()
+
+    def __setstate__(self, state):
+        self._meta, self._pawns, self._horizontal, self._vertical = state
+
+    def __repr__(self):
+        return "GameState" + repr(self.get_key())
+
+    def get_key(self):
+        """
+        Returns the tuple of the four packed integers
+        """
+        return self._meta, self._pawns, self._horizontal, self._vertical
+
+    def clone(self):
+        """
+        Returns a new GameState holding the same position
+        """
+        return GameState(self._meta, self._pawns, self._horizontal, self._vertical)
+
+    def load_game(self, game):
+        """
+        Packs the position of the QuoridorGame game parameter into the state, replacing what it held. Raises
+        ValueError for a board larger than MAX_SIZE, whose cell indexes do not fit in PAWN_BITS, or for a player with
+        more fences left than fit in FENCE_COUNT_BITS, leaving the state as it was
+        """
+        board = game.get_board()
+        if board.get_size() > MAX_SIZE:
+            raise ValueError("game states hold boards of at most " + str(MAX_SIZE) + " cells on each side")
+        players = game.get_player_count()
+        if any(game.get_player_fences(player) >= 1 << FENCE_COUNT_BITS for player in range(1, players + 1)):
+            raise ValueError("game states hold at most " + str((1 << FENCE_COUNT_BITS) - 1) + " fences per player")
+        indexes = board.get_geometry().get_cell_indexes()
+        values = {"size": board.get_size(), "players": players, "turn": game.get_player_turn(),
+                  "winner": game.get_game_winner() or 0, "fence_length": game.get_fence_length()}
+        meta = sum(values[name] << shift for name, shift, bits in META_FIELDS)
+        pawns = 0
+        for player in range(1, players + 1):
+            meta |= game.get_player_fences(player) << (FENCE_COUNT_SHIFT + FENCE_COUNT_BITS * (player - 1))
+            pawns |= indexes[game.get_player_position(player)] << (PAWN_BITS * (player - 1))
+        self._meta, self._pawns = meta, pawns
+        self._horizontal, self._vertical = board.get_fence_masks()
+
+    def to_game(self, board_class=Board):
+        """
+        Returns a new QuoridorGame on board_class set to the position of the state
+        """
+        game = QuoridorGame(board_class, size=self.get_size(), players=self.get_player_count(), fences=0,
+                            fence_length=self.get_fence_length())
+        game.load_state(self)
+        return game
+
+    def helper_meta(self, name):
+        """
+        Returns the field called name, one of META_FIELDS, unpacked from the meta integer
+        """
+        for field, shift, bits in META_FIELDS:
+            if field == name:
+                return (self._meta >> shift) & ((1 << bits) - 1)
+        raise ValueError("no field " + repr(name))
+
+    def get_size(self):
+        """
+        Returns the number of cells on each side of the board
+        """
+        return self.helper_meta("size")
+
+    def get_player_count(self):
+        """
+        Returns the number of players
+        """
+        return self.helper_meta("players")
+
+    def get_player_turn(self):
+        """
+        Returns the player whose turn it is
+        """
+        return self.helper_meta("turn")
+
+    def get_game_winner(self):
+        """
+        Returns the player who won, None if nobody has
+        """
+        return self.helper_meta("winner") or None
+
+    def get_fence_length(self):
+        """
+        Returns the number of slots each fence covers
+        """
+        return self.helper_meta("fence_length")
+
+    def get_player_fences(self, player):
+        """
+        Returns the number of fences the integer player parameter has left
+        """
+        return (self._meta >> (FENCE_COUNT_SHIFT + FENCE_COUNT_BITS * (player - 1))) & ((1 << FENCE_COUNT_BITS) - 1)
+
+    def get_player_position(self, player):
+        """
+        Returns the tuple position of the pawn of the integer player parameter
+        """
+        index = (self._pawns >> (PAWN_BITS * (player - 1))) & ((1 << PAWN_BITS) - 1)
+        return get_geometry(self.get_size()).get_index_cells()[index]
+
+    def get_fence_masks(self):
+        """
+        Returns a tuple of the bitmasks of the horizontal and vertical fences
+        """
+        return self._horizontal, self._vertical
+
+    def get_fence_pieces(self):
+        """
+        Returns the list of (direction, position) fences that cover the slots of the fence bitmasks. For two slot
+        fences the pieces are found by walking each row of horizontal slots left to right and each column of vertical
+        slots top to bottom, since the first slot of a run is always where a fence starts
+        """
+        geometry = get_geometry(self.get_size())
+        pieces = []
+        for direction, mask, step in (('h', self._horizontal, (1, 0)), ('v', self._vertical, (0, 1))):
+            slots = {position for position, bit in geometry.get_cell_bits().items() if bit & mask}
+            for position in sorted(slots, key=lambda slot: (slot[1], slot[0]) if direction == 'h' else slot):
+                if position in slots:
+                    pieces.append((direction, position))
+                    if self.get_fence_length() == 2:
+                        slots.discard((position[0] + step[0], position[1] + step[1]))
+        return pieces
+
+
+class StatePool:
+    """
+    Keeps released GameState objects so acquire can fill one of them in instead of allocating a new one, keeping at
+    most max_size of them.
+    """
+    def __init__(self, max_size=1 << 16):
+        """
+        Creates private members holding the list of free states and the most it may hold
+        """
+        self._free = []
+        self._max_size = max_size
+
+    def get_free_count(self):
+        """
+        Returns the number of states waiting to be reused
+        """
+        return len(self._free)
+
+    def acquire(self, game):
+        """
+        Returns a GameState holding the position of the QuoridorGame game parameter, reusing a released one if there
+        is one
+        """
+        state = self._free.pop() if len(self._free) != 0 else GameState()
+        state.load_game(game)
+        return state
+
+    def release(self, state):
+        """
+        Gives the state parameter back to the pool for reuse, the caller must not use it afterwards. States beyond
+        max_size are left to the garbage collector
+        """
+        if len(self._free) < self._max_size:
+            self._free.append(state)
@@ -0,0 +1,244 @@
+# Description: Endgame tablebases for two player games where neither player has a fence left. The game is then a race
+# on a fixed fence layout, so every placement of the two pawns with either player to move can be solved ahead of time
+# by retrograde analysis and looked up during play instead of searched.
+# Run from the repository root with: python -m Quoridor.tablebase --output endgame.qtb --fence h 4 5 --fence v 3 2
+#
+# A tablebase file starts with the 5 byte header MAGIC, a byte holding the board size and the 8 byte little-endian
+# Zobrist hash of the fences it was made for. One 2 byte little-endian signed entry follows for each position, at
+# ((turn - 1) * cells + first) * cells + second, where first and second are the cell indexes of the pawns of players 1
+# and 2. An entry of plies + 1 means the player to move wins in that many plies with best play, -(plies + 1) that they
+# lose in that many, and 0 that neither player can force a win or that the position cannot happen.
+
+import argparse
+import collections
+import json
+import mmap
+import struct
+
+from .engine import QuoridorGame
+
+MAGIC = b"QTBL\x01"
+HEADER = struct.Struct("<BQ")
+ENTRY = struct.Struct("<h")
+
+
+class Tablebase:
+    """
+    The solved positions of one fence layout on a board of one size, read from the entries in the data buffer
+    parameter, which may be bytes or the memory map of a tablebase file starting at offset. Answers probe in
+    constant time: a couple of checks that the game is one the tablebase covers and one entry read.
+    """
+    def __init__(self, size, fence_hash, data, offset=0, path=None):
+        """
+        Creates private members holding the board size, the Zobrist hash of the fences, the buffer of entries and
+        where they start in it, along with the path of the file the buffer maps, None for a tablebase in memory
+        """
+        self._size = size
+        self._fence_hash = fence_hash
+        self._data = data
+        self._offset = offset
+        self._path = path
+        self._cells = size * size
+
+    def __reduce__(self):
+        """
+        A tablebase read from a file is pickled as its path and mapped again when unpickled, since a memory map cannot
+        be pickled. One in memory is pickled with its entries
+        """
+        if self._path is not None:
+            return load_tablebase, (self._path,)
+        return Tablebase, (self._size, self._fence_hash, bytes(self._data), self._offset)
+
+    def get_size(self):
+        """
+        Returns the number of cells on each side of the board the tablebase was made for
+        """
+        return self._size
+
+    def get_fence_hash(self):
+        """
+        Returns the Zobrist hash of the fences the tablebase was made for
+        """
+        return self._fence_hash
+
+    def get_entry(self, turn, first, second):
+        """
+        Returns the entry of the position where it is the integer turn parameter's move and the pawns of players 1 and
+        2 are on the cell indexes first and second
+        """
+        index = ((turn - 1) * self._cells + first) * self._cells + second
+        return ENTRY.unpack_from(self._data, self._offset + ENTRY.size * index)[0]
+
+    def covers(self, game):
+        """
+        Returns True if the QuoridorGame game parameter is a two player game on a board of the tablebase's size, with
+        no fence left for either player and the fences the tablebase was made for, False if not
+        """
+        board = game.get_board()
+        return game.get_player_count() == 2 and board.get_size() == self._size and \
+            game.get_player_fences(1) == 0 and game.get_player_fences(2) == 0 and \
+            board.get_fence_hash() == self._fence_hash
+
+    def probe(self, game):
+        """
+        Returns a tuple of the player who wins the QuoridorGame game parameter with best play (None if neither can
+        force a win) and the number of plies until the game ends, or None if the tablebase does not cover the game
+        """
+        if not self.covers(game):
+            return None
+        if game.get_game_winner() is not None:
+            return game.get_game_winner(), 0
+        indexes = game.get_geometry().get_cell_indexes()
+        turn = game.get_player_turn()
+        entry = self.get_entry(turn, indexes[game.get_player_position(1)], indexes[game.get_player_position(2)])
+        if entry == 0:
+            return None, None
+        if entry > 0:
+            return turn, entry - 1
+        return game.get_opponent(turn), -entry - 1
+
+    def count_results(self):
+        """
+        Returns a dictionary of how many positions are won ("wins") and lost ("losses") by the player to move, and how
+        many neither player can force or cannot happen ("unknown")
+        """
+        end = self._offset + ENTRY.size * 2 * self._cells * self._cells
+        counts = {"wins": 0, "losses": 0, "unknown": 0}
+        for entry, in ENTRY.iter_unpack(self._data[self._offset:end]):
+            counts["wins" if entry > 0 else "losses" if entry < 0 else "unknown"] += 1
+        return counts
+
+    def write(self, path):
+        """
+        Writes the tablebase to a file at the path parameter that load_tablebase can read
+        """
+        with open(path, "wb") as output:
+            output.write(MAGIC + HEADER.pack(self._size, self._fence_hash))
+            output.write(self._data[self._offset:self._offset + ENTRY.size * 2 * self._cells * self._cells])
+
+
+def load_tablebase(path):
+    """
+    Memory-maps the tablebase file at the path parameter and returns its Tablebase, so entries are only read from
+    disk when probed. Raises ValueError if the file does not start with MAGIC or is too short for its board size
+    """
+    with open(path, "rb") as source:
+        data = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(path + " is not a tablebase file")
+    size, fence_hash = HEADER.unpack_from(data, len(MAGIC))
+    offset = len(MAGIC) + HEADER.size
+    if len(data) < offset + ENTRY.size * 2 * size ** 4:
+        raise ValueError(path + " is too short for a " + str(size) + "x" + str(size) + " tablebase")
+    return Tablebase(size, fence_hash, data, offset, path)
+
+
+def generate_tablebase(game):
+    """
+    Solves every position of the fence layout of the QuoridorGame game parameter, on its board size, by retrograde
+    analysis and returns the Tablebase in memory. The pawns, fence counts and turn of the game are ignored. Positions
+    where a player stands on their goal cells are lost for the player to move, and a position is won in plies + 1 if
+    one move leads to a loss in plies, or lost in plies + 1 if every move leads to a win in at most plies. Positions
+    are settled in order of plies, so wins are as short and losses as long as they can be. Raises ValueError for a
+    game that does not have two players
+    """
+    if game.get_player_count() != 2:
+        raise ValueError("tablebases only hold two player games")
+    cells = len(game.get_geometry().get_index_cells())
+    entries = [0] * (2 * cells * cells)
+    predecessors, waiting, settled = helper_move_graph(game, entries)
+    queue = collections.deque(settled)
+    while len(queue) != 0:
+        state = queue.popleft()
+        parent_plies = abs(entries[state])
+        for parent in predecessors[state]:
+            if entries[parent] != 0:
+                continue
+            waiting[parent] -= 1
+            if entries[state] < 0:
+                entries[parent] = parent_plies + 1
+            elif waiting[parent] == 0:
+                entries[parent] = -(parent_plies + 1)
+            else:
+                continue
+            queue.append(parent)
+    data = struct.pack("<" + str(len(entries)) + "h", *entries)
+    return Tablebase(game.get_board().get_size(), game.get_board().get_fence_hash(), data)
+
+
+def helper_move_graph(game, entries):
+    """
+    Helper function to generate_tablebase, sets the pawns of a game with the fences of the game parameter and no
+    fences left to every pair of cells in turn and asks legal_pawn_moves where the player to move can go. Positions
+    with a pawn on its goal cells are settled as lost in 0 plies for the player to move in the entries list. Returns a
+    tuple of the list of positions leading to each position, the number of moves of each position and the list of
+    settled positions
+    """
+    scratch = QuoridorGame(type(game.get_board()), size=game.get_board().get_size(), fences=0)
+    board = scratch.get_board()
+    for position, fence in game.get_board().get_horizontal_rows().items():
+        if fence is not None:
+            board.set_horizontal_fence(position)
+    for position, fence in game.get_board().get_vertical_rows().items():
+        if fence is not None:
+            board.set_vertical_fence(position)
+    geometry = scratch.get_geometry()
+    index_cells, indexes = geometry.get_index_cells(), geometry.get_cell_indexes()
+    cells = len(index_cells)
+    predecessors, waiting, settled = [[] for state in entries], [0] * len(entries), []
+    for state in range(0, len(entries)):
+        turn, first, second = state // (cells * cells) + 1, state // cells % cells, state % cells
+        if first == second:
+            continue
+        goals = (geometry.is_goal(1, index_cells[first]), geometry.is_goal(2, index_cells[second]))
+        if any(goals):
+            if goals[2 - turn] and not goals[turn - 1]:
+                entries[state] = -1
+                settled.append(state)
+            continue
+        moves = helper_pawn_moves(scratch, turn, index_cells[first], index_cells[second])
+        waiting[state] = len(moves)
+        for target in moves:
+            first_target, second_target = (indexes[target], second) if turn == 1 else (first, indexes[target])
+            predecessors[((2 - turn) * cells + first_target) * cells + second_target].append(state)
+    return predecessors, waiting, settled
+
+
+def helper_pawn_moves(game, turn, first, second):
+    """
+    Helper function to helper_move_graph, moves the pawns of players 1 and 2 of the game parameter to the tuple
+    positions first and second, gives the integer turn parameter the move and returns its legal pawn moves
+    """
+    board = game.get_board()
+    for player in (1, 2):
+        board.remove_pawn_position(game.get_player_position(player))
+    for player, position in ((1, first), (2, second)):
+        board.set_cell(player, position)
+        game.set_player_position(player, position)
+    game.set_player_turn(turn)
+    return game.legal_pawn_moves(turn)
+
+
+def main():
+    """
+    Parses the board size, fences and output path from the command line, generates the tablebase of that fence layout
+    and writes it, then prints how many positions the player to move wins, loses or cannot force as JSON
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--size", type=int, default=9)
+    parser.add_argument("--fence", nargs=3, action="append", default=[], metavar=("DIRECTION", "X", "Y"),
+                        help="a fence of the layout, h or v and its position, repeat for more fences")
+    args = parser.parse_args()
+    game = QuoridorGame(size=args.size)
+    for direction, x, y in args.fence:
+        if not game.is_open_fence(direction, (int(x), int(y))):
+            raise ValueError("fence " + direction + " " + x + " " + y + " does not fit on the board")
+        game.set_fence_piece(direction, (int(x), int(y)))
+    tablebase = generate_tablebase(game)
+    tablebase.write(args.output)
+    print(json.dumps(tablebase.count_results()))
+
+
+if __name__ == "__main__":
+    main()
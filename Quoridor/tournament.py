@@ -0,0 +1,221 @@
+# Description: Plays many self-play games between bot configurations on a pool of worker processes and streams
+# the result of each game to disk as it finishes.
+# Run from the repository root with: python -m Quoridor.tournament --games 100 --workers 8 --output results.jsonl
+
+import argparse
+import itertools
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import instrumentation
+from .engine import Board, BitBoard, QuoridorGame
+from .ai import AlphaBetaPlayer, MCTSPlayer, RandomPlayer
+from .records import RecordWriter
+
+BOARD_CLASSES = {"board": Board, "bitboard": BitBoard}
+DEFAULT_BOTS = [{"name": "alphabeta", "type": "alphabeta", "time_limit": 0.1},
+                {"name": "random", "type": "random"}]
+
+
+def make_player(config, seed):
+    """
+    Creates the player described by the config dictionary parameter. The "type" key picks RandomPlayer ("random"),
+    MCTSPlayer ("mcts") or AlphaBetaPlayer ("alphabeta", the default), every other key except "name" is passed on as a
+    keyword argument. The integer seed parameter seeds random and MCTS players. Raises ValueError for any other type
+    """
+    options = {key: value for key, value in config.items() if key not in ("name", "type")}
+    if config.get("type") == "random":
+        options.setdefault("seed", seed)
+        return RandomPlayer(**options)
+    if config.get("type") == "mcts":
+        options.setdefault("seed", seed)
+        return MCTSPlayer(**options)
+    if config.get("type", "alphabeta") == "alphabeta":
+        return AlphaBetaPlayer(**options)
+    raise ValueError("unknown bot type " + repr(config.get("type")))
+
+
+def make_schedule(bots, games, seed):
+    """
+    Returns the list of games to play: every pair of configurations in the list of bots parameter plays the integer
+    games parameter number of games, switching who moves first every game. Each game gets its own seed drawn from the
+    integer seed parameter, so the same schedule is produced every time
+    """
+    rng = random.Random(seed)
+    schedule = []
+    for first, second in itertools.combinations(bots, 2):
+        for num in range(0, games):
+            players = (first, second) if num % 2 == 0 else (second, first)
+            schedule.append({"game": len(schedule), "players": players, "seed": rng.getrandbits(32)})
+    return schedule
+
+
+def play_opening(game, rng, opening_moves):
+    """
+    Plays up to the integer opening_moves parameter number of random legal pawn moves on the game parameter with the
+    rng random number generator, so games between the same bots do not all follow the same line. Stops early once
+    the game is won or the player to move has no pawn move. Returns the number of moves played
+    """
+    for num in range(0, opening_moves):
+        moves = game.legal_pawn_moves(game.get_player_turn())
+        if len(moves) == 0 or game.push(('p', rng.choice(moves))) is not True:
+            return num
+    return opening_moves
+
+
+def close_players(players):
+    """
+    Shuts down the worker processes of the MCTSPlayer objects in the players iterable parameter, other players and
+    None have none
+    """
+    for player in players:
+        if isinstance(player, MCTSPlayer):
+            player.close()
+
+
+def play_game(spec, board="bitboard", opening_moves=2, max_plies=300, size=9, fence_length=1):
+    """
+    Plays the game described by the spec dictionary parameter from make_schedule in the worker process, on a board
+    with the integer size parameter number of cells on each side and fences covering the fence_length parameter
+    number of slots, and returns a
+    dictionary with the names of the players, the winner (None for a game stopped at max_plies or one where a player
+    had no move), the number of plies, the seconds taken by each move of each player, the wall time of the game and
+    the list of moves played, along with the instrumentation snapshot of the game if the worker has it enabled
+    """
+    instrumentation.reset()
+    start = time.perf_counter()
+    rng = random.Random(spec["seed"])
+    game = QuoridorGame(BOARD_CLASSES[board], size=size, fence_length=fence_length)
+    players = {1: make_player(spec["players"][0], rng.getrandbits(32)),
+               2: make_player(spec["players"][1], rng.getrandbits(32))}
+    names = {1: spec["players"][0]["name"], 2: spec["players"][1]["name"]}
+    move_times = {1: [], 2: []}
+    plies = play_opening(game, rng, opening_moves)
+    try:
+        while game.get_game_winner() is None and plies < max_plies:
+            player = game.get_player_turn()
+            move_start = time.perf_counter()
+            move = players[player].choose_move(game)
+            move_times[player].append(time.perf_counter() - move_start)
+            if move is None or game.push(move) is not True:
+                break
+            plies += 1
+    finally:
+        close_players(players.values())
+    winner = game.get_game_winner()
+    return {"game": spec["game"], "seed": spec["seed"], "players": [names[1], names[2]],
+            "winner": names.get(winner), "plies": plies, "move_times": [move_times[1], move_times[2]],
+            "time": time.perf_counter() - start, "winner_number": winner, "moves": game.get_move_history(),
+            "instrumentation": instrumentation.snapshot() if instrumentation.is_enabled() else None}
+
+
+def summarize(records):
+    """
+    Returns a dictionary keyed by bot name with the number of games, wins, losses and draws, the win rate, the mean
+    game length in plies and the mean and worst move times in seconds, built from the list of records parameter
+    """
+    summary = {}
+    for record in records:
+        for index, name in enumerate(record["players"]):
+            stats = summary.setdefault(name, {"games": 0, "wins": 0, "losses": 0, "draws": 0, "plies": 0,
+                                              "moves": 0, "move_time": 0.0, "worst_move_time": 0.0})
+            stats["games"] += 1
+            stats["plies"] += record["plies"]
+            if record["winner"] is None:
+                stats["draws"] += 1
+            elif record["winner"] == name:
+                stats["wins"] += 1
+            else:
+                stats["losses"] += 1
+            times = record["move_times"][index]
+            stats["moves"] += len(times)
+            stats["move_time"] += sum(times)
+            stats["worst_move_time"] = max([stats["worst_move_time"]] + times)
+    return {name: helper_summarize(stats) for name, stats in summary.items()}
+
+
+def helper_summarize(stats):
+    """
+    Helper function to summarize, turns the running totals of the stats dictionary parameter into rates and means
+    """
+    return {"games": stats["games"], "wins": stats["wins"], "losses": stats["losses"], "draws": stats["draws"],
+            "win_rate": stats["wins"] / stats["games"], "mean_plies": stats["plies"] / stats["games"],
+            "mean_move_time": stats["move_time"] / max(stats["moves"], 1),
+            "worst_move_time": stats["worst_move_time"]}
+
+
+def run_tournament(bots, games, workers, seed, output_path, board="bitboard", opening_moves=2, max_plies=300,
+                   records_path=None, size=9, fence_length=1, metrics_path=None):
+    """
+    Plays the schedule built from the list of bot configuration dictionaries on a pool of the integer workers
+    parameter number of processes. Each game is sent to the pool on its own, so workers stay busy until the schedule
+    runs out, and its record is written to output_path as a line of JSON as soon as it finishes. If records_path is
+    given, the moves of each game are also appended to that binary record file, which is closed even if a game
+    raises. Games are played on boards with the integer size parameter number of cells on each side and fences
+    covering the fence_length parameter number of slots. If metrics_path is given, every worker enables
+    instrumentation and the statistics of all games are written there in the Prometheus text format. Returns the
+    summary of every record. Raises ValueError if records are asked for with a size other than 9 or a fence length
+    other than 1, the only ones the record format can hold
+    """
+    if records_path is not None and (size != 9 or fence_length != 1):
+        raise ValueError("binary records can only hold games on a 9x9 board with one slot fences")
+    schedule = make_schedule(bots, games, seed)
+    records, snapshots = [], []
+    writer = RecordWriter(records_path) if records_path is not None else None
+    initializer = instrumentation.enable if metrics_path is not None else None
+    try:
+        with open(output_path, "w") as output, \
+                ProcessPoolExecutor(max_workers=workers, initializer=initializer) as pool:
+            futures = [pool.submit(play_game, spec, board, opening_moves, max_plies, size, fence_length)
+                       for spec in schedule]
+            for future in as_completed(futures):
+                record = future.result()
+                moves, winner = record.pop("moves"), record.pop("winner_number")
+                snapshots.append(record.pop("instrumentation"))
+                if writer is not None:
+                    writer.write_game(moves, winner)
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+                records.append(record)
+    finally:
+        if writer is not None:
+            writer.close()
+    if metrics_path is not None:
+        with open(metrics_path, "w") as metrics:
+            metrics.write(instrumentation.to_prometheus(instrumentation.merge_snapshots(snapshots)))
+    return summarize(records)
+
+
+def main():
+    """
+    Parses the tournament settings from the command line, runs the tournament and prints the summary as JSON. Bot
+    configurations are read from a JSON file holding a list of dictionaries as make_player takes them
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bots", help="JSON file with a list of bot configurations")
+    parser.add_argument("--games", type=int, default=10, help="games per pair of bots")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, one per core by default")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="tournament.jsonl")
+    parser.add_argument("--board", choices=sorted(BOARD_CLASSES), default="bitboard")
+    parser.add_argument("--opening-moves", type=int, default=2)
+    parser.add_argument("--max-plies", type=int, default=300)
+    parser.add_argument("--records", default=None, help="binary record file to append the moves of each game to")
+    parser.add_argument("--size", type=int, default=9, help="cells on each side of the board")
+    parser.add_argument("--fence-length", type=int, choices=[1, 2], default=1, help="slots covered by each fence")
+    parser.add_argument("--metrics", default=None, help="file to write engine instrumentation to in Prometheus format")
+    args = parser.parse_args()
+    bots = DEFAULT_BOTS
+    if args.bots is not None:
+        with open(args.bots) as bots_file:
+            bots = json.load(bots_file)
+    summary = run_tournament(bots, args.games, args.workers, args.seed, args.output, args.board,
+                             args.opening_moves, args.max_plies, args.records, args.size,
+                             args.fence_length, args.metrics)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+# Description: A batched engine that stores many games of Quoridor as NumPy arrays and validates and applies a move
+# in every one of them at once, following the same rules as QuoridorGame.
+# The differential check against QuoridorGame runs with the tests, in tests/test_vectorized.py. Longer runs go from the
+# repository root with: python -m Quoridor.vectorized --size 256 --steps 1000
+
+import argparse
+
+import numpy as np
+
+from .engine import QuoridorGame
+
+REJECTED = 0
+PLACED = 1
+BREAKS_FAIR_PLAY = 2
+PAWN_STEPS = np.array([(0, 1), (0, 1), (0, 2), (1, 1), (-1, 1), (1, 0), (-1, 0), (0, -1), (0, -2), (1, -1), (-1, -1),
+                       (2, 0), (1, 2)])
+
+
+class BatchedQuoridorGame:
+    """
+    Represents a batch of games of Quoridor stored as arrays so each move is validated and applied in every game with
+    array operations. Pawns are an (N, 2) array of cell numbers x + 9 * y, one column per player. Fences are an
+    (N, 2, 9, 8) array of booleans: [:, 0, x, y - 1] is the horizontal fence at (x, y) and [:, 1, y, x - 1] is the
+    vertical fence at (x, y). Turns, winners (0 while the game is on) and remaining fences are kept per game. The rules
+    are the ones of verify_orthogonal_moves, verify_two_space_moves, verify_diagonal_moves and is_fair_play.
+    """
+    def __init__(self, size):
+        """
+        Creates the arrays for the integer size parameter number of games, each set up like a new QuoridorGame
+        """
+        self._size = size
+        self._games = np.arange(size)
+        self._pawns = np.empty((size, 2), dtype=np.int16)
+        self._pawns[:, 0] = 4
+        self._pawns[:, 1] = 4 + 9 * 8
+        self._fences = np.zeros((size, 2, 9, 8), dtype=bool)
+        self._fences_left = np.full((size, 2), 10, dtype=np.int8)
+        self._turns = np.ones(size, dtype=np.int8)
+        self._winners = np.zeros(size, dtype=np.int8)
+
+    def get_size(self):
+        """
+        Returns the number of games in the batch
+        """
+        return self._size
+
+    def get_pawns(self):
+        """
+        Returns the (N, 2) array of pawn cell numbers
+        """
+        return self._pawns
+
+    def get_fences(self):
+        """
+        Returns the (N, 2, 9, 8) array of fences
+        """
+        return self._fences
+
+    def get_fences_left(self):
+        """
+        Returns the (N, 2) array of fences each player has left
+        """
+        return self._fences_left
+
+    def get_turns(self):
+        """
+        Returns the array of whose turn it is in each game
+        """
+        return self._turns
+
+    def get_winners(self):
+        """
+        Returns the array of the winner of each game, 0 for a game that has not been won
+        """
+        return self._winners
+
+    def load_game(self, index, game):
+        """
+        Copies the position of the QuoridorGame game parameter into the game of the batch at the integer index
+        parameter. Raises ValueError for a game that is not a two player game on a 9x9 board with one slot fences, the
+        only kind the batch arrays hold
+        """
+        if game.get_board().get_size() != 9 or game.get_player_count() != 2 or game.get_fence_length() != 1:
+            raise ValueError("the batch only holds two player games on a 9x9 board with one slot fences")
+        for player in (1, 2):
+            position = game.get_player_position(player)
+            self._pawns[index, player - 1] = position[0] + 9 * position[1]
+            self._fences_left[index, player - 1] = game.get_player_fences(player)
+        self._fences[index] = False
+        for position, fence in game.get_board().get_horizontal_rows().items():
+            self._fences[index, 0, position[0], position[1] - 1] = fence is not None
+        for position, fence in game.get_board().get_vertical_rows().items():
+            self._fences[index, 1, position[1], position[0] - 1] = fence is not None
+        self._turns[index] = game.get_player_turn()
+        self._winners[index] = game.get_game_winner() or 0
+
+    def has_horizontal_fence(self, games, x_values, y_values):
+        """
+        Returns an array telling for each game in the games index array whether there is a horizontal fence at the
+        matching x and y values, False where the position is not a horizontal fence position
+        """
+        valid = (x_values >= 0) & (x_values <= 8) & (y_values >= 1) & (y_values <= 8)
+        return valid & self._fences[games, 0, np.clip(x_values, 0, 8), np.clip(y_values - 1, 0, 7)]
+
+    def has_vertical_fence(self, games, x_values, y_values):
+        """
+        Returns an array telling for each game in the games index array whether there is a vertical fence at the
+        matching x and y values, False where the position is not a vertical fence position
+        """
+        valid = (x_values >= 1) & (x_values <= 8) & (y_values >= 0) & (y_values <= 8)
+        return valid & self._fences[games, 1, np.clip(y_values, 0, 8), np.clip(x_values - 1, 0, 7)]
+
+    def move_pawns(self, players, positions, active=None):
+        """
+        Moves the pawn of the player in the players array to the (x, y) row of the (N, 2) positions array in every game
+        where the move is legal, like move_pawn. Games where the optional boolean active array is False are left alone.
+        Updates turns and winners and returns a boolean array of the moves that were made
+        """
+        players = np.asarray(players)
+        positions = np.asarray(positions)
+        target_x, target_y = positions[:, 0], positions[:, 1]
+        player_index = np.clip(players, 1, 2) - 1
+        current = self._pawns[self._games, player_index]
+        other = self._pawns[self._games, 1 - player_index]
+        valid = (self._winners == 0) & (self._turns == players)
+        valid &= (target_x >= 0) & (target_x <= 8) & (target_y >= 0) & (target_y <= 8)
+        if active is not None:
+            valid &= np.asarray(active)
+        valid &= self.verify_moves(current % 9, current // 9, target_x, target_y, other % 9, other // 9)
+        moved = self._games[valid]
+        self._pawns[moved, player_index[valid]] = target_x[valid] + 9 * target_y[valid]
+        won = valid & (target_y == np.where(players == 1, 8, 0))
+        self._winners[won] = players[won]
+        self._turns[moved] = 3 - players[valid]
+        return valid
+
+    def verify_moves(self, current_x, current_y, target_x, target_y, other_x, other_y):
+        """
+        Returns a boolean array telling for each game whether the pawn at the current x and y values can move to the
+        target x and y values with the other pawn at the other x and y values: a step that no fence blocks, or a jump
+        or diagonal step past a facing pawn from verify_jumps
+        """
+        games, step_x, step_y = self._games, target_x - current_x, target_y - current_y
+        horizontal, vertical = self.has_horizontal_fence, self.has_vertical_fence
+        left = (step_x == -1) & (step_y == 0) & ~vertical(games, current_x, current_y)
+        right = (step_x == 1) & (step_y == 0) & ~vertical(games, target_x, target_y)
+        up = (step_x == 0) & (step_y == -1) & ~horizontal(games, current_x, current_y)
+        down = (step_x == 0) & (step_y == 1) & ~horizontal(games, target_x, target_y)
+        occupied = (target_x == other_x) & (target_y == other_y)
+        return ~occupied & (left | right | up | down | self.verify_jumps(current_x, current_y, step_x, step_y,
+                                                                          other_x, other_y))
+
+    def verify_jumps(self, current_x, current_y, step_x, step_y, other_x, other_y):
+        """
+        Returns a boolean array telling for each game whether the step x and y values from the pawn at the current x
+        and y values jump over the other pawn at the other x and y values facing it on any side, or go diagonally
+        beside it when a fence stands behind it
+        """
+        games, horizontal, vertical = self._games, self.has_horizontal_fence, self.has_vertical_fence
+        other_above = (other_x == current_x) & (other_y == current_y - 1) & ~horizontal(games, current_x, current_y)
+        other_below = (other_x == current_x) & (other_y == current_y + 1) & ~horizontal(games, current_x, current_y + 1)
+        other_left = (other_y == current_y) & (other_x == current_x - 1) & ~vertical(games, current_x, current_y)
+        other_right = (other_y == current_y) & (other_x == current_x + 1) & ~vertical(games, current_x + 1, current_y)
+        behind_above = horizontal(games, current_x, current_y - 1)
+        behind_below = horizontal(games, current_x, current_y + 2)
+        behind_left = vertical(games, current_x - 1, current_y)
+        behind_right = vertical(games, current_x + 2, current_y)
+        jumps = (step_x == 0) & (((step_y == -2) & other_above & ~behind_above) |
+                                 ((step_y == 2) & other_below & ~behind_below))
+        jumps |= (step_y == 0) & (((step_x == -2) & other_left & ~behind_left) |
+                                  ((step_x == 2) & other_right & ~behind_right))
+        diagonals = (np.abs(step_x) == 1) & (((step_y == -1) & other_above & behind_above) |
+                                             ((step_y == 1) & other_below & behind_below))
+        diagonals |= (np.abs(step_y) == 1) & (((step_x == -1) & other_left & behind_left) |
+                                              ((step_x == 1) & other_right & behind_right))
+        return jumps | diagonals
+
+    def place_fences(self, players, directions, positions, active=None):
+        """
+        Places a fence for the player in the players array, in the direction ("h" or "v") of the directions array, at
+        the (x, y) row of the (N, 2) positions array in every game where it is legal, like place_fence. Games where the
+        optional boolean active array is False are left alone. Returns an array of PLACED, REJECTED or BREAKS_FAIR_PLAY
+        """
+        players = np.asarray(players)
+        positions = np.asarray(positions)
+        x_values, y_values = positions[:, 0], positions[:, 1]
+        horizontal = np.asarray(directions) == 'h'
+        player_index = np.clip(players, 1, 2) - 1
+        valid = (self._winners == 0) & (self._turns == players) & (self._fences_left[self._games, player_index] > 0)
+        valid &= np.where(horizontal, (x_values >= 0) & (x_values <= 8) & (y_values >= 1) & (y_values <= 8),
+                          (x_values >= 1) & (x_values <= 8) & (y_values >= 0) & (y_values <= 8))
+        if active is not None:
+            valid &= np.asarray(active)
+        slots = (np.where(horizontal, 0, 1), np.where(horizontal, np.clip(x_values, 0, 8), np.clip(y_values, 0, 8)),
+                 np.where(horizontal, np.clip(y_values - 1, 0, 7), np.clip(x_values - 1, 0, 7)))
+        valid &= ~self._fences[self._games, slots[0], slots[1], slots[2]]
+        return self.helper_place_fences(players, player_index, valid, slots)
+
+    def helper_place_fences(self, players, player_index, valid, slots):
+        """
+        Helper function to place_fences, sets the fences of the valid games, runs the fair play check for the opponent
+        of each of them and takes the fence back where it fails. Returns the array of results
+        """
+        self._fences[self._games[valid], slots[0][valid], slots[1][valid], slots[2][valid]] = True
+        breaks = valid.copy()
+        breaks[valid] = ~self.reach_goal(self._games[valid], 3 - players[valid])[0]
+        self._fences[self._games[breaks], slots[0][breaks], slots[1][breaks], slots[2][breaks]] = False
+        placed = valid & ~breaks
+        self._fences_left[self._games[placed], player_index[placed]] -= 1
+        self._turns[placed] = 3 - players[placed]
+        results = np.full(self._size, REJECTED, dtype=np.int8)
+        results[placed] = PLACED
+        results[breaks] = BREAKS_FAIR_PLAY
+        return results
+
+    def reach_goal(self, games, players):
+        """
+        Floods every game of the games index array at once from the pawn of the matching player in the players array,
+        one step per pass, without crossing a fence. Returns a boolean array of whether each player can reach their
+        goal row and an array of their shortest distance to it, -1 where they cannot
+        """
+        count = len(games)
+        rows = np.arange(count)
+        down_open = ~self._fences[games, 0]
+        right_open = ~self._fences[games, 1].transpose(0, 2, 1)
+        start = self._pawns[games, np.clip(players, 1, 2) - 1]
+        reached = np.zeros((count, 9, 9), dtype=bool)
+        reached[rows, start % 9, start // 9] = True
+        goal = np.where(players == 1, 8, 0)
+        distance = np.full(count, -1)
+        frontier, step = reached.copy(), 0
+        while True:
+            distance[(distance < 0) & reached[rows, :, goal].any(axis=1)] = step
+            if not frontier[distance < 0].any():
+                return distance >= 0, distance
+            frontier = self.spread(frontier, down_open, right_open) & ~reached
+            reached |= frontier
+            step += 1
+
+    def spread(self, frontier, down_open, right_open):
+        """
+        Helper function to reach_goal, returns the cells one step up, down, left or right of the frontier array that
+        no fence cuts off
+        """
+        spread = np.zeros_like(frontier)
+        spread[:, :, :8] |= frontier[:, :, 1:] & down_open
+        spread[:, :, 1:] |= frontier[:, :, :8] & down_open
+        spread[:, :8, :] |= frontier[:, 1:, :] & right_open
+        spread[:, 1:, :] |= frontier[:, :8, :] & right_open
+        return spread
+
+    def is_fair_play(self):
+        """
+        Returns a boolean array telling for each game whether the opponent of the player whose turn it is can reach
+        their goal row, like is_fair_play
+        """
+        return self.reach_goal(self._games, 3 - self._turns)[0]
+
+    def shortest_path_lengths(self, players):
+        """
+        Returns an array of the shortest distance of the player in the players array to their goal row in each game,
+        -1 where fences cut them off, like shortest_path_length
+        """
+        return self.reach_goal(self._games, np.asarray(players))[1]
+
+
+def random_actions(rng, batch):
+    """
+    Draws one random action per game of the batch with the NumPy random generator rng. Most actions are for the
+    player whose turn it is, pawn targets are one of PAWN_STEPS away, mostly toward the player's goal row, and fences
+    are near the opponent's pawn so jumps, diagonal moves, wins and fair play failures all come up. Returns arrays of
+    pawn move flags, players, directions and positions
+    """
+    size = batch.get_size()
+    turns = batch.get_turns()
+    players = np.where(rng.random(size) < 0.9, turns, 3 - turns)
+    pawn_moves = rng.random(size) < 0.5
+    pawns = batch.get_pawns()[np.arange(size), np.clip(players, 1, 2) - 1]
+    others = batch.get_pawns()[np.arange(size), 2 - np.clip(players, 1, 2)]
+    anchors = np.where(pawn_moves, pawns, others)
+    steps = PAWN_STEPS[rng.integers(0, len(PAWN_STEPS), size)] * np.stack([np.ones(size), 3 - 2 * players], axis=1)
+    offsets = np.where(pawn_moves[:, None], steps.astype(int), rng.integers(-1, 3, (size, 2)))
+    positions = np.stack([anchors % 9, anchors // 9], axis=1) + offsets
+    directions = np.where(rng.random(size) < 0.5, 'h', 'v')
+    return pawn_moves, players, directions, positions
+
+
+def compare_with_reference(size=64, steps=300, seed=0):
+    """
+    Differential check of BatchedQuoridorGame against QuoridorGame: plays the same random actions on a batch of the
+    integer size parameter number of games and on as many QuoridorGame objects for the integer steps parameter
+    number of steps, comparing every result, the whole position and the fair play check after each step. Raises
+    AssertionError at the first difference, returns the number of actions compared
+    """
+    rng = np.random.default_rng(seed)
+    batch = BatchedQuoridorGame(size)
+    games = [QuoridorGame() for num in range(0, size)]
+    for step in range(0, steps):
+        pawn_moves, players, directions, positions = random_actions(rng, batch)
+        moved = batch.move_pawns(players, positions, pawn_moves)
+        placed = batch.place_fences(players, directions, positions, ~pawn_moves)
+        for index, game in enumerate(games):
+            action = (int(players[index]), str(directions[index]), tuple(int(value) for value in positions[index]))
+            if pawn_moves[index]:
+                check(game.move_pawn(action[0], action[2]) is True, moved[index], step, index, action)
+            else:
+                result = game.place_fence(*action)
+                expected = {True: PLACED, False: REJECTED}.get(result, BREAKS_FAIR_PLAY)
+                check(expected, placed[index], step, index, action)
+        compare_positions(batch, games, step)
+    return size * steps
+
+
+def compare_positions(batch, games, step):
+    """
+    Helper function to compare_with_reference, loads every QuoridorGame into a second batch and checks that both
+    batches hold the same arrays, fair play checks and shortest distances
+    """
+    expected = BatchedQuoridorGame(len(games))
+    for index, game in enumerate(games):
+        expected.load_game(index, game)
+    for name in ("get_pawns", "get_fences", "get_fences_left", "get_turns", "get_winners"):
+        check(True, np.array_equal(getattr(batch, name)(), getattr(expected, name)()), step, None, name)
+    check(True, np.array_equal(batch.is_fair_play(), [game.is_fair_play() for game in games]), step, None, "fair")
+    for player in (1, 2):
+        lengths = [game.shortest_path_length(player) for game in games]
+        lengths = [-1 if length is None else length for length in lengths]
+        check(True, np.array_equal(batch.shortest_path_lengths(np.full(len(games), player)), lengths), step, None,
+              "shortest path of player " + str(player))
+
+
+def check(expected, actual, step, index, action):
+    """
+    Raises AssertionError describing the step, game index and action if the expected and actual parameters differ
+    """
+    if expected != actual:
+        raise AssertionError("step {} game {} {}: expected {}, got {}".format(step, index, action, expected, actual))
+
+
+def main():
+    """
+    Parses the batch size, step count and seed from the command line and runs the differential check
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print("compared", compare_with_reference(args.size, args.steps, args.seed), "actions, no differences")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Description: Compares moves per second and fair-play checks per second of the dictionary Board against BitBoard.
+# Both boards check pawn occupancy in the same occupants list, so the moves per second mostly measure the shared move
+# rules. The fair-play checks are where the fence bitmasks of BitBoard differ from the dictionaries of Board.
+# Run from the repository root with: python -m benchmarks.board_benchmark
+
+import argparse
+import time
+
+from Quoridor import Board, BitBoard, QuoridorGame
+
+SHUFFLE_MOVES = [(1, (3, 0)), (2, (3, 8)), (1, (4, 0)), (2, (4, 8))]
+FENCES = [(1, 'h', (3, 4)), (2, 'h', (4, 4)), (1, 'h', (5, 4)), (2, 'v', (3, 4)), (1, 'v', (6, 3)),
+          (2, 'h', (0, 6)), (1, 'h', (1, 6)), (2, 'v', (2, 6)), (1, 'h', (7, 2)), (2, 'h', (8, 2))]
+
+
+def time_moves(board_class, moves):
+    """
+    Shuffles both pawns left and right for the integer moves parameter number of move_pawn calls on a game using
+    board_class, returns the number of moves per second
+    """
+    game = QuoridorGame(board_class)
+    start = time.perf_counter()
+    for num in range(0, moves // len(SHUFFLE_MOVES)):
+        for player, position in SHUFFLE_MOVES:
+            game.move_pawn(player, position)
+    return moves / (time.perf_counter() - start)
+
+
+def time_fair_play(board_class, checks):
+    """
+    Places a fixed set of fences on a game using board_class and runs the integer checks parameter number of fair
+    play searches on its board, bypassing the game's path cache, returns the number of checks per second
+    """
+    game = QuoridorGame(board_class)
+    for player, direction, position in FENCES:
+        game.place_fence(player, direction, position)
+    board = game.get_board()
+    position = game.get_player_position(2)
+    start = time.perf_counter()
+    for num in range(0, checks):
+        board.can_reach_goal(position, 2)
+    return checks / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Parses the iteration counts from the command line and prints one result row per board implementation
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--moves", type=int, default=100000)
+    parser.add_argument("--checks", type=int, default=10000)
+    args = parser.parse_args()
+    print("{:<10}{:>16}{:>22}".format("board", "moves/sec", "fair-play checks/sec"))
+    for board_class in (Board, BitBoard):
+        moves = time_moves(board_class, args.moves)
+        checks = time_fair_play(board_class, args.checks)
+        print("{:<10}{:>16,.0f}{:>22,.0f}".format(board_class.__name__, moves, checks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Description: Runs a fixed number of MCTS iterations per tree from a fixed position with one tree and with one tree
+# per worker process, and reports iterations per second so the scaling of root parallel search can be measured.
+# Run from the repository root with: python -m benchmarks.mcts_benchmark --workers 1 2 4 --iterations 400
+
+import argparse
+import time
+
+from Quoridor import BitBoard, QuoridorGame
+from Quoridor.ai import MCTSPlayer
+
+OPENING = [('p', (4, 1)), ('p', (4, 7)), ('h', (4, 2)), ('h', (4, 6))]
+
+
+def time_search(workers, iterations, rollout, seed):
+    """
+    Chooses a move from the opening position with an MCTSPlayer searching the integer workers parameter number of
+    trees, each for the integer iterations parameter number of iterations. The pool is started and warmed up before
+    timing. Returns a tuple of the move, the iterations run and the iterations per second
+    """
+    game = QuoridorGame(BitBoard)
+    for move in OPENING:
+        game.push(move)
+    with MCTSPlayer(iterations=1, rollout=rollout, workers=workers, seed=seed, reuse_tree=False) as warm_up:
+        warm_up.choose_move(game)
+        player = MCTSPlayer(iterations=iterations, rollout=rollout, workers=workers, seed=seed, reuse_tree=False,
+                            executor=warm_up.get_executor() if workers > 1 else None)
+        start = time.perf_counter()
+        move = player.choose_move(game)
+        seconds = time.perf_counter() - start
+    return move, player.get_last_report()["iterations"], player.get_last_report()["iterations"] / seconds
+
+
+def main():
+    """
+    Parses the worker counts, iteration count and rollout policy from the command line and prints one result row per
+    worker count
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--iterations", type=int, default=400, help="iterations per tree")
+    parser.add_argument("--rollout", choices=["random", "greedy"], default="greedy")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print("{:<9}{:>12}{:>16}  {}".format("workers", "iterations", "iterations/sec", "move"))
+    for workers in args.workers:
+        move, iterations, rate = time_search(workers, args.iterations, args.rollout, args.seed)
+        print("{:<9}{:>12,}{:>16,.0f}  {}".format(workers, iterations, rate, move))
+
+
+if __name__ == "__main__":
+    main()
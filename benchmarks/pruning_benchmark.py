@@ -0,0 +1,66 @@
+# Description: Measures what pruning fences with fence_candidates does to the alpha-beta search: the nodes searched and
+# the nodes per second at a fixed depth on the positions of the benchmark suite, and the results of games between a
+# player that prunes and one that does not, given the same time per move.
+# Run from the repository root with: python -m benchmarks.pruning_benchmark --depth 2 --games 10
+
+import argparse
+import time
+
+from Quoridor import BitBoard
+from Quoridor.ai import AlphaBetaPlayer
+from Quoridor.tournament import make_schedule, play_game
+
+from benchmarks.suite import FAMILIES, build_game, make_position
+
+
+def time_search(games, prune_fences, depth):
+    """
+    Searches each game in the list of games parameter to the integer depth parameter, with or without pruning, and
+    returns the total nodes searched, the nodes per second and the mean seconds per search
+    """
+    nodes, seconds = 0, 0.0
+    for game in games:
+        player = AlphaBetaPlayer(time_limit=1e9, max_depth=depth, prune_fences=prune_fences)
+        start = time.perf_counter()
+        player.choose_move(game)
+        seconds += time.perf_counter() - start
+        nodes += player.get_last_report()["nodes"]
+    return nodes, nodes / seconds, seconds / len(games)
+
+
+def play_match(games, time_limit, seed):
+    """
+    Plays the integer games parameter number of games between AlphaBetaPlayer with and without pruning, switching who
+    moves first every game, and returns the number of wins of each and of games without a winner
+    """
+    bots = [{"name": "pruned", "type": "alphabeta", "time_limit": time_limit, "prune_fences": True},
+            {"name": "full", "type": "alphabeta", "time_limit": time_limit}]
+    results = {"pruned": 0, "full": 0, None: 0}
+    for spec in make_schedule(bots, games, seed):
+        results[play_game(spec, max_plies=200)["winner"]] += 1
+    return results
+
+
+def main():
+    """
+    Parses the search depth, positions per family, games and time per move from the command line, prints one row per
+    family and setting, then the results of the match
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--positions", type=int, default=4, help="positions per family")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--time-limit", type=float, default=0.2, help="seconds per move in the match")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print("{:<10}{:<8}{:>12}{:>14}{:>14}".format("family", "prune", "nodes", "nodes/sec", "sec/search"))
+    for family in FAMILIES:
+        games = [build_game(BitBoard, make_position(family, seed)) for seed in range(0, args.positions)]
+        for prune_fences in (False, True):
+            nodes, rate, seconds = time_search(games, prune_fences, args.depth)
+            print("{:<10}{:<8}{:>12,}{:>14,.0f}{:>14.4f}".format(family, str(prune_fences), nodes, rate, seconds))
+    print(play_match(args.games, args.time_limit, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Description: Compares frames per second of drawing the whole board after every move against redrawing only the
+# rows the move changed, for each board implementation and rendering style.
+# Run from the repository root with: python -m benchmarks.render_benchmark
+
+import argparse
+import time
+
+from Quoridor import Board, BitBoard, QuoridorGame
+from Quoridor.rendering import STYLES, BoardRenderer, changed_rows
+
+from .board_benchmark import FENCES, SHUFFLE_MOVES
+
+
+def time_renders(board_class, style, frames, incremental):
+    """
+    Shuffles both pawns of a game using board_class with fences on it and draws a frame after each of the integer
+    frames parameter number of moves in the style parameter, only redrawing the changed rows if incremental is True.
+    Returns the number of frames per second
+    """
+    game = QuoridorGame(board_class)
+    for player, direction, position in FENCES:
+        game.place_fence(player, direction, position)
+    renderer = BoardRenderer(style)
+    renderer.render(game.get_board())
+    start = time.perf_counter()
+    for num in range(0, frames // len(SHUFFLE_MOVES)):
+        for player, position in SHUFFLE_MOVES:
+            old_position = game.get_player_position(player)
+            game.move_pawn(player, position)
+            rows = changed_rows(('p', position), old_position) if incremental else None
+            renderer.render(game.get_board(), rows)
+    return frames / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Parses the frame count from the command line and prints one result row per board implementation and style
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+    print("{:<10}{:<8}{:>16}{:>20}".format("board", "style", "full frames/sec", "incremental/sec"))
+    for board_class in (Board, BitBoard):
+        for style in STYLES:
+            full = time_renders(board_class, style, args.frames, False)
+            incremental = time_renders(board_class, style, args.frames, True)
+            print("{:<10}{:<8}{:>16,.0f}{:>20,.0f}".format(board_class.__name__, style, full, incremental))
+
+
+if __name__ == "__main__":
+    main()
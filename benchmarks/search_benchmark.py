@@ -0,0 +1,84 @@
+# Description: Compares a depth limited traversal of the game tree that copies the game at every node against one
+# that plays and takes back moves with push and pop.
+# Run from the repository root with: python -m benchmarks.search_benchmark
+
+import argparse
+import copy
+import time
+
+from Quoridor import Board, BitBoard, QuoridorGame
+
+OPENING = [(1, (4, 1)), (2, (4, 7)), (1, (4, 2)), (2, (4, 6))]
+
+
+def get_moves(game, fences):
+    """
+    Returns the move tuples of the player whose turn it is, every pawn move and the first fences parameter number of
+    fence placements so the tree stays small enough to walk
+    """
+    player = game.get_player_turn()
+    moves = [('p', position) for position in game.legal_pawn_moves(player)]
+    return moves + game.legal_fence_placements(player)[:fences]
+
+
+def count_with_copies(game, depth, fences):
+    """
+    Walks the game tree to the integer depth parameter by deep copying the game before every move, returns the
+    number of nodes visited
+    """
+    if depth == 0:
+        return 1
+    nodes = 1
+    for move in get_moves(game, fences):
+        child = copy.deepcopy(game)
+        child.push(move)
+        nodes += count_with_copies(child, depth - 1, fences)
+    return nodes
+
+
+def count_with_push_pop(game, depth, fences):
+    """
+    Walks the game tree to the integer depth parameter by playing each move with push and taking it back with pop,
+    returns the number of nodes visited
+    """
+    if depth == 0:
+        return 1
+    nodes = 1
+    for move in get_moves(game, fences):
+        game.push(move)
+        nodes += count_with_push_pop(game, depth - 1, fences)
+        game.pop()
+    return nodes
+
+
+def time_traversal(count_function, board_class, depth, fences):
+    """
+    Runs count_function from a fixed opening on a game using board_class, returns the number of nodes visited and
+    the number of nodes per second
+    """
+    game = QuoridorGame(board_class)
+    for player, position in OPENING:
+        game.move_pawn(player, position)
+    start = time.perf_counter()
+    nodes = count_function(game, depth, fences)
+    return nodes, nodes / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Parses the depth and fence limit from the command line and prints one result row per board implementation and
+    traversal
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fences", type=int, default=10)
+    args = parser.parse_args()
+    print("{:<10}{:<14}{:>10}{:>14}".format("board", "traversal", "nodes", "nodes/sec"))
+    for board_class in (Board, BitBoard):
+        for name, count_function in (("copy", count_with_copies), ("push/pop", count_with_push_pop)):
+            nodes, rate = time_traversal(count_function, board_class, args.depth, args.fences)
+            print("{:<10}{:<14}{:>10,}{:>14,.0f}".format(board_class.__name__, name, nodes, rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# Description: A load generator for the game server. Many clients each play a session of random moves with the odd
+# board drawing and AI move mixed in, and the latency of every request is reported as p50 and p99 per op.
+# Run from the repository root with: python -m benchmarks.server_benchmark --clients 200 --requests 50
+# A server is started in a subprocess unless --connect host:port or --connect a Unix socket path is given.
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+
+PAWN_STEPS = [(0, 1), (0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+async def request(reader, writer, latencies, message):
+    """
+    Sends the message dictionary parameter as one line of JSON, waits for the response line and adds the round trip
+    time in seconds to the list kept for its op in the latencies dictionary. Returns the response dictionary
+    """
+    start = time.perf_counter()
+    writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    latencies.setdefault(message["op"], []).append(time.perf_counter() - start)
+    return response
+
+
+async def play_client(address, seed, requests, ai_chance, latencies):
+    """
+    Connects to the server at the address parameter and plays the integer requests parameter number of random
+    requests on a new session, seeded with the seed parameter. Each player's pawn is stepped mostly toward their goal
+    row, with fences, is_winner and print_board requests mixed in and an AI move with the ai_chance probability
+    """
+    reader, writer = await open_connection(address)
+    rng = random.Random(seed)
+    game = (await request(reader, writer, latencies, {"op": "new"}))["result"]
+    positions, player = {1: [4, 0], 2: [4, 8]}, 1
+    for num in range(0, requests):
+        message = next_request(rng, game, player, positions, ai_chance)
+        response = await request(reader, writer, latencies, message)
+        if response.get("ok") and message["op"] == "ai_move" and response["result"]["move"] is not None:
+            message = {"op": "place_fence"} if response["result"]["move"][0] != 'p' else \
+                {"op": "move_pawn", "position": response["result"]["move"][1]}
+            response["result"] = response["result"]["result"]
+        if response.get("ok") and response["result"] is True and message["op"] in ("move_pawn", "place_fence"):
+            if message["op"] == "move_pawn":
+                positions[player] = list(message["position"])
+            player = 3 - player
+    await request(reader, writer, latencies, {"op": "close", "game": game})
+    writer.close()
+
+
+def next_request(rng, game, player, positions, ai_chance):
+    """
+    Returns a random request dictionary for the player parameter in the session numbered game
+    """
+    roll = rng.random()
+    if roll < ai_chance:
+        return {"op": "ai_move", "game": game, "time_limit": 0.05}
+    if roll < 0.1:
+        return {"op": "print_board", "game": game, "style": rng.choice(["ascii", "compact"])}
+    if roll < 0.15:
+        return {"op": "is_winner", "game": game, "player": player}
+    if roll < 0.35:
+        return {"op": "place_fence", "game": game, "player": player, "direction": rng.choice("hv"),
+                "position": [rng.randint(0, 8), rng.randint(1, 8)]}
+    step_x, step_y = rng.choice(PAWN_STEPS)
+    step_y = step_y if player == 1 else -step_y
+    return {"op": "move_pawn", "game": game, "player": player,
+            "position": [positions[player][0] + step_x, positions[player][1] + step_y]}
+
+
+async def open_connection(address):
+    """
+    Opens a connection to a "host:port" address, or to a Unix socket path for any other address
+    """
+    if ":" in address:
+        host, port = address.rsplit(":", 1)
+        return await asyncio.open_connection(host, int(port))
+    return await asyncio.open_unix_connection(address)
+
+
+async def run_load(address, clients, requests, ai_chance, seed):
+    """
+    Runs the integer clients parameter number of clients at once against the server at the address parameter,
+    returns the latencies dictionary of lists of seconds keyed by op and the total wall time
+    """
+    latencies = {}
+    start = time.perf_counter()
+    await asyncio.gather(*[play_client(address, seed + num, requests, ai_chance, latencies)
+                           for num in range(0, clients)])
+    return latencies, time.perf_counter() - start
+
+
+def percentile(values, fraction):
+    """
+    Returns the value below which the fraction parameter of the list of values parameter falls
+    """
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def main():
+    """
+    Parses the load settings from the command line, starts a server unless one is given, runs the load and prints
+    the request count, p50 and p99 latency in milliseconds of each op and the overall requests per second
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connect", default=None, help="host:port or Unix socket path of a running server")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=50, help="requests per client")
+    parser.add_argument("--ai-chance", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    server, address = None, args.connect
+    if address is None:
+        server = subprocess.Popen([sys.executable, "-m", "Quoridor.server", "--port", "0"], stdout=subprocess.PIPE,
+                                  text=True)
+        address = server.stdout.readline().strip()
+    try:
+        latencies, wall_time = asyncio.run(run_load(address, args.clients, args.requests, args.ai_chance, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print("{:<14}{:>10}{:>12}{:>12}".format("op", "requests", "p50 ms", "p99 ms"))
+    for op, values in sorted(latencies.items()):
+        print("{:<14}{:>10,}{:>12.2f}{:>12.2f}".format(op, len(values), percentile(values, 0.5) * 1000,
+                                                       percentile(values, 0.99) * 1000))
+    total = sum(len(values) for values in latencies.values())
+    print("{:,} requests in {:.2f} s, {:,.0f} requests/sec".format(total, wall_time, total / wall_time))
+
+
+if __name__ == "__main__":
+    main()
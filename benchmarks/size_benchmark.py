@@ -0,0 +1,56 @@
+# Description: Plays random games on boards of several sizes with two and four players and reports how fast moves are
+# generated and played, so bots can be trained on small boards and stress tested on large ones.
+# Run from the repository root with: python -m benchmarks.size_benchmark --sizes 5 9 11
+
+import argparse
+import time
+
+from Quoridor import Board, BitBoard, QuoridorGame
+from Quoridor.ai import RandomPlayer
+
+BOARD_CLASSES = {"board": Board, "bitboard": BitBoard}
+
+
+def play_random_games(board_class, size, players, games, max_plies):
+    """
+    Plays the integer games parameter number of games between RandomPlayer bots on a board_class board with the
+    integer size parameter number of cells on each side and the integer players parameter number of players, each
+    stopped at max_plies. Returns a tuple of the plies played, the games won and the seconds taken
+    """
+    plies, wins = 0, 0
+    start = time.perf_counter()
+    for num in range(0, games):
+        game = QuoridorGame(board_class, size=size, players=players)
+        bot = RandomPlayer(seed=num)
+        for ply in range(0, max_plies):
+            move = bot.choose_move(game)
+            if move is None or game.push(move) is not True:
+                break
+            plies += 1
+            if game.get_game_winner() is not None:
+                wins += 1
+                break
+    return plies, wins, time.perf_counter() - start
+
+
+def main():
+    """
+    Parses the sizes, game count and board from the command line and prints one result row per size and player count
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 9, 11])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--max-plies", type=int, default=200)
+    parser.add_argument("--board", choices=sorted(BOARD_CLASSES), default="bitboard")
+    args = parser.parse_args()
+    print("{:<8}{:>9}{:>10}{:>8}{:>14}{:>12}".format("size", "players", "plies", "wins", "plies/sec", "games/sec"))
+    for size in args.sizes:
+        for players in (2, 4):
+            plies, wins, seconds = play_random_games(BOARD_CLASSES[args.board], size, players, args.games,
+                                                     args.max_plies)
+            print("{:<8}{:>9}{:>10,}{:>8}{:>14,.0f}{:>12,.1f}".format("{0}x{0}".format(size), players, plies, wins,
+                                                                    plies / seconds, args.games / seconds))
+
+
+if __name__ == "__main__":
+    main()
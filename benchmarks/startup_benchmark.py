@@ -0,0 +1,75 @@
+# Description: Measures how long a fresh interpreter takes to import the engine and how long a process pool takes to
+# start its workers and play a first move in each, and fails if either goes over its budget or the import prints.
+# Run from the repository root with: python -m benchmarks.startup_benchmark
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+IMPORT_BUDGET = 0.05
+POOL_BUDGET = 1.0
+IMPORT_SCRIPT = "import time; start = time.perf_counter(); from Quoridor import QuoridorGame; " \
+                "print(time.perf_counter() - start)"
+
+
+def first_move(num):
+    """
+    Runs in a worker process: imports the engine and plays one move, returns whether the move was played
+    """
+    from Quoridor import QuoridorGame
+    return QuoridorGame().move_pawn(1, (4, 1))
+
+
+def time_import(repeats):
+    """
+    Imports the engine in the integer repeats parameter number of fresh interpreters, returns the median import time
+    in seconds and everything the imports printed besides the timing
+    """
+    times, extra_output = [], ""
+    for num in range(0, repeats):
+        output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], capture_output=True, text=True, check=True)
+        lines = output.stdout.splitlines()
+        times.append(float(lines[-1]))
+        extra_output += "\n".join(lines[:-1])
+    return statistics.median(times), extra_output
+
+
+def time_pool(workers, repeats):
+    """
+    Starts a pool of the integer workers parameter number of processes and waits for a first move from each, the
+    integer repeats parameter number of times. Returns the median time in seconds
+    """
+    times = []
+    for num in range(0, repeats):
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(first_move, range(0, workers)))
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    """
+    Parses the worker count and repeats from the command line, prints the import and pool start times against their
+    budgets and exits with status 1 if either is over budget or importing the engine printed anything
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    import_time, extra_output = time_import(args.repeats)
+    pool_time = time_pool(args.workers, args.repeats)
+    print("{:<24}{:>12}{:>12}".format("measure", "seconds", "budget"))
+    print("{:<24}{:>12.4f}{:>12.4f}".format("import", import_time, IMPORT_BUDGET))
+    print("{:<24}{:>12.4f}{:>12.4f}".format("pool of " + str(args.workers), pool_time, POOL_BUDGET))
+    if extra_output:
+        print("importing the engine printed:\n" + extra_output)
+    if import_time > IMPORT_BUDGET or pool_time > POOL_BUDGET or extra_output:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
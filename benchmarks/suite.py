@@ -0,0 +1,254 @@
+# Description: The benchmark suite. Builds the same seeded positions every run, openings, fence heavy middle games and
+# maze-like boards where the pawns are nearly locked in, and measures move_pawn and place_fence throughput, fair play
+# search latency, legal move generation, random playouts and the memory a game takes on each board implementation.
+# Results are written as JSON, and a run can be compared against an earlier one to spot regressions.
+# Run from the repository root with: python -m benchmarks.suite --output results.json --compare baseline.json
+
+import argparse
+import copy
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from Quoridor import Board, BitBoard, QuoridorGame
+from Quoridor.ai import RandomPlayer
+
+BOARD_CLASSES = {"board": Board, "bitboard": BitBoard}
+FAMILIES = {"opening": (4, 0.0, 10), "midgame": (24, 0.6, 10), "maze": (50, 0.9, 25)}
+HIGHER_IS_BETTER = ("_per_sec",)
+
+
+def make_position(family, seed):
+    """
+    Returns the list of moves that builds the position numbered seed of the family parameter, one of FAMILIES. Each
+    family is played from the start by a random number generator seeded with seed: the first value in FAMILIES is how
+    many plies are played, the second the chance of placing a fence on a ply and the third the fences each player
+    gets. Fences across the next player's shortest path are picked first, so the maze family winds the paths through
+    most of the board
+    """
+    plies, fence_chance, fences = FAMILIES[family]
+    rng = random.Random(family + str(seed))
+    game = QuoridorGame(Board, fences=fences)
+    for num in range(0, plies):
+        player = game.get_player_turn()
+        cuts = sorted(set(game.legal_fence_placements(player)) & game.get_path_fences(game.get_opponent(player)))
+        pawn_moves = [('p', position) for position in game.legal_pawn_moves(player)]
+        moves = cuts if len(cuts) != 0 and rng.random() < fence_chance else pawn_moves
+        if len(moves) == 0 or game.get_game_winner() is not None:
+            break
+        game.push(rng.choice(moves))
+        if game.get_game_winner() is not None:
+            game.pop()
+            break
+    return game.get_move_history(), fences
+
+
+def build_game(board_class, position):
+    """
+    Returns a game on board_class with the (moves, fences) position tuple parameter from make_position played on it
+    """
+    moves, fences = position
+    game = QuoridorGame(board_class, fences=fences)
+    for move in moves:
+        game.push(move)
+    return game
+
+
+def best_rate(function, count, repeats):
+    """
+    Calls function, which does the integer count parameter number of operations, the integer repeats parameter number
+    of times and returns the best number of operations per second
+    """
+    best = None
+    for num in range(0, repeats):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return count / best
+
+
+def measure_moves(games, repeats):
+    """
+    Returns the move_pawn and place_fence calls per second on the list of games parameter. Every call is made on its
+    own copy of the position, made before the clock starts, so each one is the first move played there. Each game
+    moves to its first legal pawn move and places its first legal fence, the fair play check included
+    """
+    pawn_moves = [(game, game.get_player_turn(), game.legal_pawn_moves(game.get_player_turn())) for game in games]
+    fences = [(game, game.get_player_turn(), game.legal_fence_placements(game.get_player_turn())) for game in games]
+    pawn_moves = [(game, player, moves[0]) for game, player, moves in pawn_moves if len(moves) != 0]
+    fences = [(game, player, moves[0]) for game, player, moves in fences if len(moves) != 0]
+    results = {}
+    for name, moves, play in (("move_pawn_per_sec", pawn_moves, QuoridorGame.move_pawn),
+                              ("place_fence_per_sec", fences,
+                               lambda game, player, move: game.place_fence(player, move[0], move[1]))):
+        copies = [[(copy.deepcopy(game), player, move) for game, player, move in moves] for num in range(0, repeats)]
+        results[name] = best_rate(lambda: [play(*item) for item in copies.pop()], len(moves), repeats) \
+            if len(moves) != 0 else None
+    return results
+
+
+def measure_fair_play(games, repeats):
+    """
+    Returns the mean number of fences on the list of games parameter and the median and 99th percentile latency in
+    microseconds of a fair play search for each player of each game, run on the board so the path cache is not used
+    """
+    latencies = []
+    for game in games:
+        board = game.get_board()
+        for player in (1, 2):
+            position = game.get_player_position(player)
+            for num in range(0, repeats):
+                start = time.perf_counter()
+                board.can_reach_goal(position, player)
+                latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    fences = [sum(1 for move in game.get_move_history() if move[0] != 'p') for game in games]
+    return {"mean_fences": statistics.mean(fences), "fair_play_p50_us": latencies[len(latencies) // 2] * 1e6,
+            "fair_play_p99_us": latencies[min(int(0.99 * len(latencies)), len(latencies) - 1)] * 1e6}
+
+
+def measure_legal_moves(games, repeats):
+    """
+    Returns how many times per second the legal pawn moves and legal fence placements of the player to move can be
+    listed on the list of games parameter
+    """
+    def list_moves():
+        for game in games:
+            game.legal_pawn_moves(game.get_player_turn())
+            game.legal_fence_placements(game.get_player_turn())
+    return {"legal_moves_per_sec": best_rate(list_moves, len(games), repeats)}
+
+
+def measure_playouts(board_class, games, max_plies):
+    """
+    Plays the integer games parameter number of games between seeded RandomPlayer bots on board_class, each stopped at
+    max_plies, and returns the games and plies played per second
+    """
+    plies = 0
+    start = time.perf_counter()
+    for num in range(0, games):
+        game = QuoridorGame(board_class)
+        players = {1: RandomPlayer(seed=2 * num), 2: RandomPlayer(seed=2 * num + 1)}
+        while game.get_game_winner() is None and len(game.get_move_history()) < max_plies:
+            move = players[game.get_player_turn()].choose_move(game)
+            if move is None or game.push(move) is not True:
+                break
+        plies += len(game.get_move_history())
+    seconds = time.perf_counter() - start
+    return {"playouts_per_sec": games / seconds, "playout_plies_per_sec": plies / seconds}
+
+
+def measure_memory(board_class, position, count):
+    """
+    Builds the integer count parameter number of games on board_class with the position tuple parameter played on
+    each and returns the peak memory traced while doing so, in bytes per game
+    """
+    tracemalloc.start()
+    games = [build_game(board_class, position) for num in range(0, count)]
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"peak_bytes_per_game": peak / len(games)}
+
+
+def run_suite(board_names, positions, repeats, playouts):
+    """
+    Runs every measurement on each board named in the list of board_names parameter, with the integer positions
+    parameter number of positions per family, and returns the results nested by board, then family
+    """
+    families = {family: [make_position(family, seed) for seed in range(0, positions)] for family in FAMILIES}
+    results = {}
+    for name in board_names:
+        board_class = BOARD_CLASSES[name]
+        results[name] = {}
+        for family, family_positions in families.items():
+            games = [build_game(board_class, position) for position in family_positions]
+            result = measure_moves(games, repeats)
+            result.update(measure_fair_play(games, repeats))
+            result.update(measure_legal_moves(games, repeats))
+            result.update(measure_memory(board_class, family_positions[0], 50))
+            results[name][family] = result
+        results[name]["playouts"] = measure_playouts(board_class, playouts, 300)
+    return results
+
+
+def get_commit():
+    """
+    Returns the hash of the git commit of the working tree, None if it cannot be found
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results, prefix=""):
+    """
+    Returns the nested results dictionary parameter as a flat dictionary keyed by the dotted path of each number
+    """
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, prefix + key + "."))
+        elif value is not None:
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns a list of (metric, baseline value, value, change) tuples for every metric of the results dictionary
+    parameter that is worse than in the baseline dictionary by more than the threshold fraction. Rates are worse when
+    lower, latencies and memory when higher
+    """
+    old, new = flatten(baseline["results"]), flatten(results["results"])
+    regressions = []
+    for metric in sorted(set(old) & set(new)):
+        if metric.endswith("mean_fences") or old[metric] == 0:
+            continue
+        change = new[metric] / old[metric] - 1
+        worse = -change if metric.endswith(HIGHER_IS_BETTER) else change
+        if worse > threshold:
+            regressions.append((metric, old[metric], new[metric], change))
+    return regressions
+
+
+def main():
+    """
+    Parses the settings from the command line, runs the suite and writes the results with the commit, Python version,
+    platform and settings as JSON to the output file, or prints them. With --compare, prints the metrics that got worse
+    than in an earlier results file by more than the threshold and exits with status 1 if there are any
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", default=None, help="JSON file to write the results to, printed if not given")
+    parser.add_argument("--boards", nargs="+", choices=sorted(BOARD_CLASSES), default=["board", "bitboard"])
+    parser.add_argument("--positions", type=int, default=16, help="positions per family")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--playouts", type=int, default=10, help="random games per board")
+    parser.add_argument("--compare", default=None, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="fraction a metric may get worse by")
+    args = parser.parse_args()
+    results = {"commit": get_commit(), "python": platform.python_version(), "platform": platform.platform(),
+               "settings": {"positions": args.positions, "repeats": args.repeats, "playouts": args.playouts},
+               "results": run_suite(args.boards, args.positions, args.repeats, args.playouts)}
+    if args.output is not None:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    if args.compare is not None:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for metric, old, new, change in regressions:
+            print("{:<48}{:>16,.2f}{:>16,.2f}{:>+9.1%}".format(metric, old, new, change))
+        if len(regressions) != 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
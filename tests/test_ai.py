@@ -0,0 +1,42 @@
+# Description: Tests of the computer players: the moves they pick and the reports they leave behind.
+# Run from the repository root with: python -m pytest tests/test_ai.py
+
+import multiprocessing
+
+from Quoridor import BitBoard, QuoridorGame
+from Quoridor.ai import AlphaBetaPlayer, MCTSPlayer
+
+
+def test_tablebase_generation_does_not_spend_the_search_budget():
+    """
+    Generating the tablebase of a game without fences takes longer than the time limit, the search still gets its
+    whole budget afterwards and scores the move it picks
+    """
+    player = AlphaBetaPlayer(time_limit=0.05, build_tablebases=True)
+    move = player.choose_move(QuoridorGame(BitBoard, fences=0))
+    report = player.get_last_report()
+    assert move is not None and report["move"] == move
+    assert report["depth"] >= 1 and report["score"] is not None
+    assert report["tablebase_time"] > 0
+
+
+def test_report_is_replaced_when_there_is_no_move():
+    """
+    Once the game is won choose_move returns None and its report says so instead of keeping the last move's
+    """
+    game = QuoridorGame(BitBoard)
+    player = AlphaBetaPlayer(time_limit=0.05, max_depth=2)
+    player.choose_move(game)
+    game.set_game_winner(1)
+    assert player.choose_move(game) is None
+    report = player.get_last_report()
+    assert report["move"] is None and report["score"] is None and report["depth"] == 0 and report["nodes"] == 0
+
+
+def test_mcts_player_shuts_its_pool_down():
+    """
+    A root parallel MCTSPlayer used in a with statement leaves no worker process behind
+    """
+    with MCTSPlayer(iterations=5, workers=2, seed=0) as player:
+        assert player.choose_move(QuoridorGame(BitBoard)) is not None
+    assert multiprocessing.active_children() == []
@@ -0,0 +1,83 @@
+# Description: Tests of the game analysis: every ply of a recorded game is annotated with the path lengths, legal
+# move count, wasted fences and the analyst's move as a fresh replay gives them, and analyzing an archive on worker
+# processes gives what analyzing it in this process gives, without leaving the record file open.
+# Run from the repository root with: python -m pytest tests/test_analysis.py
+
+import os
+
+import pytest
+
+from Quoridor import QuoridorGame, RecordReader, RecordWriter, analyze_archive, analyze_game
+
+MOVES = [('h', (4, 7)), ('h', (0, 5)), ('p', (4, 1)), ('p', (4, 7)), ('h', (0, 3)), ('p', (3, 7))]
+ANALYST = {"type": "alphabeta", "time_limit": 1e9, "max_depth": 1}
+
+
+@pytest.fixture
+def record_path(tmp_path):
+    """
+    Returns the path of a record file holding MOVES and two shorter games
+    """
+    path = str(tmp_path / "games.qrec")
+    with RecordWriter(path) as writer:
+        writer.write_game(MOVES)
+        writer.write_game(MOVES[:3])
+        writer.write_game([('p', (4, 1)), ('p', (4, 7)), ('p', (4, 2))])
+    return path
+
+
+def test_recorded_game_is_annotated_ply_by_ply(record_path):
+    """
+    Each annotation of a game read back from a record holds what a replay up to its ply gives, the fence that cuts no
+    path is the one marked wasted, and the best move is the analyst's own choice
+    """
+    with RecordReader(record_path) as reader:
+        moves = reader.get_moves(0)[0]
+    annotations = list(analyze_game(moves, analyst=ANALYST))
+    assert [annotation["ply"] for annotation in annotations] == list(range(0, len(MOVES)))
+    assert [annotation["wasted_fence"] for annotation in annotations] == [False, True, None, None, True, None]
+    game = QuoridorGame()
+    for annotation, move in zip(annotations, MOVES):
+        player = game.get_player_turn()
+        assert annotation["player"] == player and annotation["move"] == move
+        assert annotation["distances"] == [game.shortest_path_length(1), game.shortest_path_length(2)]
+        assert annotation["legal_moves"] == len(game.legal_pawn_moves(player)) + \
+            len(game.legal_fence_placements(player))
+        assert annotation["matches_best"] == (annotation["best_move"] == move)
+        assert game.push(annotation["best_move"]) is True
+        game.pop()
+        game.push(move)
+    assert "best_move" not in next(analyze_game(moves, analyst=None))
+
+
+def test_illegal_moves_are_refused():
+    """
+    A move push turns down raises ValueError at its ply
+    """
+    with pytest.raises(ValueError):
+        list(analyze_game([('p', (4, 1)), ('p', (4, 5))], analyst=None))
+
+
+def test_workers_match_one_process(record_path):
+    """
+    Analyzing the archive on two worker processes gives the same annotations as analyzing it in this process, for
+    every game and for a chosen few
+    """
+    alone = dict(analyze_archive(record_path, 1, ANALYST))
+    assert sorted(alone) == [0, 1, 2]
+    assert dict(analyze_archive(record_path, 2, ANALYST)) == alone
+    assert dict(analyze_archive(record_path, 2, ANALYST, games=[2, 0])) == {2: alone[2], 0: alone[0]}
+
+
+def test_one_process_closes_the_record_file(record_path):
+    """
+    Once the archive has been analyzed in this process, or the generator closed partway, no file stays open
+    """
+    if not os.path.isdir("/proc/self/fd"):
+        pytest.skip("needs /proc/self/fd to count open files")
+    before = len(os.listdir("/proc/self/fd"))
+    list(analyze_archive(record_path, 1, None))
+    archive = analyze_archive(record_path, 1, None)
+    next(archive)
+    archive.close()
+    assert len(os.listdir("/proc/self/fd")) == before
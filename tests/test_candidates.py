@@ -0,0 +1,100 @@
+# Description: Tests of fence pruning: fence_candidates lists every fence that lengthens an opponent's shortest path,
+# with a bound no smaller than what it adds, and the alpha-beta search that only tries those fences picks moves worth
+# as much as the full search does at the same depth on the positions of the benchmark suite.
+# Run from the repository root with: python -m pytest tests/test_candidates.py
+
+import random
+
+import pytest
+
+from Quoridor import BitBoard, QuoridorGame, fence_candidates
+from Quoridor.ai import AlphaBetaPlayer
+
+from benchmarks.suite import FAMILIES, build_game, make_position
+
+SEEDS = range(0, 4)
+
+
+def suite_games():
+    """
+    Returns the list of games of the first positions of every family of the benchmark suite
+    """
+    return [build_game(BitBoard, make_position(family, seed)) for family in FAMILIES for seed in SEEDS]
+
+
+def random_games(fence_length, count, seed):
+    """
+    Returns a list of the integer count parameter number of games with fences of fence_length, each played from the
+    start with random pawn moves and fences across the next player's path for a random number of plies
+    """
+    rng = random.Random(seed)
+    games = []
+    for num in range(0, count):
+        game = QuoridorGame(BitBoard, fence_length=fence_length)
+        for ply in range(0, rng.randint(0, 40)):
+            player = game.get_player_turn()
+            cuts = sorted(set(game.legal_fence_placements(player)) & game.get_path_fences(game.get_opponent(player)))
+            moves = [('p', position) for position in game.legal_pawn_moves(player)]
+            if len(cuts) != 0 and rng.random() < 0.5:
+                moves = cuts
+            if len(moves) == 0 or game.push(rng.choice(moves)) is not True or game.get_game_winner() is not None:
+                break
+        if game.get_game_winner() is None:
+            games.append(game)
+    return games
+
+
+@pytest.mark.parametrize("fence_length", [1, 2])
+def test_candidates_hold_every_fence_that_lengthens_a_path(fence_length):
+    """
+    Every legal fence that makes the opponent's shortest path longer is a candidate, with a bound of at least the
+    steps it adds
+    """
+    games = random_games(fence_length, 12, fence_length) + (suite_games() if fence_length == 1 else [])
+    checked = 0
+    for num, game in enumerate(games):
+        player = game.get_player_turn()
+        opponent = game.get_opponent(player)
+        before = game.shortest_path_length(opponent)
+        bounds = dict(fence_candidates(game, player))
+        for move in game.legal_fence_placements(player):
+            game.push(move)
+            added = game.shortest_path_length(opponent) - before
+            game.pop()
+            if added > 0:
+                assert bounds.get(move, 0) >= added, (num, move, added)
+                checked += 1
+    assert checked != 0
+
+
+@pytest.mark.parametrize("depth", [1, 2])
+def test_pruned_search_finds_moves_of_equal_value(depth):
+    """
+    On the positions of the benchmark suite the pruned search scores the position the same as the full search at
+    the same depth, the move it picks is worth that score to the full search, and it searches fewer nodes
+    """
+    for num, game in enumerate(suite_games()):
+        full = AlphaBetaPlayer(time_limit=1e9, max_depth=depth)
+        pruned = AlphaBetaPlayer(time_limit=1e9, max_depth=depth, prune_fences=True)
+        full.choose_move(game)
+        move = pruned.choose_move(game)
+        full_report, pruned_report = full.get_last_report(), pruned.get_last_report()
+        assert pruned_report["score"] == full_report["score"], num
+        assert pruned_report["nodes"] < full_report["nodes"], num
+        assert helper_move_value(game, move, depth) == full_report["score"], (num, move)
+
+
+def helper_move_value(game, move, depth):
+    """
+    Helper function to test_pruned_search_finds_moves_of_equal_value, returns the score the full search gives the
+    move parameter in the game parameter when searched to the integer depth parameter
+    """
+    assert game.push(move) is True
+    try:
+        player = AlphaBetaPlayer(time_limit=1e9, max_depth=depth - 1)
+        if depth == 1:
+            return -player.evaluate(game)
+        player.choose_move(game)
+        return -player.get_last_report()["score"]
+    finally:
+        game.pop()
@@ -0,0 +1,336 @@
+# Description: Tests of the rules of QuoridorGame. Pawn moves are checked against original_pawn_move, the move rules
+# as they were written before moves were checked through the adjacency and fence-edge tables, on random positions of
+# both board classes with the pawns next to each other so jumps and diagonal moves come up. Jumps and diagonal moves
+# past a pawn to the left or right are checked as well, which the original rules left out. Random push and pop
+# sequences must put every part of the game back as it was, and moves push turns down must leave no trace.
+# Run from the repository root with: python -m pytest tests/test_engine.py
+
+import random
+
+import pytest
+
+from Quoridor import Board, BitBoard, QuoridorGame, ZobristKeys
+from Quoridor.engine import MAX_FENCES
+
+DIRECTION_VERIFIERS = {(-1, 0): "verify_left_move", (1, 0): "verify_right_move", (0, -1): "verify_top_move",
+                       (0, 1): "verify_bottom_move", (-1, -1): "verify_northwest_move",
+                       (1, -1): "verify_northeast_move", (-1, 1): "verify_southwest_move",
+                       (1, 1): "verify_southeast_move", (0, -2): "verify_two_up_move", (0, 2): "verify_two_down_move"}
+
+
+def original_pawn_move(board, position, current_position):
+    """
+    Returns True if the pawn on the tuple current_position parameter may move to the tuple position parameter under
+    the original rules, read straight off the cell and fence lookups of the board parameter, with jumps and diagonal
+    moves past a pawn to the left or right added the same way as those past a pawn above or below. The board edge
+    does not count as a fence for a diagonal move
+    """
+    x, y = current_position
+    cell, horizontal, vertical = board.get_cell, board.get_horizontal_row, board.get_vertical_row
+    if not board.is_cell(position) or cell(position) is not None:
+        return False
+    step = (position[0] - x, position[1] - y)
+    above = cell((x, y - 1)) is not None and horizontal(current_position) is None
+    below = cell((x, y + 1)) is not None and horizontal((x, y + 1)) is None
+    left = cell((x - 1, y)) is not None and vertical(current_position) is None
+    right = cell((x + 1, y)) is not None and vertical((x + 1, y)) is None
+    rules = {(-1, 0): vertical(current_position) is None, (1, 0): vertical(position) is None,
+             (0, -1): horizontal(current_position) is None, (0, 1): horizontal(position) is None,
+             (0, -2): above and horizontal((x, y - 1)) is None, (0, 2): below and horizontal((x, y + 2)) is None,
+             (-2, 0): left and vertical((x - 1, y)) is None, (2, 0): right and vertical((x + 2, y)) is None}
+    for side in (-1, 1):
+        rules[(side, -1)] = above and horizontal((x, y - 1)) is not None
+        rules[(side, 1)] = below and horizontal((x, y + 2)) is not None
+    for side in (-1, 1):
+        rules[(-1, side)] = rules[(-1, side)] or left and vertical((x - 1, y)) is not None
+        rules[(1, side)] = rules[(1, side)] or right and vertical((x + 2, y)) is not None
+    return rules.get(step, False)
+
+
+def random_position(board_class, rng, size=9, players=2):
+    """
+    Returns a QuoridorGame on board_class with the integer size parameter number of cells on each side and the
+    integer players parameter number of pawns, a random number of fences placed by push and the pawns of players 1
+    and 2 put next to each other, or one apart, somewhere on the board, player 1 to move. Half the time those pawns
+    are side by side in a row rather than in a column. Half the time a fence is set right behind the pawn of player 2
+    as well, so diagonal moves come up. The pawns of players 3 and 4 go on random free cells
+    """
+    game = QuoridorGame(board_class, size=size, players=players, fences=20)
+    for num in range(0, rng.randint(0, 30)):
+        fences = game.legal_fence_placements(game.get_player_turn())
+        if len(fences) != 0:
+            game.push(rng.choice(fences))
+    board = game.get_board()
+    first = (rng.randint(0, size - 1), rng.randint(0, size - 1))
+    rows = [first[1] + step for step in (-2, -1, 1, 2) if 0 <= first[1] + step < size]
+    second = (min(max(first[0] + rng.choice((-1, 0, 0, 1)), 0), size - 1), rng.choice(rows))
+    sideways = rng.random() < 0.5
+    if sideways:
+        first, second = first[::-1], second[::-1]
+    positions = [first, second]
+    free = [cell for cell in game.get_geometry().get_cells() if cell not in positions]
+    place_pawns(game, positions + rng.sample(free, players - 2))
+    if rng.random() < 0.5:
+        helper_fence_behind(board, first, second, sideways)
+    game.set_player_turn(1)
+    return game
+
+
+def place_pawns(game, positions):
+    """
+    Moves the pawn of each player of the game parameter, in order, to the positions in the list of position tuples
+    parameter, without checking any rule
+    """
+    board = game.get_board()
+    for player, position in enumerate(positions, 1):
+        board.remove_pawn_position(game.get_player_position(player))
+    for player, position in enumerate(positions, 1):
+        board.set_cell(player, position)
+        game.set_player_position(player, position)
+
+
+def helper_fence_behind(board, first, second, sideways):
+    """
+    Helper function to random_position, sets a fence on the far side of the pawn on the tuple second parameter as
+    seen from the tuple first parameter: a vertical one if the sideways parameter is True, a horizontal one if not
+    """
+    if sideways:
+        behind = (second[0] + (1 if second[0] > first[0] else 0), second[1])
+        if board.is_vertical_slot(behind):
+            board.set_vertical_fence(behind)
+    else:
+        behind = (second[0], second[1] + (1 if second[1] > first[1] else 0))
+        if board.is_horizontal_slot(behind):
+            board.set_horizontal_fence(behind)
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("size, players", [(9, 2), (5, 2), (11, 2), (9, 4), (7, 4)])
+def test_pawn_moves_follow_the_original_rules(board_class, size, players):
+    """
+    For every cell within two steps of the pawn, push, legal_pawn_moves, the per-direction verifiers and
+    verify_two_space_moves for jumps all agree with original_pawn_move, on boards of several sizes with two and four
+    pawns
+    """
+    rng = random.Random(size * players)
+    for num in range(0, 120):
+        game = random_position(board_class, rng, size, players)
+        current = game.get_player_position(1)
+        legal = set(game.legal_pawn_moves(1))
+        for dx in range(-2, 3):
+            for dy in range(-2, 3):
+                position = (current[0] + dx, current[1] + dy)
+                expected = original_pawn_move(game.get_board(), position, current)
+                assert (position in legal) == expected, (num, position)
+                if (dx, dy) in DIRECTION_VERIFIERS and game.get_board().is_cell(position):
+                    verifier = getattr(game, DIRECTION_VERIFIERS[(dx, dy)])
+                    arguments = (position,) if (dx, dy) in ((1, 0), (0, 1)) else (position, current)
+                    if (dx, dy) in ((-1, -1), (1, -1), (-1, 1), (1, 1), (0, -2), (0, 2)):
+                        arguments = (1,) + arguments
+                    assert verifier(*arguments) == expected, (num, position, DIRECTION_VERIFIERS[(dx, dy)])
+                if abs(dx) + abs(dy) == 2 and 0 in (dx, dy):
+                    assert game.verify_two_space_moves(1, position, current) == expected, (num, position)
+                assert (game.push(('p', position)) is True) == expected, (num, position)
+                if expected:
+                    game.pop()
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_four_player_pawns_jump_and_go_diagonally_sideways(board_class):
+    """
+    In a four player game, player 4 facing player 3 across a row jumps over them, and goes round them diagonally
+    once a fence stands behind them
+    """
+    for fenced, expected in ((False, [(3, 4), (5, 3), (5, 5), (6, 4)]),
+                             (True, [(4, 3), (4, 5), (5, 3), (5, 5), (6, 4)])):
+        game = QuoridorGame(board_class, players=4)
+        place_pawns(game, [(4, 0), (4, 8), (4, 4), (5, 4)])
+        if fenced:
+            game.get_board().set_vertical_fence((4, 4))
+        game.set_player_turn(4)
+        assert sorted(game.legal_pawn_moves(4)) == expected
+        assert game.move_pawn(4, (3, 4)) is not fenced
+        assert game.move_pawn(4, (4, 3)) is fenced
+
+
+@pytest.mark.parametrize("size, players", [(5, 2), (11, 2), (5, 4), (9, 4), (11, 4)])
+def test_players_win_on_the_far_side(size, players):
+    """
+    Each player wins by stepping onto the side of the board across from their start: players 1 and 2 the bottom and
+    top rows, players 3 and 4 the right and left columns. The game is over after that
+    """
+    last = size - 1
+    goals = {1: ((1, last - 1), (1, last)), 2: ((1, 1), (1, 0)), 3: ((last - 1, 1), (last, 1)), 4: ((1, 1), (0, 1))}
+    for player in range(1, players + 1):
+        game = QuoridorGame(size=size, players=players)
+        positions = [game.get_player_position(other) for other in range(1, players + 1)]
+        positions[player - 1] = goals[player][0]
+        place_pawns(game, positions)
+        game.set_player_turn(player)
+        assert game.move_pawn(player, goals[player][1]) is True
+        assert game.get_game_winner() == player and game.is_winner(player)
+        assert game.legal_pawn_moves(game.get_player_turn()) == []
+
+
+@pytest.mark.parametrize("size, players", [(5, 2), (7, 4), (11, 4)])
+def test_walling_any_pawn_in_breaks_fair_play(size, players):
+    """
+    On boards of several sizes, the fence closing the last side of the cell of any player's pawn breaks the fair play
+    rule and is not placed, while the three fences the next player placed before it are
+    """
+    fences = [('h', (1, 1)), ('h', (1, 2)), ('v', (1, 1)), ('v', (2, 1))]
+    for player in range(1, players + 1):
+        game = QuoridorGame(size=size, players=players)
+        positions = [game.get_player_position(other) for other in range(1, players + 1)]
+        positions[player - 1] = (1, 1)
+        place_pawns(game, positions)
+        placer = player % players + 1
+        for direction, position in fences[:-1]:
+            game.set_player_turn(placer)
+            assert game.place_fence(placer, direction, position) is True
+        game.set_player_turn(placer)
+        assert game.place_fence(placer, *fences[-1]) == "breaks the fair play rule"
+        assert game.get_player_fences(placer) == MAX_FENCES // players - 3
+
+
+def test_verifiers_take_positions():
+    """
+    The public verifiers take position tuples, with the player argument of the jump and diagonal ones, and say no to
+    positions off the board
+    """
+    game = QuoridorGame()
+    assert game.verify_orthogonal_moves((4, 1), (4, 0)) is True
+    assert game.verify_orthogonal_moves((4, 2), (4, 0)) is False
+    assert game.verify_orthogonal_moves((4, -1), (4, 0)) is False
+    assert game.verify_two_space_moves(1, (4, 2), (4, 0)) is False
+    assert game.verify_diagonal_moves(1, (3, 1), (4, 0)) is False
+
+
+def test_two_slot_fences_refuse_overlaps_and_crossings():
+    """
+    A fence of length 2 takes both its slots and its grid point: a fence sharing a slot or crossing it is refused,
+    one touching it end to end is not
+    """
+    game = QuoridorGame(fence_length=2)
+    assert game.get_fence_slots('h', (3, 4)) == (('h', (3, 4)), ('h', (4, 4)))
+    assert game.push(('h', (3, 4))) is True
+    assert game.push(('h', (4, 4))) is False
+    assert game.push(('v', (4, 3))) is False
+    assert game.push(('v', (4, 4))) is True
+    assert game.push(('h', (8, 2))) is False
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("fence_length", [1, 2])
+def test_legal_fence_placements_are_the_fences_push_plays(board_class, fence_length):
+    """
+    Along random games, legal_fence_placements lists exactly the fences push accepts out of every fence piece of
+    the board
+    """
+    rng = random.Random(1)
+    for num in range(0, 6):
+        game = QuoridorGame(board_class, fence_length=fence_length)
+        pieces = sorted(game.get_geometry().get_fence_pieces(fence_length))
+        for ply in range(0, 16):
+            player = game.get_player_turn()
+            played = set()
+            for move in pieces:
+                if game.push(move) is True:
+                    played.add(move)
+                    game.pop()
+            assert set(game.legal_fence_placements(player)) == played, (num, ply)
+            moves = [('p', position) for position in game.legal_pawn_moves(player)] + sorted(played)
+            game.push(rng.choice(moves))
+
+
+def test_fence_counts_above_max_fences_hash_apart():
+    """
+    Games given more than MAX_FENCES fences still hash every fence count to its own number, the same in every
+    ZobristKeys made with the same seed
+    """
+    game = QuoridorGame(fences=MAX_FENCES + 10)
+    hashes = {game.zobrist_hash()}
+    for count in range(0, MAX_FENCES + 10):
+        game.decrement_player_fence(1)
+        hashes.add(game.zobrist_hash())
+    assert len(hashes) == MAX_FENCES + 11
+    key = ZobristKeys().get_fence_count_key(1, MAX_FENCES + 5)
+    assert key != 0 and key == ZobristKeys().get_fence_count_key(1, MAX_FENCES + 5)
+    assert ZobristKeys().get_fence_count_key(1, 3) == game.get_board().get_zobrist_keys().get_fence_count_key(1, 3)
+
+
+def game_snapshot(game):
+    """
+    Returns a tuple of everything push and pop change in the game parameter: pawns, fences on the board and their
+    grid points, fences left, turn, winner, path cache, hashes and the moves on the undo stack
+    """
+    board = game.get_board()
+    players = range(1, game.get_player_count() + 1)
+    return ([game.get_player_position(player) for player in players],
+            [game.get_player_fences(player) for player in players], dict(board.get_cells()),
+            list(board.get_occupants()), dict(board.get_horizontal_rows()), dict(board.get_vertical_rows()),
+            board.get_fence_masks(), bytes(board.get_blocked_edges()), set(game._fence_crossings),
+            game.get_player_turn(), game.get_game_winner(), dict(game._path_cache), board.get_hash(),
+            game.zobrist_hash(), game.get_move_history())
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("players, fence_length", [(2, 1), (2, 2), (4, 2)])
+def test_push_and_pop_restore_the_game(board_class, players, fence_length):
+    """
+    Along random sequences of pushes, pops and path searches, each pop gives the game back exactly as it was before
+    the push it takes back, and a push that returns anything but True leaves the game as it was with nothing added
+    to the undo stack
+    """
+    rng = random.Random(players * fence_length)
+    refused = 0
+    for num in range(0, 4):
+        game = QuoridorGame(board_class, players=players, fence_length=fence_length)
+        pieces = sorted(game.get_geometry().get_fence_pieces(fence_length))
+        cells = game.get_geometry().get_cells()
+        snapshots = []
+        for step in range(0, 300):
+            for player in rng.sample(range(1, players + 1), rng.randint(0, players)):
+                game.get_cached_path(player)
+            before = game_snapshot(game)
+            if len(snapshots) != 0 and rng.random() < 0.3:
+                move = game.get_move_history()[-1]
+                assert game.pop() == move
+                assert game_snapshot(game) == snapshots.pop(), (num, step, move)
+                continue
+            player = game.get_player_turn()
+            moves = [('p', position) for position in game.legal_pawn_moves(player)] + \
+                [('p', rng.choice(cells)), rng.choice(pieces), rng.choice(pieces), rng.choice(pieces)]
+            move = rng.choice(moves)
+            result = game.push(move)
+            if result is True:
+                snapshots.append(before)
+                continue
+            refused += 1
+            assert game_snapshot(game) == before, (num, step, move, result)
+        while len(snapshots) != 0:
+            game.pop()
+            assert game_snapshot(game) == snapshots.pop()
+        assert game.pop() is None and game.get_move_history() == []
+    assert refused != 0
+
+
+def test_pushing_a_fence_that_breaks_fair_play_leaves_no_trace():
+    """
+    With player 2 fenced in on three sides by pushes, the push of the fence closing the fourth side is turned down
+    without touching the game or the undo stack, and popping every push gives back the game from before them
+    """
+    game = QuoridorGame()
+    place_pawns(game, [game.get_player_position(1), (1, 1)])
+    snapshots = []
+    for move in (('h', (1, 1)), ('h', (7, 7)), ('h', (1, 2)), ('h', (7, 5)), ('v', (1, 1)), ('h', (7, 3))):
+        snapshots.append(game_snapshot(game))
+        assert game.push(move) is True
+    game.get_cached_path(2)
+    before = game_snapshot(game)
+    assert game.push(('v', (2, 1))) == "breaks the fair play rule"
+    assert game_snapshot(game) == before and len(game.get_move_history()) == 6
+    while len(snapshots) != 0:
+        game.pop()
+        assert game_snapshot(game) == snapshots.pop()
+    assert game.pop() is None
@@ -0,0 +1,112 @@
+# Description: Tests of FeatureEncoder and the replay files: the planes describe the game they were encoded from,
+# mirroring a position gives the planes of the mirrored game and positions read back from a replay file are the ones
+# written.
+# Run from the repository root with: python -m pytest tests/test_features.py
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from Quoridor import BitBoard, QuoridorGame  # noqa: E402
+from Quoridor.ai import RandomPlayer  # noqa: E402
+from Quoridor.candidates import distance_map  # noqa: E402
+from Quoridor.features import PLANES, FeatureEncoder, ReplayReader, ReplayWriter  # noqa: E402
+
+
+def random_game(seed, fence_length=1, plies=40):
+    """
+    Returns a QuoridorGame on a BitBoard with the integer plies parameter number of random moves played with push
+    """
+    game, player = QuoridorGame(BitBoard, fence_length=fence_length), RandomPlayer(seed=seed, pawn_move_chance=0.4)
+    for ply in range(0, plies):
+        move = player.choose_move(game)
+        if move is None:
+            break
+        game.push(move)
+    return game
+
+
+def expected_planes(game):
+    """
+    Returns the planes of the game parameter built one cell at a time from its getters, indexed [plane, y, x]
+    """
+    size = game.get_board().get_size()
+    board = game.get_board()
+    planes = np.zeros((len(PLANES), size, size))
+    for player in (1, 2):
+        x, y = game.get_player_position(player)
+        planes[player - 1, y, x] = 1
+        planes[3 + player] = game.get_player_fences(player)
+        distances = distance_map(board, player)[0]
+        planes[6 + player] = np.array([-1 if value is None else value for value in distances]).reshape(size, size)
+    for y in range(0, size):
+        for x in range(0, size):
+            planes[2, y, x] = board.get_horizontal_row((x, y)) is not None
+            planes[3, y, x] = board.get_vertical_row((x, y)) is not None
+    planes[6] = game.get_player_turn() == 1
+    return planes
+
+
+@pytest.mark.parametrize("fence_length", [1, 2])
+def test_planes_describe_the_game(fence_length):
+    """
+    Every plane of a batch of encoded games matches the one built cell by cell from the game
+    """
+    games = [random_game(seed, fence_length) for seed in range(0, 6)]
+    planes = FeatureEncoder(fence_length=fence_length).encode(games)
+    for row, game in enumerate(games):
+        assert np.array_equal(planes[row], expected_planes(game))
+
+
+@pytest.mark.parametrize("fence_length", [1, 2])
+def test_mirrored_planes_are_the_mirrored_game(fence_length):
+    """
+    Playing the mirrored moves of a game gives the game whose planes are the mirrored planes, and mirroring the moves
+    twice gives them back
+    """
+    encoder = FeatureEncoder(fence_length=fence_length)
+    for seed in range(0, 4):
+        game = random_game(seed, fence_length)
+        indexes = np.array([encoder.encode_move(move) for move in game.get_move_history()])
+        mirrored = encoder.mirror_moves(indexes)
+        assert np.array_equal(encoder.mirror_moves(mirrored), indexes)
+        mirror_game = QuoridorGame(BitBoard, fence_length=fence_length)
+        for index in mirrored:
+            assert mirror_game.push(encoder.decode_move(int(index))) is True
+        assert np.array_equal(encoder.mirror_planes(encoder.encode([game])), encoder.encode([mirror_game]))
+
+
+def test_replay_file_reads_back_what_was_written(tmp_path):
+    """
+    Positions written with mirroring over several chunks come back from ReplayReader in the order add_game adds
+    them, from the last position of each game back to the first, each chunk followed by its mirror
+    """
+    encoder = FeatureEncoder()
+    games = [random_game(seed, plies=30) for seed in range(0, 3)]
+    path = str(tmp_path / "replay.qrp")
+    with ReplayWriter(path, encoder, chunk_size=16, mirror=True) as writer:
+        for game in games:
+            assert writer.add_game(game) == len(game.get_move_history())
+    positions, policies = [], []
+    for game in games:
+        replay, game_positions = QuoridorGame(BitBoard), []
+        for move in game.get_move_history():
+            game_positions.append((encoder.encode([replay])[0], encoder.encode_move(move)))
+            replay.push(move)
+        for planes, policy in reversed(game_positions):
+            positions.append(planes)
+            policies.append(policy)
+    reader = ReplayReader(path)
+    assert reader.get_position_count() == 2 * len(positions)
+    start = 0
+    for number in range(0, reader.get_chunk_count(), 2):
+        planes, chunk_policies, values = reader.get_chunk(number)
+        count = len(chunk_policies)
+        assert np.array_equal(planes, np.array(positions[start:start + count]))
+        assert chunk_policies.tolist() == policies[start:start + count]
+        mirror_planes, mirror_policies, mirror_values = reader.get_chunk(number + 1)
+        assert np.array_equal(mirror_planes, encoder.mirror_planes(planes))
+        assert np.array_equal(mirror_policies, encoder.mirror_moves(chunk_policies))
+        assert np.array_equal(mirror_values, values)
+        start += count
+    assert start == len(positions)
@@ -0,0 +1,64 @@
+# Description: Tests of the fuzzer: random games on the alternate engines match the reference and run to a win, and a
+# broken engine is caught with its divergence cut down to a short reproduction.
+# Run from the repository root with: python -m pytest tests/test_fuzz.py
+
+import pytest
+
+from Quoridor.engine import BitBoard, QuoridorGame
+from Quoridor.fuzz import ENGINES, find_divergence, format_repro, fuzz, make_compact
+
+
+class BrokenGame(QuoridorGame):
+    """
+    Represents a QuoridorGame on a BitBoard that turns down every vertical fence in the right half of the board
+    """
+
+    def place_fence(self, player, direction, position):
+        """
+        Returns False for a vertical fence right of the middle column, otherwise places it as QuoridorGame does
+        """
+        if direction == 'v' and position[0] > self.get_board().get_size() // 2:
+            return False
+        return super().place_fence(player, direction, position)
+
+
+def make_broken(size):
+    """
+    Returns a BrokenGame with the integer size parameter number of cells on each side
+    """
+    return BrokenGame(BitBoard, size=size)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_engines_match_reference(seed):
+    """
+    The bitboard and compact engines never diverge from the reference, and most random games end in a win
+    """
+    played, won, divergences = fuzz({"bitboard": ENGINES["bitboard"], "compact": make_compact}, games=30, seed=seed)
+    assert divergences == []
+    assert won >= 20
+    assert played > 30 * 10
+
+
+def test_vectorized_matches_reference():
+    """
+    The NumPy batched engine never diverges from the reference
+    """
+    pytest.importorskip("numpy")
+    played, won, divergences = fuzz({"vectorized": ENGINES["vectorized"]}, games=5)
+    assert divergences == []
+    assert won > 0
+
+
+def test_broken_engine_is_minimized():
+    """
+    A divergence is found, cut down to a few actions ending on the refused fence, and printed as code
+    """
+    played, won, divergences = fuzz({"broken": make_broken}, games=10)
+    assert len(divergences) != 0
+    divergence = divergences[0]
+    assert len(divergence["actions"]) <= divergence["length"]
+    last = divergence["actions"][-1]
+    assert last[0] == "place_fence" and last[2] == 'v' and last[3][0] > 4
+    assert find_divergence(make_broken, divergence["actions"], 9) is not None
+    assert "game.place_fence(" in format_repro(divergence)
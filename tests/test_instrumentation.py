@@ -0,0 +1,83 @@
+# Description: Tests of the opt-in instrumentation: enable swaps wrappers in that count calls, time them and count
+# the cells fair play searches expand on either board, and disable puts every original function back so nothing is
+# left slowing down the engine.
+# Run from the repository root with: python -m pytest tests/test_instrumentation.py
+
+import pytest
+
+from Quoridor import Board, BitBoard, QuoridorGame, instrumentation
+
+WRAPPED = instrumentation.TIMED + [(Board, "can_reach_goal"), (Board, "helper_search_goal"),
+                                   (BitBoard, "spread_cells")]
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    """
+    Makes sure instrumentation is off with no statistics before each test and turned off again after it
+    """
+    instrumentation.disable()
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def play(board_class):
+    """
+    Plays a few pawn moves and fences on a new game on board_class and prints its board. Returns the number of
+    move_pawn and place_fence calls
+    """
+    game = QuoridorGame(board_class)
+    moves = [game.move_pawn(1, (4, 1)), game.place_fence(2, 'h', (4, 2)), game.place_fence(1, 'v', (3, 6)),
+             game.move_pawn(2, (4, 7)), game.move_pawn(1, (5, 1))]
+    assert moves == [True, True, True, True, True]
+    game.print_board()
+    return 3, 2
+
+
+def test_disable_puts_the_originals_back(capsys):
+    """
+    enable replaces every listed function once, however often it is called, and disable restores the very same
+    function objects
+    """
+    originals = {(owner, name): owner.__dict__[name] for owner, name in WRAPPED}
+    instrumentation.enable()
+    wrappers = {(owner, name): owner.__dict__[name] for owner, name in WRAPPED}
+    instrumentation.enable()
+    assert instrumentation.is_enabled()
+    for key, original in originals.items():
+        assert wrappers[key] is not original and key[0].__dict__[key[1]] is wrappers[key], key
+        assert wrappers[key].__wrapped__ is original, key
+    instrumentation.disable()
+    assert not instrumentation.is_enabled()
+    for (owner, name), original in originals.items():
+        assert owner.__dict__[name] is original, (owner, name)
+    play(Board)
+    assert all(stats["calls"] == 0 for stats in instrumentation.snapshot()["functions"].values())
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_statistics_count_calls_and_search_cells(board_class, capsys):
+    """
+    Each call of a timed function is counted and timed, the fair play searches and the cells they expand are counted
+    on either board, and reset sets everything back to zero
+    """
+    instrumentation.enable()
+    pawn_moves, fences = play(board_class)
+    functions = instrumentation.snapshot()["functions"]
+    assert functions["QuoridorGame.move_pawn"]["calls"] == pawn_moves
+    assert functions["QuoridorGame.place_fence"]["calls"] == fences
+    assert functions["rendering.display_board"]["calls"] == 1
+    for name in ("QuoridorGame.move_pawn", "QuoridorGame.place_fence", "QuoridorGame.is_fair_play"):
+        stats = functions[name]
+        assert stats["calls"] > 0 and 0 < stats["max_seconds"] <= stats["seconds"], name
+    fair_play = instrumentation.snapshot()["fair_play"]
+    assert fair_play["searches"] > 0 and fair_play["nodes"] >= fair_play["max_nodes"] > 0
+    assert 'quoridor_calls_total{function="QuoridorGame.move_pawn"} 3' in instrumentation.to_prometheus()
+    merged = instrumentation.merge_snapshots([instrumentation.snapshot(), instrumentation.snapshot()])
+    assert merged["functions"]["QuoridorGame.move_pawn"]["calls"] == 2 * pawn_moves
+    assert merged["fair_play"]["max_nodes"] == fair_play["max_nodes"]
+    instrumentation.reset()
+    assert instrumentation.snapshot()["fair_play"] == {"searches": 0, "nodes": 0, "max_nodes": 0}
+    assert all(stats["calls"] == 0 for stats in instrumentation.snapshot()["functions"].values())
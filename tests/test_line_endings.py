@@ -0,0 +1,34 @@
+# Description: Tests that every source file keeps the CRLF line endings of the original Quoridor.py, so a file saved
+# with LF line endings shows up here instead of as a whole-file rewrite in the history.
+# Run from the repository root with: python -m pytest tests/test_line_endings.py
+
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIRECTORIES = ("Quoridor", "benchmarks", "tests")
+
+
+def source_files():
+    """
+    Returns the paths, relative to the repository root, of the README, .gitattributes and every Python file in
+    SOURCE_DIRECTORIES
+    """
+    paths = ["README.md", ".gitattributes"]
+    for directory in SOURCE_DIRECTORIES:
+        for name in sorted(os.listdir(os.path.join(ROOT, directory))):
+            if name.endswith(".py"):
+                paths.append(os.path.join(directory, name))
+    return paths
+
+
+@pytest.mark.parametrize("path", source_files())
+def test_crlf_line_endings(path):
+    """
+    Every line of the file ends with CRLF
+    """
+    with open(os.path.join(ROOT, path), "rb") as file:
+        data = file.read()
+    assert data.count(b"\n") == data.count(b"\r\n")
+    assert data.endswith(b"\r\n")
@@ -0,0 +1,184 @@
+# Description: Tests of the shortest path search of the boards: the iterative breadth first search agrees with the
+# recursive fair play search of the original program on random fence layouts, walled in pawns included, the paths
+# it finds are shortest paths that no fence cuts, and the path cache of a game is searched again when a fence cuts a
+# cached path and kept when none does.
+# Run from the repository root with: python -m pytest tests/test_paths.py
+
+import random
+
+import pytest
+
+from Quoridor import Board, BitBoard, QuoridorGame
+
+
+def recursive_can_reach(board, position, player, visited=None):
+    """
+    Returns True if the pawn of the integer player parameter on the tuple position parameter can reach their goal
+    row on the board parameter, searched the way the original is_fair_play and helper_fair_play did: recursively from
+    cell to cell, not crossing fences and never visiting a cell twice
+    """
+    if visited is None:
+        visited = set()
+    if position in visited:
+        return False
+    visited.add(position)
+    if position[1] == (board.get_size() - 1 if player == 1 else 0):
+        return True
+    x, y = position
+    steps = [((x - 1, y), board.get_vertical_row(position)), ((x + 1, y), board.get_vertical_row((x + 1, y))),
+             ((x, y - 1), board.get_horizontal_row(position)), ((x, y + 1), board.get_horizontal_row((x, y + 1)))]
+    return any(board.is_cell(cell) and fence is None and recursive_can_reach(board, cell, player, visited)
+               for cell, fence in steps)
+
+
+def distances_to_goal(board, player):
+    """
+    Returns a dictionary of the number of steps from each cell the goal row of the integer player parameter can be
+    reached from on the board parameter, found by a search outward from the goal row through open fence slots
+    """
+    size = board.get_size()
+    frontier = [(x, size - 1 if player == 1 else 0) for x in range(0, size)]
+    distances = {cell: 0 for cell in frontier}
+    while len(frontier) != 0:
+        next_frontier = []
+        for cell in frontier:
+            for neighbor in neighbors(board, cell):
+                if neighbor not in distances:
+                    distances[neighbor] = distances[cell] + 1
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return distances
+
+
+def neighbors(board, position):
+    """
+    Returns the list of cells next to the tuple position parameter on the board parameter with no fence in between
+    """
+    x, y = position
+    steps = [((x - 1, y), board.get_vertical_row(position)), ((x + 1, y), board.get_vertical_row((x + 1, y))),
+             ((x, y - 1), board.get_horizontal_row(position)), ((x, y + 1), board.get_horizontal_row((x, y + 1)))]
+    return [cell for cell, fence in steps if board.is_cell(cell) and fence is None]
+
+
+def random_fences(board, rng, count):
+    """
+    Sets the integer count parameter number of fences on random slots of the board parameter without checking the
+    fair play rule, so some cells end up walled in
+    """
+    slots = [('h', slot) for slot in sorted(board.get_horizontal_rows())] + \
+        [('v', slot) for slot in sorted(board.get_vertical_rows())]
+    for direction, slot in rng.sample(slots, count):
+        if direction == 'h':
+            board.set_horizontal_fence(slot)
+        else:
+            board.set_vertical_fence(slot)
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("size", [5, 9])
+def test_search_agrees_with_the_recursive_search(board_class, size):
+    """
+    From every cell of random fence layouts, sparse to dense, can_reach_goal gives the answer of the original
+    recursive search, get_distance_to_goal the fewest steps and find_path a shortest path through open slots
+    """
+    rng = random.Random(size)
+    walled_in = 0
+    for count in (0, 10, 30, 50, 70, 90):
+        board = board_class(size)
+        random_fences(board, rng, min(count, size * (size - 1)))
+        for player in (1, 2):
+            distances = distances_to_goal(board, player)
+            for cell in board.get_geometry().get_cells():
+                reachable = recursive_can_reach(board, cell, player)
+                walled_in += not reachable
+                assert board.can_reach_goal(cell, player) == reachable, (count, player, cell)
+                assert board.get_distance_to_goal(cell, player) == distances.get(cell), (count, player, cell)
+                path = board.find_path(cell, player)
+                if not reachable:
+                    assert path is None
+                    continue
+                assert path[0] == cell and len(path) == distances[cell] + 1 and distances[path[-1]] == 0
+                assert all(path[num + 1] in neighbors(board, path[num]) for num in range(0, len(path) - 1))
+    assert walled_in != 0
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_walled_in_cell_has_no_path(board_class):
+    """
+    A cell with a fence on all four sides has no path to any goal row while the cells around it keep theirs, and the
+    pawn standing on it does not change the answer
+    """
+    board = board_class(9)
+    for position in ((4, 4), (5, 4)):
+        board.set_vertical_fence(position)
+    for position in ((4, 4), (4, 5)):
+        board.set_horizontal_fence(position)
+    board.set_cell(1, (4, 4))
+    for player in (1, 2):
+        assert recursive_can_reach(board, (4, 4), player) is False
+        assert board.can_reach_goal((4, 4), player) is False
+        assert board.get_distance_to_goal((4, 4), player) is None and board.find_path((4, 4), player) is None
+        for cell in ((3, 4), (5, 4), (4, 3), (4, 5)):
+            assert board.can_reach_goal(cell, player) is True
+
+
+def check_cached_path(game, player):
+    """
+    Asserts that the cached path of the integer player parameter in the game parameter is a shortest path from their
+    pawn through open slots, with the fences that would cut it and the length shortest_path_length gives
+    """
+    board = game.get_board()
+    position = game.get_player_position(player)
+    path = game.get_cached_path(player)
+    distance = board.get_distance_to_goal(position, player)
+    assert game.shortest_path_length(player) == distance
+    if distance is None:
+        assert path is None and game.get_path_fences(player) == set()
+        return
+    assert path[0] == position and len(path) == distance + 1 and board.get_distance_to_goal(path[-1], player) == 0
+    assert all(path[num + 1] in neighbors(board, path[num]) for num in range(0, len(path) - 1))
+    assert game.get_path_fences(player) == {board.get_fence_between(path[num], path[num + 1])
+                                            for num in range(0, len(path) - 1)}
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("players, fence_length", [(2, 2), (2, 1), (4, 2)])
+def test_cached_paths_follow_fences_and_pawns(board_class, players, fence_length):
+    """
+    Over random games that often fence across a path, a fence that cuts a cached path has it searched again around
+    the fence, a fence that does not cut it keeps the very same path, a pawn stepping along its path keeps the rest
+    of it, and every cached path is a shortest path after every move
+    """
+    rng = random.Random(players + fence_length)
+    cuts, kept = 0, 0
+    for game_number in range(0, 12):
+        game = QuoridorGame(board_class, players=players, fence_length=fence_length)
+        while game.get_game_winner() is None and len(game.get_move_history()) < 60:
+            player = game.get_player_turn()
+            paths = {other: game.get_cached_path(other) for other in range(1, players + 1)}
+            fences = {other: game.get_path_fences(other) for other in range(1, players + 1)}
+            cutting = [move for move in game.legal_fence_placements(player)
+                       if set(game.get_fence_slots(*move)) & game.get_path_fences(game.get_opponent(player))]
+            moves = [('p', position) for position in game.legal_pawn_moves(player)]
+            if len(cutting) != 0 and rng.random() < 0.5:
+                moves = cutting
+            if len(moves) == 0:
+                break
+            move = rng.choice(moves)
+            assert game.push(move) is True
+            for other, path in paths.items():
+                if move[0] != 'p':
+                    slots = set(game.get_fence_slots(*move))
+                    if slots & fences[other]:
+                        cuts += 1
+                        assert not slots & game.get_path_fences(other), (game_number, move, other)
+                    else:
+                        kept += 1
+                        assert game.get_cached_path(other) is path, (game_number, move, other)
+                elif other == player and path is not None and move[1] in path:
+                    assert game.get_cached_path(other) == path[path.index(move[1]):]
+                elif other != player:
+                    assert game.get_cached_path(other) is path
+                check_cached_path(game, other)
+    assert cuts != 0 and kept != 0
+
@@ -0,0 +1,99 @@
+# Description: Tests of the binary game records: games come back as they were written, game numbers out of range and
+# files cut off partway through a game are reported instead of read wrong, whether the index file is there or not, and
+# an index file that does not belong to the record file is refused.
+# Run from the repository root with: python -m pytest tests/test_records.py
+
+import os
+
+import pytest
+
+from Quoridor import RecordReader, RecordWriter
+from Quoridor.records import OFFSET
+
+GAMES = [([('p', (4, 1)), ('p', (4, 7)), ('h', (3, 4)), ('v', (5, 6))], None),
+         ([('p', (4, 1)), ('h', (0, 1)), ('v', (8, 8))], 2),
+         ([('v', (1, 1)), ('p', (4, 7)), ('p', (5, 1)), ('p', (3, 7)), ('h', (7, 8))], 1)]
+
+
+@pytest.fixture
+def record_path(tmp_path):
+    """
+    Returns the path of a record file holding GAMES
+    """
+    path = str(tmp_path / "games.qrec")
+    with RecordWriter(path) as writer:
+        for moves, winner in GAMES:
+            writer.write_game(moves, winner)
+    return path
+
+
+def test_games_read_back_as_written(record_path):
+    """
+    Streaming and random access both give back every game in order
+    """
+    with RecordReader(record_path) as reader:
+        assert list(reader.read_moves()) == GAMES
+        assert reader.get_game_count() == len(GAMES)
+        assert [reader.get_moves(number) for number in range(0, len(GAMES))] == GAMES
+
+
+@pytest.mark.parametrize("number", [-1, -3, 3, 100])
+def test_game_numbers_out_of_range_raise(record_path, number):
+    """
+    Negative numbers do not count back from the last game, numbers past the last game raise as well
+    """
+    with RecordReader(record_path) as reader:
+        with pytest.raises(IndexError):
+            reader.get_moves(number)
+
+
+@pytest.mark.parametrize("cut", [1, 4, 6])
+def test_cut_off_records_raise(record_path, cut):
+    """
+    A file cut off in the moves of its last game, or in its header, raises ValueError when streamed instead of giving
+    a short game. Random access raises ValueError for a game whose moves are cut off and does not count a game
+    whose header is cut off
+    """
+    os.remove(record_path + ".idx")
+    with open(record_path, "r+b") as records:
+        records.truncate(os.path.getsize(record_path) - cut)
+    with RecordReader(record_path) as reader:
+        with pytest.raises(ValueError):
+            list(reader.read_moves())
+        with pytest.raises(ValueError if cut <= len(GAMES[-1][0]) else IndexError):
+            reader.get_moves(len(GAMES) - 1)
+
+
+@pytest.mark.parametrize("cut, count, whole", [(1, 3, 2), (8, 2, 2), (9, 2, 1), (12, 1, 1), (15, 1, 0), (20, 0, 0)])
+def test_index_past_a_cut_off_record_is_dropped(record_path, cut, count, whole):
+    """
+    With the index written before the record file was cut off, offsets the file no longer holds a game header at are
+    left out, the games before the cut read back as written and a game whose moves are cut off raises ValueError
+    """
+    with open(record_path, "r+b") as records:
+        records.truncate(os.path.getsize(record_path) - cut)
+    with RecordReader(record_path) as reader:
+        assert reader.get_game_count() == count
+        assert [reader.get_moves(number) for number in range(0, whole)] == GAMES[:whole]
+        if whole < count:
+            with pytest.raises(ValueError):
+                reader.get_moves(whole)
+
+
+def test_index_of_another_file_is_refused(record_path):
+    """
+    An index whose offsets do not go up from the end of the header raises ValueError, and an offset cut off partway
+    at the end of the index is left out with the game found by scanning instead
+    """
+    with open(record_path + ".idx", "rb") as index:
+        offsets = [value[0] for value in OFFSET.iter_unpack(index.read())]
+    for content in (OFFSET.pack(offsets[1]) + OFFSET.pack(offsets[0]), OFFSET.pack(0), OFFSET.pack(offsets[1]) * 2):
+        with open(record_path + ".idx", "wb") as index:
+            index.write(content)
+        with RecordReader(record_path) as reader:
+            with pytest.raises(ValueError):
+                reader.get_game_count()
+    with open(record_path + ".idx", "wb") as index:
+        index.write(OFFSET.pack(offsets[0]) + OFFSET.pack(offsets[1])[:5])
+    with RecordReader(record_path) as reader:
+        assert [reader.get_moves(number) for number in range(0, reader.get_game_count())] == GAMES
@@ -0,0 +1,39 @@
+# Description: Tests of the board drawings, chiefly that a BoardRenderer redrawing only the rows changed_rows returns
+# gives the same frame as drawing the whole board again.
+# Run from the repository root with: python -m pytest tests/test_rendering.py
+
+import pytest
+
+from Quoridor import Board, BitBoard, QuoridorGame
+from Quoridor.ai import RandomPlayer
+from Quoridor.rendering import BoardRenderer, changed_rows
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("fence_length", [1, 2])
+@pytest.mark.parametrize("style", ["ascii", "ansi"])
+def test_incremental_render_matches_full_render(board_class, fence_length, style):
+    """
+    Plays random games and checks after every move that the incremental frame is the full frame
+    """
+    for seed in range(0, 4):
+        game = QuoridorGame(board_class, fence_length=fence_length)
+        player, renderer = RandomPlayer(seed=seed, pawn_move_chance=0.3), BoardRenderer(style)
+        renderer.render(game.get_board())
+        for ply in range(0, 60):
+            move = player.choose_move(game)
+            if move is None:
+                break
+            old_position = game.get_player_position(game.get_player_turn())
+            assert game.push(move) is True
+            rows = changed_rows(move, old_position, fence_length)
+            assert renderer.render(game.get_board(), rows) == BoardRenderer(style).render(game.get_board())
+
+
+def test_vertical_two_slot_fence_changes_two_rows():
+    """
+    A vertical fence of length 2 covers the slot of its position and the one below it
+    """
+    assert changed_rows(('v', (3, 4)), None, 2) == {4, 5}
+    assert changed_rows(('h', (3, 4)), None, 2) == {4}
+    assert changed_rows(('p', (4, 1)), (4, 0)) == {0, 1}
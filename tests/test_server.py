@@ -0,0 +1,38 @@
+# Description: Tests of the request handling of GameServer, run on the server object without opening a socket.
+# Run from the repository root with: python -m pytest tests/test_server.py
+
+import asyncio
+
+import pytest
+
+from Quoridor.server import GameServer
+
+
+def respond(server, line):
+    """
+    Returns the response of the server parameter to the bytes line parameter
+    """
+    return asyncio.run(server.respond(line))
+
+
+def test_bad_requests_get_error_responses():
+    """
+    Lines that are not JSON objects are answered with an error instead of closing the connection
+    """
+    server = GameServer()
+    assert respond(server, b"[1, 2]") == {"id": None, "ok": False, "error": "request must be a JSON object"}
+    assert respond(server, b"{not json")["ok"] is False
+    assert respond(server, b'{"id": 7, "op": "move_pawn", "game": 3}') == {"id": 7, "ok": False, "error": "no game 3"}
+
+
+@pytest.mark.parametrize("time_limit", ["NaN", "Infinity", "-Infinity", "0", "-1"])
+def test_ai_move_refuses_time_limits_without_a_deadline(time_limit):
+    """
+    A time limit that is not a positive finite number is refused before any search is started
+    """
+    server = GameServer()
+    game = respond(server, b'{"op": "new"}')["result"]
+    line = '{{"id": 1, "op": "ai_move", "game": {}, "time_limit": {}}}'.format(game, time_limit).encode()
+    response = respond(server, line)
+    assert response["ok"] is False and "time_limit" in response["error"]
+    assert server._executor is None
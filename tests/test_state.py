@@ -0,0 +1,106 @@
+# Description: Tests of GameState and StatePool: a state packed from a game rebuilds the same game on either board
+# class, compares and hashes by position and survives pickling.
+# Run from the repository root with: python -m pytest tests/test_state.py
+
+import pickle
+
+import pytest
+
+from Quoridor import Board, BitBoard, GameState, QuoridorGame, StatePool
+from Quoridor.ai import RandomPlayer
+from Quoridor.state import FENCE_COUNT_BITS
+
+
+def describe(game):
+    """
+    Returns a tuple of everything a GameState keeps of the game parameter: the pawns, fences left, turn, winner and
+    fence masks
+    """
+    players = range(1, game.get_player_count() + 1)
+    return (tuple(game.get_player_position(player) for player in players),
+            tuple(game.get_player_fences(player) for player in players), game.get_player_turn(),
+            game.get_game_winner(), game.get_board().get_fence_masks())
+
+
+def random_games(board_class, **options):
+    """
+    Generator that plays random games on board_class, with the keyword options passed on to QuoridorGame, and yields
+    the game after every move
+    """
+    for seed in range(0, 3):
+        game, player = QuoridorGame(board_class, **options), RandomPlayer(seed=seed, pawn_move_chance=0.4)
+        for ply in range(0, 50):
+            move = player.choose_move(game)
+            if move is None:
+                break
+            game.push(move)
+            yield game
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("options", [{}, {"fence_length": 2}, {"players": 4}, {"size": 7}])
+def test_state_rebuilds_the_game(board_class, options):
+    """
+    to_state and to_game, load_state, clone and pickling all give back the same position, on both board classes
+    """
+    for game in random_games(board_class, **options):
+        state = game.to_state()
+        for other_class in (Board, BitBoard):
+            assert describe(state.to_game(other_class)) == describe(game)
+        assert state.to_game(board_class).get_board().get_hash() == game.get_board().get_hash()
+        loaded = QuoridorGame(board_class, **options)
+        loaded.load_state(state)
+        assert describe(loaded) == describe(game)
+        clone = state.clone()
+        assert clone == state and hash(clone) == hash(state) and clone is not state
+        assert pickle.loads(pickle.dumps(state)) == state
+
+
+def test_states_differ_by_position():
+    """
+    States of different positions are not equal, the same position reached twice gives equal states
+    """
+    game = QuoridorGame()
+    start = game.to_state()
+    game.push(('p', (4, 1)))
+    assert game.to_state() != start
+    game.pop()
+    assert game.to_state() == start and game.to_state().get_key() == start.get_key()
+
+
+def test_pool_reuses_released_states():
+    """
+    A released state is handed out again by acquire, filled in with the new game
+    """
+    pool = StatePool(max_size=2)
+    game = QuoridorGame()
+    state = pool.acquire(game)
+    pool.release(state)
+    assert pool.get_free_count() == 1
+    game.push(('p', (4, 1)))
+    assert pool.acquire(game) is state and state == game.to_state()
+    assert pool.get_free_count() == 0
+
+
+def test_boards_above_the_largest_size_are_refused():
+    """
+    The size field of a state holds boards of at most MAX_SIZE cells on each side
+    """
+    game = QuoridorGame(size=23)
+    with pytest.raises(ValueError):
+        GameState().load_game(game)
+
+
+def test_fence_counts_above_the_field_are_refused():
+    """
+    A fence count that does not fit in FENCE_COUNT_BITS is refused instead of spilling into the next player's count,
+    and the state keeps what it held. The largest count that fits comes back as it was
+    """
+    largest = (1 << FENCE_COUNT_BITS) - 1
+    game = QuoridorGame(fences=largest)
+    state = game.to_state()
+    assert state.get_player_fences(1) == largest and state.get_player_fences(2) == largest
+    before = state.get_key()
+    with pytest.raises(ValueError):
+        state.load_game(QuoridorGame(fences=600))
+    assert state.get_key() == before
@@ -0,0 +1,176 @@
+# Description: Tests of the endgame tablebases: every probe on a small fenced board matches a brute force search of
+# the race, games the tablebase was not made for are not answered, and tablebase files read back, pickle by path and
+# are refused when cut short or not tablebase files at all.
+# Run from the repository root with: python -m pytest tests/test_tablebase.py
+
+import pickle
+
+import pytest
+
+from Quoridor import QuoridorGame, generate_tablebase, load_tablebase
+
+SIZE = 5
+FENCES = [('h', (1, 2)), ('h', (2, 2)), ('v', (3, 1)), ('v', (1, 3))]
+
+
+def fenced_game(fences=0):
+    """
+    Returns a two player QuoridorGame on a SIZE board with the fences of FENCES set and the integer fences parameter
+    number of fences left for each player
+    """
+    game = QuoridorGame(size=SIZE, fences=fences)
+    for direction, position in FENCES:
+        game.set_fence_piece(direction, position)
+    return game
+
+
+def set_position(game, turn, first, second):
+    """
+    Moves the pawns of players 1 and 2 of the game parameter to the tuple positions first and second and gives the
+    integer turn parameter the move, without checking any rule
+    """
+    board = game.get_board()
+    for player in (1, 2):
+        board.remove_pawn_position(game.get_player_position(player))
+    for player, position in ((1, first), (2, second)):
+        board.set_cell(player, position)
+        game.set_player_position(player, position)
+    game.set_player_turn(turn)
+
+
+def on_goal(player, position):
+    """
+    Returns True if the tuple position parameter is on the goal row of the player parameter
+    """
+    return position[1] == (SIZE - 1 if player == 1 else 0)
+
+
+def brute_force():
+    """
+    Returns a dictionary from each (turn, first, second) position of fenced_game, with the pawns of players 1 and 2
+    on first and second, to the (winner, plies) result of best play, (None, None) if neither player can force a win.
+    The moves of each position are found by pushing a pawn move to every cell, and results are found by searching
+    ever deeper: the player to move wins within d plies if a move leads to a loss within d - 1, and loses within d if
+    the opponent stands on their goal row or every move leads to a win within d - 1
+    """
+    game = fenced_game()
+    cells = game.get_geometry().get_cells()
+    moves, results = {}, {}
+    for turn in (1, 2):
+        for first in cells:
+            for second in cells:
+                if first == second or on_goal(1, first) or on_goal(2, second):
+                    if first != second and on_goal(3 - turn, (first, second)[2 - turn]) and \
+                            not on_goal(turn, (first, second)[turn - 1]):
+                        results[(turn, first, second)] = (3 - turn, 0)
+                    continue
+                set_position(game, turn, first, second)
+                moves[(turn, first, second)] = helper_moves(game, turn, first, second, cells)
+    for depth in range(1, 4 * SIZE * SIZE):
+        found = {}
+        for state, targets in moves.items():
+            if state in results or len(targets) == 0:
+                continue
+            outcomes = [results.get(target) for target in targets]
+            if (state[0], depth - 1) in outcomes:
+                found[state] = (state[0], depth)
+            elif all(outcome is not None and outcome[0] == 3 - state[0] for outcome in outcomes):
+                found[state] = (3 - state[0], depth)
+        results.update(found)
+    return results
+
+
+def helper_moves(game, turn, first, second, cells):
+    """
+    Helper function to brute_force, returns the list of (turn, first, second) positions the integer turn parameter
+    can reach by pushing a pawn move from the position of the game parameter, trying every cell of the list of cells
+    """
+    targets = []
+    for cell in cells:
+        if game.push(('p', cell)) is True:
+            game.pop()
+            targets.append((3 - turn, cell, second) if turn == 1 else (3 - turn, first, cell))
+    return targets
+
+
+@pytest.fixture(scope="module")
+def tablebase():
+    """
+    Returns the tablebase of fenced_game
+    """
+    return generate_tablebase(fenced_game())
+
+
+def test_probes_match_brute_force(tablebase):
+    """
+    Every position of the fence layout gets the winner and length of best play found by brute force, positions
+    where the opponent stands on their goal are lost in 0 plies, and positions neither player can force give
+    (None, None)
+    """
+    expected = brute_force()
+    game = fenced_game()
+    indexes = game.get_geometry().get_cell_indexes()
+    cells = game.get_geometry().get_cells()
+    settled = 0
+    for turn in (1, 2):
+        for first in cells:
+            for second in cells:
+                if first == second or (on_goal(1, first) or on_goal(2, second)) and \
+                        (turn, first, second) not in expected:
+                    continue
+                set_position(game, turn, first, second)
+                assert tablebase.probe(game) == expected.get((turn, first, second), (None, None)), \
+                    (turn, first, second)
+                if expected.get((turn, first, second)) == (3 - turn, 0):
+                    assert tablebase.get_entry(turn, indexes[first], indexes[second]) == -1
+                    settled += 1
+    assert settled != 0
+    counts = tablebase.count_results()
+    assert counts["wins"] != 0 and counts["losses"] != 0
+
+
+def test_games_not_covered_are_not_answered(tablebase):
+    """
+    Games with fences left, other fences, another board size or four players get None
+    """
+    assert tablebase.probe(fenced_game()) is not None
+    assert tablebase.probe(fenced_game(fences=1)) is None
+    other = fenced_game()
+    other.set_fence_piece('h', (0, 1))
+    assert tablebase.probe(other) is None
+    assert tablebase.probe(QuoridorGame(size=7, fences=0)) is None
+    assert tablebase.probe(QuoridorGame(size=SIZE, players=4, fences=0)) is None
+    with pytest.raises(ValueError):
+        generate_tablebase(QuoridorGame(size=SIZE, players=4, fences=0))
+
+
+def test_files_read_back_and_pickle_by_path(tablebase, tmp_path):
+    """
+    A written tablebase loads with the same entries, and pickling the loaded one maps its file again
+    """
+    path = str(tmp_path / "endgame.qtb")
+    tablebase.write(path)
+    loaded = load_tablebase(path)
+    copies = [loaded, pickle.loads(pickle.dumps(loaded)), pickle.loads(pickle.dumps(tablebase))]
+    cells = SIZE * SIZE
+    for copy in copies:
+        assert (copy.get_size(), copy.get_fence_hash()) == (tablebase.get_size(), tablebase.get_fence_hash())
+        assert all(copy.get_entry(turn, first, second) == tablebase.get_entry(turn, first, second)
+                   for turn in (1, 2) for first in range(0, cells) for second in range(0, cells))
+    assert pickle.dumps(loaded) != pickle.dumps(tablebase)
+    assert len(pickle.dumps(loaded)) < 2 * cells * cells
+
+
+def test_bad_files_are_refused(tablebase, tmp_path):
+    """
+    Files cut short or not starting with MAGIC raise ValueError
+    """
+    path = str(tmp_path / "endgame.qtb")
+    tablebase.write(path)
+    with open(path, "rb") as source:
+        data = source.read()
+    for name, content in (("short.qtb", data[:-2]), ("magic.qtb", b"XXXX" + data[4:]), ("empty.qtb", b"")):
+        with open(str(tmp_path / name), "wb") as output:
+            output.write(content)
+        with pytest.raises(ValueError):
+            load_tablebase(str(tmp_path / name))
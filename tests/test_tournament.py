@@ -0,0 +1,55 @@
+# Description: Tests of the tournament runner: the random openings, the records of the games it plays and the record
+# file it writes, which is closed even when a game fails.
+# Run from the repository root with: python -m pytest tests/test_tournament.py
+
+import json
+import os
+import random
+
+import pytest
+
+from Quoridor import BitBoard, QuoridorGame, RecordReader
+from Quoridor.tournament import play_game, play_opening, run_tournament
+
+BOTS = [{"name": "a", "type": "random"}, {"name": "b", "type": "random"}]
+
+
+def test_opening_counts_the_moves_it_played():
+    """
+    An opening longer than a 3x3 game lasts stops once the game is won and returns the moves actually played
+    """
+    for seed in range(0, 10):
+        game = QuoridorGame(BitBoard, size=3)
+        played = play_opening(game, random.Random(seed), 50)
+        assert played == len(game.get_move_history()) < 50
+        assert game.get_game_winner() is not None
+
+
+def test_game_record_counts_every_ply():
+    """
+    The plies of a game record are the moves in it, opening included, even when the opening ends the game
+    """
+    spec = {"game": 0, "seed": 3, "players": BOTS}
+    for opening_moves in (0, 2, 50):
+        record = play_game(spec, opening_moves=opening_moves, max_plies=60, size=3)
+        assert record["plies"] == len(record["moves"])
+
+
+def test_tournament_writes_and_closes_the_record_file(tmp_path):
+    """
+    Every game of a tournament goes to the record file in the order of the JSON lines, and the record file is closed
+    whether the tournament finishes or a bot fails partway
+    """
+    if not os.path.isdir("/proc/self/fd"):
+        pytest.skip("needs /proc/self/fd to count open files")
+    output_path, records_path = str(tmp_path / "results.jsonl"), str(tmp_path / "games.qrec")
+    before = len(os.listdir("/proc/self/fd"))
+    run_tournament(BOTS, 2, 1, 0, output_path, max_plies=20, records_path=records_path)
+    assert len(os.listdir("/proc/self/fd")) == before
+    with open(output_path) as output, RecordReader(records_path) as reader:
+        plies = [len(moves) for moves, winner in reader.read_moves()]
+        assert plies == [json.loads(line)["plies"] for line in output]
+    with pytest.raises(ValueError):
+        run_tournament(BOTS[:1] + [{"name": "c", "type": "unknown"}], 2, 1, 0, output_path,
+                       records_path=records_path)
+    assert len(os.listdir("/proc/self/fd")) == before
@@ -0,0 +1,29 @@
+# Description: Differential test of BatchedQuoridorGame against QuoridorGame. Every step plays the same random actions
+# on a small batch and on as many QuoridorGame objects and compares the results, positions, fair play checks and
+# shortest paths. The seeds are fixed so a failure always comes back the same way.
+# Run from the repository root with: python -m pytest tests/test_vectorized.py
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from Quoridor.vectorized import BatchedQuoridorGame, compare_with_reference  # noqa: E402
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_reference(seed):
+    """
+    Plays 80 steps of 16 games on both engines without a difference
+    """
+    assert compare_with_reference(size=16, steps=80, seed=seed) == 16 * 80
+
+
+def test_new_batch_starts_like_reference():
+    """
+    A new batch has both pawns on their start cells, all fences left, player 1 to move and no winner
+    """
+    batch = BatchedQuoridorGame(3)
+    assert batch.get_pawns().tolist() == [[4, 76]] * 3
+    assert batch.get_fences_left().tolist() == [[10, 10]] * 3
+    assert batch.get_turns().tolist() == [1] * 3
+    assert batch.get_winners().tolist() == [0] * 3